@@ -0,0 +1,70 @@
+"""Attribute-read throughput: generated per-schema proxy vs. the __getattr__ path.
+
+Run from the repository root:
+
+    python benchmarks/bench_proxy_reads.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from serial_preferences import Pref, PreferenceGroup, PreferenceSchema  # noqa: E402
+from serial_preferences.proxy import PreferenceProxy  # noqa: E402
+
+
+class BenchPreferences(PreferenceSchema):
+    class Fuel(PreferenceGroup, label="Fuel"):
+        prepay_enabled: bool = Pref(default=True, label="Prepay")
+        max_prepay_amount: int = Pref(default=15000, label="Max prepay", ge=0)
+        receipt_footer: str = Pref(default="Thank you!", label="Footer")
+
+
+def _generated_proxy(data, parent=None) -> PreferenceProxy:
+    return PreferenceProxy(BenchPreferences, data, parent)
+
+
+def _getattr_proxy(data, parent=None) -> PreferenceProxy:
+    """Build a plain PreferenceProxy that resolves through __getattr__."""
+    proxy = object.__new__(PreferenceProxy)
+    PreferenceProxy.__init__(proxy, BenchPreferences, data, parent)
+    return proxy
+
+
+# Data layers from the proxy being read up to the root of its inheritance chain.
+CASES = {
+    "local": [{"prepay_enabled": False}],
+    "default": [{}],
+    "parent": [{}, {"prepay_enabled": False}],
+    "depth 5": [{}, {}, {}, {}, {"prepay_enabled": False}],
+}
+
+
+def _read_loop(proxy: PreferenceProxy, n: int) -> None:
+    for _ in range(n):
+        proxy.prepay_enabled
+
+
+def main(reads: int = 1_000_000, repeat: int = 5) -> None:
+    print(f"{'case':<10}{'__getattr__':>16}{'generated':>16}{'speedup':>10}")
+    for case, layers in CASES.items():
+        results = {}
+        for label, factory in (("getattr", _getattr_proxy), ("generated", _generated_proxy)):
+            proxy = None
+            for data in reversed(layers):
+                proxy = factory(dict(data), proxy)
+            best = min(timeit.repeat(lambda: _read_loop(proxy, reads), number=1, repeat=repeat))
+            results[label] = reads / best
+        speedup = results["generated"] / results["getattr"]
+        print(
+            f"{case:<10}{results['getattr'] / 1e6:>13.2f} M/s"
+            f"{results['generated'] / 1e6:>13.2f} M/s{speedup:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""Benchmark harness for the proxy, field, validation, introspection and GraphQL hot paths.
+
+Runs against the SQLite test settings (``tests.settings``) and writes
+machine-readable results that can be compared between releases.
+
+Run from the repository root:
+
+    python benchmarks/harness.py --output before.json
+    python benchmarks/harness.py --output after.json --compare before.json
+    python benchmarks/harness.py --quick -k proxy
+
+``--compare`` prints the change per case and exits with status 1 when any
+case is slower than the baseline by more than ``--threshold`` (10% by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from serial_preferences import Pref, PreferenceGroup, PreferenceSchema  # noqa: E402
+from serial_preferences.django import PreferenceField  # noqa: E402
+from serial_preferences.introspection import clear_schema_cache, schema_to_dict  # noqa: E402
+from serial_preferences.proxy import PreferenceProxy  # noqa: E402
+
+# A benchmark returns the callable to time and the number of operations per call.
+Case = tuple[Callable[[], Any], int]
+
+BENCHMARKS: list[tuple[str, dict[str, list[Any]], dict[str, list[Any]], Callable[..., Case]]] = []
+
+
+def benchmark(
+    name: str, quick: dict[str, list[Any]] | None = None, **grid: list[Any]
+) -> Callable[[Callable[..., Case]], Callable[..., Case]]:
+    """Register a benchmark run once per combination of ``grid`` values.
+
+    ``quick`` replaces parts of the grid under ``--quick``.
+    """
+
+    def register(func: Callable[..., Case]) -> Callable[..., Case]:
+        BENCHMARKS.append((name, grid, {**grid, **(quick or {})}, func))
+        return func
+
+    return register
+
+
+# --- Generated schemas -------------------------------------------------------
+
+_schemas: dict[int, type[PreferenceSchema]] = {}
+
+_KINDS = [
+    (bool, lambda i: Pref(default=i % 2 == 0, label=f"Flag {i}")),
+    (int, lambda i: Pref(default=i, label=f"Count {i}", ge=0, le=1_000_000)),
+    (float, lambda i: Pref(default=i / 2, label=f"Ratio {i}")),
+    (str, lambda i: Pref(default=f"text {i}", label=f"Text {i}", max_length=200)),
+    (
+        str,
+        lambda i: Pref(
+            default="a", label=f"Choice {i}", choices=[("a", "A"), ("b", "B"), ("c", "C")]
+        ),
+    ),
+]
+
+
+def make_schema(prefs: int) -> type[PreferenceSchema]:
+    """A schema with ``prefs`` preferences of mixed types, ten per group."""
+    if prefs not in _schemas:
+        namespace: dict[str, Any] = {}
+        for start in range(0, prefs, 10):
+            annotations: dict[str, Any] = {}
+            body: dict[str, Any] = {"__annotations__": annotations}
+            for i in range(start, min(start + 10, prefs)):
+                pref_type, make = _KINDS[i % len(_KINDS)]
+                annotations[f"pref_{i}"] = pref_type
+                body[f"pref_{i}"] = make(i)
+            group = type(f"Group{start}", (PreferenceGroup,), body, label=f"Group {start}")
+            namespace[f"Group{start}"] = group
+        _schemas[prefs] = type(f"Bench{prefs}", (PreferenceSchema,), namespace)
+    return _schemas[prefs]
+
+
+def sample_data(schema: type[PreferenceSchema], every: int = 2) -> dict[str, Any]:
+    """Stored values for every ``every``-th preference, different from the default."""
+    data = {}
+    for i, (key, pref) in enumerate(schema._preferences.items()):
+        if i % every == 0:
+            data[key] = "b" if pref.choices else pref.validator(_other(pref.default))
+    return data
+
+
+def _other(default: Any) -> Any:
+    if isinstance(default, bool):
+        return not default
+    if isinstance(default, (int, float)):
+        return default + 1
+    return f"{default}!"
+
+
+def chain(schema: type[PreferenceSchema], depth: int, *, generated: bool = True) -> PreferenceProxy:
+    """A proxy ``depth`` levels below a root holding half of the values."""
+
+    def make(data: dict[str, Any], parent: PreferenceProxy | None) -> PreferenceProxy:
+        if generated:
+            return PreferenceProxy(schema, data, parent)
+        proxy = object.__new__(PreferenceProxy)
+        PreferenceProxy.__init__(proxy, schema, data, parent)
+        return proxy
+
+    proxy = make(sample_data(schema), None)
+    for _ in range(depth):
+        proxy = make({}, proxy)
+    return proxy
+
+
+# --- Proxy -------------------------------------------------------------------
+
+
+@benchmark("proxy.getattr", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000], depth=[1, 3, 5])
+def bench_getattr(prefs: int, depth: int) -> Case:
+    """``PreferenceProxy.__getattr__``: every key read on the base class."""
+    schema = make_schema(prefs)
+    proxy = chain(schema, depth, generated=False)
+    keys = list(schema._preferences)
+
+    def run() -> None:
+        for key in keys:
+            getattr(proxy, key)
+
+    return run, len(keys)
+
+
+@benchmark("proxy.generated", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000], depth=[1, 3, 5])
+def bench_generated(prefs: int, depth: int) -> Case:
+    """Every key read through the schema's generated properties."""
+    schema = make_schema(prefs)
+    proxy = chain(schema, depth)
+    keys = list(schema._preferences)
+
+    def run() -> None:
+        for key in keys:
+            getattr(proxy, key)
+
+    return run, len(keys)
+
+
+@benchmark("proxy.to_full_dict", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000], depth=[1, 5])
+def bench_to_full_dict(prefs: int, depth: int) -> Case:
+    proxy = chain(make_schema(prefs), depth)
+    return proxy.to_full_dict, 1
+
+
+@benchmark("proxy.to_full_dict_after_set", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000])
+def bench_to_full_dict_after_set(prefs: int) -> Case:
+    """to_full_dict() right after a root change, which rebuilds the view chain."""
+    schema = make_schema(prefs)
+    leaf = chain(schema, 3)
+    root = leaf._parent._parent._parent
+    key = next(iter(schema._preferences))
+
+    def run() -> None:
+        root.reset(key)
+        leaf.to_full_dict()
+
+    return run, 1
+
+
+# --- Validation ----------------------------------------------------------------
+
+
+_INPUTS = {"bool": "yes", "int": "123", "float": "1.5", "str": 123, "choice": "b"}
+
+
+@benchmark("validation.coerce_and_validate", kind=list(_INPUTS))
+def bench_coerce(kind: str) -> Case:
+    from serial_preferences.validators import coerce_and_validate
+
+    index = list(_INPUTS).index(kind)
+    schema = make_schema(10)
+    pref = list(schema._preferences.values())[index]
+    value = _INPUTS[kind]
+
+    def run() -> None:
+        for _ in range(1000):
+            coerce_and_validate(value, pref)
+
+    return run, 1000
+
+
+@benchmark("field.validate", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000])
+def bench_field_validate(prefs: int) -> Case:
+    schema = make_schema(prefs)
+    field = PreferenceField(schema)
+    data = sample_data(schema, every=1)
+    return lambda: field.validate(data, None), 1
+
+
+# --- Introspection -------------------------------------------------------------
+
+
+@benchmark("introspection.schema_to_dict", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000])
+def bench_schema_to_dict(prefs: int) -> Case:
+    schema = make_schema(prefs)
+    return lambda: schema_to_dict(schema), 1
+
+
+@benchmark("introspection.schema_to_dict_cold", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000])
+def bench_schema_to_dict_cold(prefs: int) -> Case:
+    schema = make_schema(prefs)
+
+    def run() -> None:
+        clear_schema_cache()
+        schema_to_dict(schema)
+
+    return run, 1
+
+
+# --- GraphQL -------------------------------------------------------------------
+
+
+@benchmark("graphql.values_to_strawberry", quick={"prefs": [10, 100]}, prefs=[10, 100, 1000])
+def bench_values_to_strawberry(prefs: int) -> Case | None:
+    try:
+        from serial_preferences.contrib.strawberry import values_to_strawberry
+    except ImportError:
+        return None
+    proxy = chain(make_schema(prefs), 1)
+    return lambda: values_to_strawberry(proxy), 1
+
+
+# --- Django --------------------------------------------------------------------
+
+_populated: set[int] = set()
+
+
+def populate(rows: int) -> None:
+    """Create ``rows`` Sites under 100 Dealers sharing one Franchise."""
+    from tests.models import Dealer, Franchise, Site
+
+    if rows in _populated:
+        return
+    Site.objects.all().delete()
+    Dealer.objects.all().delete()
+    Franchise.objects.all().delete()
+    franchise = Franchise.objects.create(name="F", preferences={"receipt_footer": "Franchise"})
+    dealers = Dealer.objects.bulk_create(
+        Dealer(name=f"B{i}", franchise=franchise, preferences={"max_prepay_amount": i})
+        for i in range(100)
+    )
+    Site.objects.bulk_create(
+        (
+            Site(
+                name=f"L{i}",
+                dealer=dealers[i % 100],
+                preferences={"prepay_enabled": False} if i % 3 == 0 else {},
+            )
+            for i in range(rows)
+        ),
+        batch_size=1000,
+    )
+    _populated.clear()
+    _populated.add(rows)
+
+
+@benchmark("field.descriptor_get", quick={"rows": [1000]}, rows=[1000, 10000])
+def bench_descriptor_get(rows: int) -> Case:
+    """``_PreferenceDescriptor.__get__`` building each row's proxy and parent chain."""
+    from tests.models import Site
+
+    populate(rows)
+    instances = list(Site.objects.with_preference_parents())
+
+    def run() -> None:
+        for instance in instances:
+            instance.__dict__.pop("_pref_proxy_preferences", None)
+            instance.preferences
+
+    return run, len(instances)
+
+
+@benchmark("queryset.read_effective", quick={"rows": [1000]}, rows=[1000, 10000])
+def bench_queryset_read(rows: int) -> Case:
+    """Load rows with their parents and read one inherited value from each."""
+    from tests.models import Site
+
+    populate(rows)
+
+    def run() -> None:
+        for location in Site.objects.with_preference_parents():
+            location.preferences.receipt_footer
+
+    return run, rows
+
+
+@benchmark("queryset.annotate_preference", quick={"rows": [1000]}, rows=[1000, 10000])
+def bench_annotate(rows: int) -> Case:
+    from tests.models import Site
+
+    populate(rows)
+    queryset = Site.objects.annotate_preference("max_prepay_amount", "prepay_enabled")
+    return lambda: list(queryset.values_list("max_prepay_amount", "prepay_enabled")), rows
+
+
+# --- Runner --------------------------------------------------------------------
+
+
+def cases(quick: bool, pattern: str | None) -> Iterator[tuple[str, dict[str, Any], Callable]]:
+    for name, grid, quick_grid, func in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        grid = quick_grid if quick else grid
+        for values in itertools.product(*grid.values()):
+            yield name, dict(zip(grid, values)), func
+
+
+def measure(run: Callable[[], Any], ops: int, repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    best = min(times)
+    return {
+        "ops": ops,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "ops_per_s": ops / best,
+    }
+
+
+def case_id(name: str, params: dict[str, Any]) -> str:
+    return name + "".join(f"[{key}={value}]" for key, value in params.items())
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: dict[str, dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print the change against a previous run; return the number of regressions."""
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    regressions = 0
+    print(f"\n{'case':<60}{'baseline':>12}{'current':>12}{'speedup':>10}")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        change = before["best_s"] / current["best_s"] - 1
+        flag = ""
+        if change < -threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{key:<60}{before['best_s'] * 1e6:>10.1f}us{current['best_s'] * 1e6:>10.1f}us"
+            f"{change:>+9.1%}{flag}"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a previous JSON run.")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Smaller grid, for a smoke run.")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this.")
+    args = parser.parse_args(argv)
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    results: dict[str, dict[str, Any]] = {}
+    for name, params, func in cases(args.quick, args.pattern):
+        case = func(**params)
+        if case is None:
+            continue
+        run, ops = case
+        result = {"name": name, "params": params, **measure(run, ops, args.repeat)}
+        key = case_id(name, params)
+        results[key] = result
+        print(f"{key:<60}{result['best_s'] * 1e6:>12.1f} us{result['ops_per_s']:>16,.0f} ops/s")
+
+    if args.output:
+        report = {"meta": metadata(), "results": results}
+        Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
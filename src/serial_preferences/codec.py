@@ -0,0 +1,138 @@
+"""JSON codecs — stdlib, orjson or msgspec decoding, with identical encoded output."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any, Callable
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .conf import get_setting
+
+# Float exponents are one place the fast encoders format differently
+# (``1e16`` vs. the stdlib's ``1e+16``); such output is re-encoded with the stdlib.
+_EXPONENT = re.compile(r"\de[-\d]")
+
+
+class JSONCodec:
+    """JSON encoder/decoder pair backed by the stdlib ``json`` module.
+
+    ``dumps`` is ``json.dumps`` with its default arguments: the text
+    PreferenceField has always stored and the GraphQL converters have always
+    returned (``", "`` and ``": "`` separators, non-ASCII characters escaped,
+    non-finite floats as ``NaN``/``Infinity``). Every codec produces this text.
+    """
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def loads(self, text: str | bytes) -> Any:
+        return json.loads(text)
+
+
+class _FastCodec(JSONCodec):
+    """Wraps a third-party decoder, and its encoder where the output is identical.
+
+    The fast encoders write compact, unescaped UTF-8, so they only encode
+    scalars whose text comes out the same as the stdlib's; containers,
+    non-ASCII strings and non-finite floats go through ``json.dumps``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[str | bytes], Any],
+    ) -> None:
+        self.name = name
+        self._encode = encode
+        self._decode = decode
+
+    def dumps(self, value: Any) -> str:
+        if value is None or isinstance(value, (str, int)) or (
+            isinstance(value, float) and math.isfinite(value)
+        ):
+            try:
+                text = self._encode(value).decode()
+            except (TypeError, ValueError, OverflowError):
+                return json.dumps(value)
+            if text.isascii() and not _EXPONENT.search(text):
+                return text
+        return json.dumps(value)
+
+    def loads(self, text: str | bytes) -> Any:
+        try:
+            return self._decode(text)
+        except Exception:
+            # Let the stdlib decide: it accepts what the fast decoders refuse
+            # (integers beyond 64 bits, NaN) and raises ValueError otherwise.
+            return json.loads(text)
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+
+    return _FastCodec("orjson", orjson.dumps, orjson.loads)
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    return _FastCodec("msgspec", msgspec.json.encode, msgspec.json.decode)
+
+
+_FACTORIES: dict[str, Callable[[], JSONCodec]] = {
+    "json": JSONCodec,
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+}
+
+_codec: JSONCodec | None = None
+
+
+def get_codec() -> JSONCodec:
+    """Return the codec selected by ``SERIAL_PREFERENCES_JSON_CODEC``.
+
+    ``"auto"`` (the default) uses orjson, then msgspec, whichever is installed
+    first, and the stdlib otherwise. ``"json"``, ``"orjson"`` and ``"msgspec"``
+    select one explicitly.
+    """
+    global _codec
+    if _codec is None:
+        _codec = _load_codec(get_setting("JSON_CODEC", "auto"))
+    return _codec
+
+
+def _load_codec(name: str) -> JSONCodec:
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+        return JSONCodec()
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ImproperlyConfigured(
+            f"Unknown SERIAL_PREFERENCES_JSON_CODEC {name!r}; "
+            f"expected 'auto' or one of {sorted(_FACTORIES)}."
+        )
+    try:
+        return factory()
+    except ImportError as exc:
+        raise ImproperlyConfigured(
+            f"SERIAL_PREFERENCES_JSON_CODEC is {name!r} but it is not installed."
+        ) from exc
+
+
+@receiver(setting_changed)
+def _reset_codec(*, setting: str, **kwargs: Any) -> None:
+    global _codec
+    if setting == "SERIAL_PREFERENCES_JSON_CODEC":
+        _codec = None
@@ -0,0 +1,31 @@
+"""Package settings, read from ``SERIAL_PREFERENCES_<NAME>`` entries in Django settings."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+
+
+def get_setting(name: str, default: Any = None) -> Any:
+    """Return ``settings.SERIAL_PREFERENCES_<name>`` or ``default`` when unset.
+
+    Settings:
+        LAZY_PARENT_QUERIES: ``"warn"`` or ``"raise"`` when following
+            ``inherits_from`` runs a query (an N+1 hiding in a list view).
+            Disabled by default.
+        JSON_CODEC: ``"auto"`` (default), ``"json"``, ``"orjson"`` or
+            ``"msgspec"``; see ``serial_preferences.codec``.
+        PARENT_PROXY_CACHE_SIZE: Number of parent proxies kept in the shared
+            LRU; see ``serial_preferences.django.proxy_cache``. Disabled (0)
+            by default.
+        MATERIALIZE_BATCH_SIZE: Rows written per ``bulk_update`` when
+            refreshing materialized columns. 500 by default.
+        RECORDER: Dotted path to a ``Recorder`` class enabled at startup by
+            ``SerialPreferencesConfig``; see ``serial_preferences.instrumentation``.
+            Disabled by default.
+    """
+    if not settings.configured:
+        # Schemas and proxies are usable without a Django project.
+        return default
+    return getattr(settings, f"SERIAL_PREFERENCES_{name}", default)
@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
-from typing import Any
+import re
+from enum import Enum
+from typing import Any, Callable, Collection, Iterable, Sequence
+from weakref import WeakKeyDictionary
 
 import strawberry
+from asgiref.sync import sync_to_async
+from django.db.models import Model, prefetch_related_objects
+from strawberry.dataloader import DataLoader
+from strawberry.scalars import JSON
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField
 
+from ..codec import get_codec
+from ..django.query import get_preference_field, parent_lookups
 from ..introspection import pref_to_dict, schema_to_dict
 from ..proxy import PreferenceProxy
 from ..schema import PreferenceSchema
@@ -45,12 +56,37 @@ class PreferenceValueType:
     is_inherited: bool
 
 
+# Converted group types per schema class; schemas are static for the process lifetime.
+_group_types: WeakKeyDictionary[type[PreferenceSchema], list[PreferenceGroupType]] = (
+    WeakKeyDictionary()
+)
+
+
 def schema_to_strawberry(
     schema_class: type[PreferenceSchema],
 ) -> list[PreferenceGroupType]:
-    """Convert a PreferenceSchema to a list of Strawberry PreferenceGroupType."""
-    import json
+    """Convert a PreferenceSchema to a list of Strawberry PreferenceGroupType.
+
+    The types are built once per schema class and shared between calls; treat
+    them as read-only. Use ``clear_strawberry_cache()`` to rebuild them.
+    """
+    cached = _group_types.get(schema_class)
+    if cached is None:
+        cached = _build_group_types(schema_class)
+        _group_types[schema_class] = cached
+    return list(cached)
+
 
+def clear_strawberry_cache(schema_class: type[PreferenceSchema] | None = None) -> None:
+    """Drop cached Strawberry conversions for one schema class, or for all of them."""
+    if schema_class is None:
+        _group_types.clear()
+    else:
+        _group_types.pop(schema_class, None)
+
+
+def _build_group_types(schema_class: type[PreferenceSchema]) -> list[PreferenceGroupType]:
+    dumps = get_codec().dumps
     result: list[PreferenceGroupType] = []
     for group_dict in schema_to_dict(schema_class):
         prefs: list[PreferenceDefinitionType] = []
@@ -61,7 +97,7 @@ def schema_to_strawberry(
                     type=p["type"],
                     label=p["label"],
                     required=p["required"],
-                    default_json=json.dumps(p["default"]) if p["default"] is not None else None,
+                    default_json=dumps(p["default"]) if p["default"] is not None else None,
                     help_text=p.get("help_text"),
                     choices=[ChoiceType(**c) for c in p["choices"]] if "choices" in p else None,
                     ge=p.get("ge"),
@@ -79,18 +115,297 @@ def schema_to_strawberry(
     return result
 
 
-def values_to_strawberry(proxy: PreferenceProxy) -> list[PreferenceValueType]:
-    """Convert a PreferenceProxy's values to a list of Strawberry PreferenceValueType."""
-    import json
+def values_to_strawberry(
+    proxy: PreferenceProxy,
+    keys: Iterable[str] | None = None,
+    groups: Iterable[str] | None = None,
+    fields: Collection[str] | None = None,
+) -> list[PreferenceValueType]:
+    """Convert a PreferenceProxy's values to a list of Strawberry PreferenceValueType.
 
+    Args:
+        keys: Only include these preference keys.
+        groups: Only include preferences from these group keys.
+        fields: The PreferenceValueType fields that will be read (as returned
+            by ``selected_value_fields``). ``value_json`` is left empty when not
+            listed, and ``is_inherited`` is left False.
+    """
     schema = object.__getattribute__(proxy, "_schema")
-    result: list[PreferenceValueType] = []
-    for key in schema._preferences:
-        result.append(
-            PreferenceValueType(
-                key=key,
-                value_json=json.dumps(getattr(proxy, key)),
-                is_inherited=proxy.is_inherited(key),
-            )
+    return _proxy_values(proxy, select_keys(schema, keys, groups), fields, get_codec().dumps)
+
+
+def resolve_preference_values(
+    info: Info,
+    proxy: PreferenceProxy,
+    keys: Iterable[str] | None = None,
+    groups: Iterable[str] | None = None,
+) -> list[PreferenceValueType]:
+    """Resolver helper that computes only the keys, groups and fields the query asked for.
+
+    Usage:
+        @strawberry.field
+        def preferences(
+            self, info: Info, keys: list[str] | None = None, groups: list[str] | None = None
+        ) -> list[PreferenceValueType]:
+            return resolve_preference_values(info, self.preferences, keys, groups)
+    """
+    return values_to_strawberry(proxy, keys, groups, selected_value_fields(info))
+
+
+def select_keys(
+    schema: type[PreferenceSchema],
+    keys: Iterable[str] | None = None,
+    groups: Iterable[str] | None = None,
+) -> list[str]:
+    """Return the schema's preference keys, in declaration order, limited to ``keys``/``groups``."""
+    prefs = schema._preferences
+    if keys is None and groups is None:
+        return list(prefs)
+    if keys is not None:
+        keys = set(keys)
+        unknown = keys - prefs.keys()
+        if unknown:
+            raise ValueError(f"Unknown preference keys: {sorted(unknown)}.")
+    if groups is not None:
+        groups = set(groups)
+        unknown = groups - {group_key for group_key, _ in schema._groups}
+        if unknown:
+            raise ValueError(f"Unknown preference groups: {sorted(unknown)}.")
+    return [
+        key
+        for key, pref in prefs.items()
+        if (keys is None or key in keys) and (groups is None or pref.group_key in groups)
+    ]
+
+
+def selected_value_fields(info: Info) -> set[str]:
+    """Return the PreferenceValueType field names (snake_case) selected by the current query."""
+    selected: set[str] = set()
+    for field in info.selected_fields:
+        _collect_field_names(field.selections, selected)
+    return {_VALUE_FIELD_NAMES.get(name, name) for name in selected}
+
+
+# GraphQL (camelCase) names of PreferenceValueType fields.
+_VALUE_FIELD_NAMES = {"valueJson": "value_json", "isInherited": "is_inherited"}
+
+
+def _collect_field_names(selections: list[Any], names: set[str]) -> None:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            names.add(selection.name)
+        else:
+            # Inline fragments and fragment spreads carry their own selections.
+            _collect_field_names(selection.selections, names)
+
+
+def _proxy_values(
+    proxy: PreferenceProxy,
+    keys: list[str],
+    fields: Collection[str] | None,
+    dumps: Callable[[Any], str],
+) -> list[PreferenceValueType]:
+    want_value = fields is None or "value_json" in fields
+    want_inherited = fields is None or "is_inherited" in fields
+    local = proxy._data
+    return [
+        PreferenceValueType(
+            key=key,
+            value_json=dumps(getattr(proxy, key)) if want_value else "",
+            is_inherited=key not in local if want_inherited else False,
         )
-    return result
+        for key in keys
+    ]
+
+
+def values_for_instances(
+    instances: Sequence[Model],
+    field: str | None = None,
+    keys: Iterable[str] | None = None,
+    groups: Iterable[str] | None = None,
+    fields: Collection[str] | None = None,
+) -> list[list[PreferenceValueType]]:
+    """Resolve preference values for a batch of model instances in one pass.
+
+    Parents missing from the instances are fetched with one query per
+    inheritance level for the whole batch, rather than one per instance.
+    ``keys``, ``groups`` and ``fields`` behave as in ``values_to_strawberry``.
+    """
+    by_model: dict[type[Model], list[Model]] = {}
+    for instance in instances:
+        by_model.setdefault(type(instance), []).append(instance)
+
+    dumps = get_codec().dumps
+    resolved: dict[int, list[PreferenceValueType]] = {}
+    for model, batch in by_model.items():
+        pref_field = get_preference_field(model, field)
+        selected = select_keys(pref_field.schema, keys, groups)
+        select, prefetch = parent_lookups(model, pref_field.name)
+        if select or prefetch:
+            prefetch_related_objects(batch, *select, *prefetch)
+        for instance in batch:
+            proxy = getattr(instance, pref_field.name)
+            resolved[id(instance)] = _proxy_values(proxy, selected, fields, dumps)
+    return [resolved[id(instance)] for instance in instances]
+
+
+class PreferenceValuesLoader(DataLoader[Model, list[PreferenceValueType]]):
+    """DataLoader resolving ``list[PreferenceValueType]`` for model instances in batches.
+
+    Usage (one loader per request, e.g. in the GraphQL context):
+        loader = PreferenceValuesLoader(field="preferences")
+
+        @strawberry.field
+        async def preferences(self, info) -> list[PreferenceValueType]:
+            return await info.context["preference_loader"].load(self)
+
+    ``keys``, ``groups`` and ``fields`` apply to every instance the loader
+    resolves; see ``values_to_strawberry``.
+    """
+
+    def __init__(
+        self,
+        field: str | None = None,
+        keys: Iterable[str] | None = None,
+        groups: Iterable[str] | None = None,
+        fields: Collection[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.field = field
+        self.keys = keys
+        self.groups = groups
+        self.fields = fields
+        super().__init__(load_fn=self._load, **kwargs)
+
+    async def _load(self, instances: list[Model]) -> list[list[PreferenceValueType]]:
+        return await sync_to_async(values_for_instances)(
+            instances, self.field, self.keys, self.groups, self.fields
+        )
+
+
+# Generated value types per schema class: (root type, function building an instance).
+# Not cleared by clear_strawberry_cache(): GraphQL schemas hold on to these types.
+_typed_values: WeakKeyDictionary[
+    type[PreferenceSchema], tuple[type, Callable[[PreferenceProxy], Any]]
+] = WeakKeyDictionary()
+
+_SCALARS: dict[type, Any] = {bool: bool, int: int, float: float, str: str}
+
+# GraphQL's Int is a signed 32-bit integer; other ints are exposed as JSON numbers.
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+
+
+def schema_to_strawberry_type(schema_class: type[PreferenceSchema]) -> type:
+    """Return a Strawberry type exposing a schema's effective values natively.
+
+    The type has one field per group, each a generated type with one field per
+    preference typed from ``Pref.pref_type``: Boolean, Int (JSON unless
+    ``ge``/``le`` keep values within 32 bits), Float, String, an enum for
+    ``choices`` (a list of enums for multi-choice) and JSON for untyped lists.
+    Types are named after the schema, e.g. ``BusinessPreferencesValues`` and
+    ``BusinessPreferencesFuelValues``, and are generated once per schema class.
+    """
+    return _typed(schema_class)[0]
+
+
+def values_to_typed(proxy: PreferenceProxy) -> Any:
+    """Return an instance of ``schema_to_strawberry_type`` for the proxy's schema."""
+    schema = object.__getattribute__(proxy, "_schema")
+    return _typed(schema)[1](proxy)
+
+
+def _typed(schema_class: type[PreferenceSchema]) -> tuple[type, Callable[[PreferenceProxy], Any]]:
+    cached = _typed_values.get(schema_class)
+    if cached is None:
+        cached = _build_typed(schema_class)
+        _typed_values[schema_class] = cached
+    return cached
+
+
+def _build_typed(
+    schema_class: type[PreferenceSchema],
+) -> tuple[type, Callable[[PreferenceProxy], Any]]:
+    prefix = schema_class.__name__
+    root_annotations: dict[str, Any] = {}
+    root_namespace: dict[str, Any] = {}
+    groups: list[tuple[str, type, list[tuple[str, Callable[[Any], Any] | None]]]] = []
+
+    for group_key, group_cls in schema_class._groups:
+        annotations: dict[str, Any] = {}
+        namespace: dict[str, Any] = {}
+        converters: list[tuple[str, Callable[[Any], Any] | None]] = []
+        for pref in group_cls._prefs:
+            annotation, convert = _pref_annotation(prefix, pref)
+            if not (pref.required and pref.default is not None):
+                annotation = annotation | None
+            annotations[pref.key] = annotation
+            namespace[pref.key] = strawberry.field(description=pref.help_text or pref.label or None)
+            converters.append((pref.key, convert))
+        namespace["__annotations__"] = annotations
+        type_name = f"{prefix}{group_cls.__name__}Values"
+        group_type = strawberry.type(
+            type(type_name, (), namespace), name=type_name, description=group_cls._label or None
+        )
+        root_annotations[group_key] = group_type
+        root_namespace[group_key] = strawberry.field(description=group_cls._label or None)
+        groups.append((group_key, group_type, converters))
+
+    root_namespace["__annotations__"] = root_annotations
+    root_name = f"{prefix}Values"
+    root_type = strawberry.type(type(root_name, (), root_namespace), name=root_name)
+
+    def build(proxy: PreferenceProxy) -> Any:
+        values = proxy.to_full_dict()
+        kwargs: dict[str, Any] = {}
+        for group_key, group_type, converters in groups:
+            kwargs[group_key] = group_type(
+                **{
+                    key: values[key] if convert is None else convert(values[key])
+                    for key, convert in converters
+                }
+            )
+        return root_type(**kwargs)
+
+    return root_type, build
+
+
+def _pref_annotation(prefix: str, pref: Any) -> tuple[Any, Callable[[Any], Any] | None]:
+    if pref.choices:
+        enum_type, members = _choices_enum(f"{prefix}{_camel(pref.key)}", pref.choices)
+        if pref.pref_type is list:
+            return list[enum_type], lambda value: (
+                None if value is None else [members.get(item) for item in value]
+            )
+        return enum_type, lambda value: members.get(value)
+    if pref.pref_type is list:
+        return list[JSON], None
+    if pref.pref_type is int and not _fits_int32(pref):
+        return JSON, None
+    return _SCALARS.get(pref.pref_type, JSON), None
+
+
+def _fits_int32(pref: Any) -> bool:
+    """True if ``ge``/``le`` keep every valid value within GraphQL's 32-bit Int."""
+    return (
+        pref.ge is not None
+        and pref.le is not None
+        and pref.ge >= _INT32_MIN
+        and pref.le <= _INT32_MAX
+    )
+
+
+def _choices_enum(name: str, choices: list[tuple[str, str]]) -> tuple[type, dict[Any, Any]]:
+    member_names: dict[str, Any] = {}
+    for value, label in choices:
+        member = re.sub(r"\W", "_", str(value)).upper() or "_"
+        if member[0].isdigit():
+            member = f"_{member}"
+        while member in member_names:
+            member = f"{member}_"
+        member_names[member] = strawberry.enum_value(value, description=label or None)
+    enum_type = strawberry.enum(Enum(name, member_names), name=name)  # type: ignore[misc]
+    return enum_type, {member.value: member for member in enum_type}
+
+
+def _camel(key: str) -> str:
+    return "".join(part.capitalize() for part in key.split("_"))
@@ -1,3 +1,10 @@
-from .fields import PreferenceField
+from .fields import LazyParentQueryError, LazyParentQueryWarning, PreferenceField
+from .query import PreferenceManager, PreferenceQuerySet
 
-__all__ = ["PreferenceField"]
+__all__ = [
+    "LazyParentQueryError",
+    "LazyParentQueryWarning",
+    "PreferenceField",
+    "PreferenceManager",
+    "PreferenceQuerySet",
+]
@@ -0,0 +1,18 @@
+"""Django app configuration, for the management commands and startup instrumentation."""
+
+from django.apps import AppConfig
+from django.utils.module_loading import import_string
+
+from .. import instrumentation
+from ..conf import get_setting
+
+
+class SerialPreferencesConfig(AppConfig):
+    name = "serial_preferences.django"
+    label = "serial_preferences"
+    verbose_name = "Serial preferences"
+
+    def ready(self) -> None:
+        recorder = get_setting("RECORDER")
+        if recorder:
+            instrumentation.enable(import_string(recorder)())
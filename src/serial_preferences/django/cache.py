@@ -0,0 +1,151 @@
+"""Cross-request cache of parent preference data, backed by Django's cache framework."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from ..proxy import PreferenceProxy, chain_levels
+from .fields import PreferenceField
+from .proxy_cache import get_parent_proxy_cache
+
+# Bumped when the layout of cache entries changes.
+CACHE_KEY_VERSION = 1
+
+# Returned by cached_parent() when the cache does not apply to a path.
+NOT_CACHED: Any = object()
+
+Hop = tuple[models.ForeignKey, PreferenceField]
+
+_hops: dict[PreferenceField, tuple[Hop | None, ...]] = {}
+
+
+def cache_key(field: PreferenceField, pk: Any) -> str:
+    """Cache key for one row's data, versioned by the schema fingerprint."""
+    fingerprint = field.schema.schema_fingerprint()[:16]
+    return f"serial_preferences:{CACHE_KEY_VERSION}:{field.level_label}:{fingerprint}:{pk}"
+
+
+def invalidate(field: PreferenceField, pks: Iterable[Any], using: str | None = None) -> None:
+    """Drop cached data of the given rows.
+
+    Inside a transaction on ``using`` the entries are dropped again when it
+    commits, as a concurrent reader may have cached the old row meanwhile.
+    """
+    keys = [cache_key(field, pk) for pk in pks]
+    if not keys:
+        return
+    cache = caches[field.cache]
+    cache.delete_many(keys)
+    using = using or DEFAULT_DB_ALIAS
+    if connections[using].in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys), using=using)
+
+
+def single_hops(field: PreferenceField) -> tuple[Hop | None, ...]:
+    """For each ``inherits_from`` path, its foreign key and target field if it is one hop.
+
+    Paths that are not ``"<foreign key to a primary key>.<PreferenceField>"``
+    map to None.
+    """
+    hops = _hops.get(field)
+    if hops is None:
+        hops = _hops[field] = tuple(_single_hop(field.model, path) for path in field.parent_paths)
+    return hops
+
+
+def _single_hop(model: type[models.Model], path: str) -> Hop | None:
+    parts = path.split(".")
+    if len(parts) != 2:
+        return None
+    try:
+        rel = model._meta.get_field(parts[0])
+    except FieldDoesNotExist:
+        return None
+    if not (rel.many_to_one and rel.concrete and rel.target_field.primary_key):
+        return None
+    try:
+        target = rel.related_model._meta.get_field(parts[1])
+    except FieldDoesNotExist:
+        return None
+    if not isinstance(target, PreferenceField):
+        return None
+    return rel, target
+
+
+def _cacheable(field: PreferenceField) -> bool:
+    # A cached level rebuilds its own parents from foreign key values alone.
+    return bool(field.cache) and None not in single_hops(field)
+
+
+def cached_parent(instance: Any, hop: Hop | None) -> PreferenceProxy | None:
+    """Resolve one ``inherits_from`` level of ``instance`` through the cache.
+
+    Returns NOT_CACHED when the target field is not cached or the related
+    object is already loaded on ``instance``.
+    """
+    if hop is None:
+        return NOT_CACHED
+    rel, target = hop
+    if not _cacheable(target) or rel.is_cached(instance):
+        return NOT_CACHED
+    pk = getattr(instance, rel.attname)
+    if pk is None:
+        return None
+    return _cached_proxy(target, pk, instance._state.db, lambda: getattr(instance, rel.name))
+
+
+def _cached_proxy(
+    field: PreferenceField,
+    pk: Any,
+    using: str | None,
+    load: Callable[[], models.Model | None],
+) -> PreferenceProxy | None:
+    cache = caches[field.cache]
+    key = cache_key(field, pk)
+    entry = cache.get(key)
+    if entry is None:
+        obj = load()
+        if obj is None:
+            return None
+        proxy = getattr(obj, field.name)
+        refs = [getattr(obj, rel.attname) for rel, _ in single_hops(field)]
+        cache.set(key, (proxy.to_dict(), refs))
+        return proxy
+    data, refs = entry
+    levels = [
+        None if ref is None else _level_proxy(target, ref, using)
+        for (_, target), ref in zip(single_hops(field), refs)
+    ]
+    shared = get_parent_proxy_cache()
+    if shared is not None:
+        return shared.proxy(field, pk, data, levels)
+    parent = chain_levels(levels)
+    return PreferenceProxy(field.schema, data, parent=parent, label=field.level_label)
+
+
+def _level_proxy(field: PreferenceField, pk: Any, using: str | None) -> PreferenceProxy | None:
+    def load() -> models.Model | None:
+        return field.model._base_manager.db_manager(using).filter(pk=pk).first()
+
+    if _cacheable(field):
+        return _cached_proxy(field, pk, using, load)
+    obj = load()
+    return None if obj is None else getattr(obj, field.name)
+
+
+def connect_invalidation(model: type[models.Model]) -> None:
+    """Invalidate cached rows of ``model`` when they are saved or deleted."""
+    uid = f"serial_preferences.cache:{model._meta.label}"
+    post_save.connect(_on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_on_save, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _on_save(sender: type[models.Model], instance: Any, **kwargs: Any) -> None:
+    for field in sender._meta.concrete_fields:
+        if isinstance(field, PreferenceField) and field.cache:
+            invalidate(field, [instance.pk], kwargs.get("using"))
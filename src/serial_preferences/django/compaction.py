@@ -0,0 +1,36 @@
+"""Compaction — rewrite stored preferences without values equal to their default."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+
+from .query import get_preference_field
+from .rewrite import rewrite_preferences
+
+
+def compact_preferences(
+    queryset: models.QuerySet, field: str | None = None, batch_size: int = 1000
+) -> int:
+    """Drop default-equal values from every row of ``queryset``; return the rows rewritten.
+
+    Rows are streamed and written back in batches (see ``rewrite_preferences``).
+    The field must not have ``inherits_from``: there a stored default shadows
+    the parent's value.
+
+        compact_preferences(Franchise.objects.all())
+    """
+    pref_field = get_preference_field(queryset.model, field)
+    if pref_field.parent_paths:
+        raise ValueError(
+            f"'{pref_field.level_label}' has inherits_from; its stored defaults are not redundant."
+        )
+
+    def compact(data: dict[str, Any]) -> bool:
+        stale = pref_field.default_keys(data)
+        for key in stale:
+            del data[key]
+        return bool(stale)
+
+    return rewrite_preferences(queryset, pref_field, compact, batch_size)
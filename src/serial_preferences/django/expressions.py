@@ -0,0 +1,77 @@
+"""JSONPatch — set/remove top-level keys of a JSON column without rewriting the document."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+
+from django.db import NotSupportedError
+from django.db.models import Func
+from django.db.models.fields.json import compile_json_path
+
+
+class JSONPatch(Func):
+    """Expression that sets and removes top-level keys of a JSON column in place.
+
+    Usage:
+        Business.objects.filter(pk=1).update(
+            preferences=JSONPatch("preferences", {"prepay_enabled": False}, ["receipt_footer"])
+        )
+
+    Compiles to ``JSON_SET``/``JSON_REMOVE`` on SQLite and MySQL/MariaDB and to
+    ``||``/``-`` on PostgreSQL. Removals are applied before sets.
+    """
+
+    def __init__(
+        self,
+        expression: Any,
+        set_values: dict[str, Any] | None = None,
+        remove_keys: Iterable[str] = (),
+        encoder: type[json.JSONEncoder] | None = None,
+        **extra: Any,
+    ) -> None:
+        super().__init__(expression, **extra)
+        self.set_values = dict(set_values or {})
+        self.remove_keys = list(remove_keys)
+        self.encoder = encoder
+
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(value, cls=self.encoder)
+
+    def as_sql(self, compiler: Any, connection: Any, **extra_context: Any) -> Any:
+        raise NotSupportedError(
+            f"Partial JSON updates are not supported on {connection.vendor}."
+        )
+
+    def _as_json_functions(
+        self, compiler: Any, connection: Any, parse_json: str
+    ) -> tuple[str, list[Any]]:
+        sql, params = compiler.compile(self.source_expressions[0])
+        params = list(params)
+        if self.remove_keys:
+            placeholders = ", ".join(["%s"] * len(self.remove_keys))
+            sql = f"JSON_REMOVE({sql}, {placeholders})"
+            params.extend(compile_json_path([key]) for key in self.remove_keys)
+        if self.set_values:
+            pairs = ", ".join([f"%s, {parse_json}"] * len(self.set_values))
+            sql = f"JSON_SET({sql}, {pairs})"
+            for key, value in self.set_values.items():
+                params.extend([compile_json_path([key]), self._dumps(value)])
+        return sql, params
+
+    def as_sqlite(self, compiler: Any, connection: Any, **extra_context: Any) -> Any:
+        return self._as_json_functions(compiler, connection, "JSON(%s)")
+
+    def as_mysql(self, compiler: Any, connection: Any, **extra_context: Any) -> Any:
+        return self._as_json_functions(compiler, connection, "JSON_EXTRACT(%s, '$')")
+
+    def as_postgresql(self, compiler: Any, connection: Any, **extra_context: Any) -> Any:
+        sql, params = compiler.compile(self.source_expressions[0])
+        params = list(params)
+        if self.remove_keys:
+            sql = f"({sql} - %s::text[])"
+            params.append(self.remove_keys)
+        if self.set_values:
+            sql = f"({sql} || %s::jsonb)"
+            params.append(self._dumps(self.set_values))
+        return sql, params
@@ -2,14 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Any
+import json
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Any, Iterator
 
-from django.core.exceptions import ValidationError
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models import prefetch_related_objects
+from django.db.models.fields.json import KeyTransform
 
-from ..proxy import PreferenceProxy
+from .. import instrumentation
+from ..codec import get_codec
+from ..conf import get_setting
+from .expressions import JSONPatch
+from .proxy_cache import get_parent_proxy_cache
+from ..proxy import PreferenceProxy, chain_levels
 from ..schema import PreferenceSchema
-from ..validators import coerce_and_validate
+
+try:
+    from django.db.models import aprefetch_related_objects
+except ImportError:  # older Django
+    aprefetch_related_objects = sync_to_async(prefetch_related_objects)
+
+# Returned by PreferenceField.materialized_parent() when the column cannot be used.
+NOT_MATERIALIZED: Any = object()
+
+
+class LazyParentQueryWarning(RuntimeWarning):
+    """Parent resolution ran a database query (``LAZY_PARENT_QUERIES = "warn"``)."""
+
+
+class LazyParentQueryError(RuntimeError):
+    """Parent resolution tried to run a database query (``LAZY_PARENT_QUERIES = "raise"``)."""
+
+
+class RawPreferences(str):
+    """Undecoded JSON text loaded from the database by a ``lazy=True`` PreferenceField.
+
+    It is decoded on first access through the model attribute, and written back
+    verbatim on save if it never was. Querysets using ``values()`` return it
+    as-is.
+    """
+
+    __slots__ = ()
 
 
 class PreferenceField(models.JSONField):
@@ -24,17 +62,67 @@ class PreferenceField(models.JSONField):
             preferences = PreferenceField(
                 BusinessPreferences, inherits_from="business.preferences"
             )
+
+    ``inherits_from`` may also be a list of paths, nearest level first. Each
+    level contributes its own stored values, and the last one also brings its
+    own ``inherits_from`` chain:
+
+        class Outlet(models.Model):
+            preferences = PreferenceField(
+                BusinessPreferences,
+                inherits_from=["region.preferences", "business.preferences"],
+            )
+
+    With ``lazy=True`` the JSON text is kept undecoded until the attribute is
+    first accessed, so rows whose preferences are never read skip decoding.
+
+    With ``cache="<alias>"`` the stored values are kept in that Django cache
+    for models inheriting from this field through a foreign key: resolving
+    the parent reads the cache instead of the related row. Entries are
+    invalidated on ``save()``, ``delete()``, ``save_preferences()`` and
+    ``update_preferences()``; other queryset updates bypass invalidation.
+
+    With ``materialize=True`` the values inherited from the parents are also
+    stored in a second JSON column, ``<name>_inherited``, which reads use
+    instead of following ``inherits_from``. Values are stored under the label
+    of the level supplying them, so ``value_source()`` still names that level
+    and keys left at their default report None. It is recomputed when the row is
+    saved and propagated to the affected rows when a parent changes (see
+    ``serial_preferences.django.materialize``).
+
+    With ``store="sparse"`` values equal to their schema default are not
+    stored: ``save()`` drops them and ``save_preferences()`` writes them as
+    resets. Fields with ``inherits_from`` reject it, as there a stored
+    default shadows a parent value. Existing rows are compacted with
+    ``serial_preferences.django.compaction``.
     """
 
     def __init__(
         self,
         schema: type[PreferenceSchema],
-        inherits_from: str | None = None,
+        inherits_from: str | list[str] | tuple[str, ...] | None = None,
         *args: Any,
+        lazy: bool = False,
+        cache: str | None = None,
+        materialize: bool = False,
+        store: str = "full",
         **kwargs: Any,
     ) -> None:
         self.schema = schema
         self.inherits_from = inherits_from
+        if isinstance(inherits_from, str):
+            self.parent_paths: tuple[str, ...] = (inherits_from,)
+        else:
+            self.parent_paths = tuple(inherits_from or ())
+        self.lazy = lazy
+        self.cache = cache
+        self.materialize = materialize
+        if store not in ("full", "sparse"):
+            raise ValueError(f"PreferenceField store must be 'full' or 'sparse', not {store!r}.")
+        if store == "sparse" and self.parent_paths:
+            # A stored default would be dropped and the parent's value read instead.
+            raise ValueError("PreferenceField store='sparse' cannot be used with inherits_from.")
+        self.store = store
         kwargs.setdefault("default", dict)
         kwargs.setdefault("blank", True)
         super().__init__(*args, **kwargs)
@@ -45,6 +133,14 @@ class PreferenceField(models.JSONField):
         args = [self.schema] + list(args)
         if self.inherits_from:
             kwargs["inherits_from"] = self.inherits_from
+        if self.lazy:
+            kwargs["lazy"] = True
+        if self.cache:
+            kwargs["cache"] = self.cache
+        if self.materialize:
+            kwargs["materialize"] = True
+        if self.store != "full":
+            kwargs["store"] = self.store
         kwargs.pop("default", None)
         kwargs.pop("blank", None)
         return name, path, args, kwargs
@@ -53,39 +149,450 @@ class PreferenceField(models.JSONField):
         super().contribute_to_class(cls, name)
         descriptor = _PreferenceDescriptor(self, name)
         setattr(cls, name, descriptor)
+        if not hasattr(cls, "save_preferences"):
+            cls.save_preferences = save_preferences
+            cls.asave_preferences = asave_preferences
+        if not hasattr(cls, f"a{name}"):
+            setattr(cls, f"a{name}", _async_accessor(name))
+        if self.cache and not cls._meta.abstract:
+            from .cache import connect_invalidation
+
+            connect_invalidation(cls)
+        # Historical models built by migrations declare the column themselves.
+        if self.materialize and not cls._meta.abstract and cls.__module__ != "__fake__":
+            from .materialize import connect_propagation
+
+            cls.add_to_class(
+                self.inherited_attname, models.JSONField(default=dict, blank=True, editable=False)
+            )
+            connect_propagation()
 
     def validate(self, value: Any, model_instance: Any) -> None:
         """Validate all values in the dict against the schema."""
         if not isinstance(value, dict):
             raise ValidationError("Preference data must be a dict.")
+        validators = self.schema._validators
         for key, val in value.items():
-            if key not in self.schema._preferences:
+            validator = validators.get(key)
+            if validator is None:
                 raise ValidationError(f"Unknown preference key: '{key}'.")
-            pref = self.schema._preferences[key]
-            coerce_and_validate(val, pref)
+            validator(val)
+
+    def from_db_value(self, value: Any, expression: Any, connection: Any) -> Any:
+        if not isinstance(value, str) or isinstance(expression, KeyTransform):
+            return super().from_db_value(value, expression, connection)
+        if self.lazy:
+            return RawPreferences(value)
+        if self.decoder is not None:
+            return super().from_db_value(value, expression, connection)
+        try:
+            return get_codec().loads(value)
+        except ValueError:
+            return value
+
+    def get_prep_value(self, value: Any) -> Any:
+        # bulk_update() reads the attribute, i.e. the proxy.
+        if isinstance(value, PreferenceProxy):
+            value = value.to_dict()
+        return super().get_prep_value(value)
+
+    def get_db_prep_value(self, value: Any, connection: Any, prepared: bool = False) -> Any:
+        if isinstance(value, RawPreferences):
+            # Untouched lazy data: write the original text back unchanged.
+            return self._adapt_json_text(str(value), connection)
+        if self.encoder is not None:
+            return super().get_db_prep_value(value, connection, prepared)
+        if not prepared:
+            value = self.get_prep_value(value)
+        if hasattr(value, "as_sql"):
+            return value
+        return self._adapt_json_text(get_codec().dumps(value), connection)
+
+    def _adapt_json_text(self, text: str, connection: Any) -> Any:
+        if connection.vendor == "postgresql":
+            from django.db.backends.postgresql.psycopg_any import Jsonb
+
+            return Jsonb(text, dumps=str)
+        return text
 
     def value_from_object(self, obj: Any) -> Any:
         """Return the raw dict for serialization (not the PreferenceProxy)."""
         raw = obj.__dict__.get(self.attname, {})
+        if isinstance(raw, RawPreferences):
+            raw = self.decode(obj)
         return raw or {}
 
     def pre_save(self, model_instance: Any, add: bool) -> Any:
         """Return the raw dict for DB save, not the PreferenceProxy."""
-        return model_instance.__dict__.get(self.attname, {}) or {}
+        if self.materialize:
+            # The companion column is saved after this one.
+            model_instance.__dict__[self.inherited_attname] = self.inherited_values(model_instance)
+        raw = model_instance.__dict__.get(self.attname, {}) or {}
+        if self.sparse and isinstance(raw, dict):
+            # In place, so the proxy keeps matching what is stored.
+            for key in self.default_keys(raw):
+                del raw[key]
+        proxy = model_instance.__dict__.get(f"_pref_proxy_{self.name}")
+        if proxy is not None:
+            # The whole dict is written, so a later save_preferences() must
+            # not write these keys again over other writers' updates.
+            proxy.mark_clean()
+        return raw
+
+    def decode(self, instance: Any) -> dict[str, Any]:
+        """Decode lazily loaded JSON text on ``instance`` in place and return the dict."""
+        raw = instance.__dict__.get(self.attname)
+        if isinstance(raw, RawPreferences):
+            if self.decoder is not None:
+                raw = json.loads(raw, cls=self.decoder)
+            else:
+                raw = get_codec().loads(raw)
+            instance.__dict__[self.attname] = raw
+        return raw
+
+    @property
+    def sparse(self) -> bool:
+        """True if values equal to their default are left out of storage."""
+        return self.store == "sparse"
+
+    def default_keys(self, data: dict[str, Any]) -> list[str]:
+        """Keys of ``data`` holding exactly their schema default."""
+        prefs = self.schema._preferences
+        return [
+            key
+            for key, value in data.items()
+            if key in prefs and _is_default(value, prefs[key].default)
+        ]
+
+    @property
+    def inherited_attname(self) -> str:
+        """Name of the column holding materialized inherited values."""
+        return f"{self.name}_inherited"
+
+    def inherited_values(self, instance: Any) -> dict[str, dict[str, Any]]:
+        """Compute the values ``instance`` inherits, keyed by the level supplying them.
+
+            {"refs": {"business_id": "7"},
+             "levels": {"shop.Business.preferences": {"max_prepay_amount": 500},
+                        "shop.Chain.preferences": {}}}
+
+        Every level of the resolved chain is listed, nearest first; keys
+        left at their default are not stored. ``refs`` holds the foreign keys
+        the values were computed from (see ``materialized_parent``).
+        """
+        prefs = self.schema._preferences
+        levels: dict[str, dict[str, Any]] = {}
+        seen: set[str] = set()
+        node = self._follow_inherits_from(instance)
+        while node is not None:
+            values = levels.setdefault(node._label or node._schema.__name__, {})
+            for key, value in node._data.items():
+                if key in prefs and key not in seen:
+                    seen.add(key)
+                    values[key] = value
+            node = node._parent
+        return {"refs": self._parent_refs(instance), "levels": levels}
+
+    def materialized_parent(self, instance: Any) -> PreferenceProxy | None:
+        """Rebuild the parent chain from ``<name>_inherited``.
+
+        Returns NOT_MATERIALIZED when the column is empty or was computed for
+        other parents than the ones ``instance`` now points to, e.g. after
+        ``location.business = other`` and before the row is saved.
+        """
+        inherited = instance.__dict__.get(self.inherited_attname)
+        if not inherited or inherited.get("refs") != self._parent_refs(instance):
+            return NOT_MATERIALIZED
+        parent = None
+        for label, values in reversed(list(inherited["levels"].items())):
+            parent = PreferenceProxy(self.schema, values, parent=parent, label=label)
+        return parent
+
+    def parent_relations(self) -> list[models.Field]:
+        """Relations of this model that ``inherits_from`` paths start with."""
+        relations = []
+        for path in self.parent_paths:
+            try:
+                rel = self.model._meta.get_field(path.split(".")[0])
+            except FieldDoesNotExist:
+                continue
+            if rel.concrete and rel.is_relation and rel not in relations:
+                relations.append(rel)
+        return relations
+
+    def _parent_refs(self, instance: Any) -> dict[str, str | None]:
+        # As strings, so they compare equal after a JSON round trip.
+        refs = {}
+        for rel in self.parent_relations():
+            value = instance.__dict__.get(rel.attname)
+            refs[rel.attname] = None if value is None else str(value)
+        return refs
+
+    @property
+    def level_label(self) -> str:
+        """Name reported by ``PreferenceProxy.value_source`` for values stored here."""
+        return f"{self.model._meta.label}.{self.name}"
+
+    def patch_expression(
+        self, set_values: dict[str, Any], reset_keys: list[str] | tuple[str, ...] = ()
+    ) -> JSONPatch:
+        """Return an update expression that touches only the given keys."""
+        return JSONPatch(self.attname, set_values, reset_keys, encoder=self.encoder)
 
     def _resolve_parent_proxy(self, instance: Any) -> PreferenceProxy | None:
-        """Resolve the parent PreferenceProxy from the inherits_from dotted path."""
+        """Resolve the parent PreferenceProxy from the inherits_from dotted path(s)."""
         if not self.inherits_from:
             return None
-        parts = self.inherits_from.split(".")
-        obj = instance
-        for part in parts:
-            obj = getattr(obj, part, None)
-            if obj is None:
-                return None
-        if isinstance(obj, PreferenceProxy):
-            return obj
+        if self.materialize:
+            parent = self.materialized_parent(instance)
+            if parent is not NOT_MATERIALIZED:
+                return parent
+        mode = get_setting("LAZY_PARENT_QUERIES")
+        if mode:
+            with self._detect_lazy_queries(instance, mode):
+                return self._follow_inherits_from(instance)
+        return self._follow_inherits_from(instance)
+
+    async def aresolve(self, instance: Any) -> PreferenceProxy:
+        """Async counterpart of ``instance.<field>``, safe to await in async views.
+
+        Loads the ``inherits_from`` parents that are not already cached on
+        ``instance`` with the async ORM, one query per directly related
+        parent (``select_related`` covers the rest of each chain), then returns
+        the proxy, which resolves without further queries. Models get an
+        ``a<field>()`` shortcut: ``await location.apreferences()``.
+        """
+        if self.parent_paths and not (
+            self.materialize and self.materialized_parent(instance) is not NOT_MATERIALIZED
+        ):
+            from .query import parent_lookups
+
+            select, prefetch = parent_lookups(type(instance), self.name)
+            await _aload_related(instance, select, instance._state.db)
+            if prefetch:
+                await aprefetch_related_objects([instance], *prefetch)
+        return getattr(instance, self.name)
+
+    def _follow_inherits_from(self, instance: Any) -> PreferenceProxy | None:
+        return chain_levels(self._parent_levels(instance))
+
+    def _parent_levels(self, instance: Any) -> list[PreferenceProxy | None]:
+        """Proxies of each ``inherits_from`` level of ``instance``, nearest first."""
+        from .cache import single_hops
+
+        return [
+            self._parent_level(instance, path, hop)
+            for path, hop in zip(self.parent_paths, single_hops(self))
+        ]
+
+    def _parent_level(self, instance: Any, path: str, hop: Any) -> PreferenceProxy | None:
+        """Resolve one ``inherits_from`` level, through the Django cache where it applies."""
+        from .cache import NOT_CACHED, cached_parent
+
+        level = cached_parent(instance, hop)
+        if level is NOT_CACHED:
+            level = _follow_path(instance, path)
+        return level
+
+    @contextmanager
+    def _detect_lazy_queries(self, instance: Any, mode: str) -> Iterator[None]:
+        """Warn about (or block) queries issued while following ``inherits_from``."""
+        label = f"{type(instance)._meta.label}.{self.name} (inherits_from={self.inherits_from!r})"
+        queries: list[str] = []
+
+        def wrapper(execute: Any, sql: str, params: Any, many: bool, context: Any) -> Any:
+            if mode == "raise":
+                raise LazyParentQueryError(
+                    f"Resolving preference parents for {label} triggered a query: {sql}. "
+                    f"Use with_preference_parents() or select_related()."
+                )
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        connection = connections[instance._state.db or DEFAULT_DB_ALIAS]
+        with connection.execute_wrapper(wrapper):
+            yield
+        if queries:
+            warnings.warn(
+                f"Resolving preference parents for {label} triggered "
+                f"{len(queries)} lazy quer{'y' if len(queries) == 1 else 'ies'}. "
+                f"Use with_preference_parents() or select_related().",
+                LazyParentQueryWarning,
+                stacklevel=5,
+            )
+
+
+def _is_default(value: Any, default: Any) -> bool:
+    # ``1 == True``, but a stored 1 is not a default True.
+    return type(value) is type(default) and value == default
+
+
+def _follow_path(instance: Any, path: str) -> PreferenceProxy | None:
+    *relations, attr = path.split(".")
+    obj = instance
+    for part in relations:
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    shared = get_parent_proxy_cache()
+    if (
+        shared is not None
+        and isinstance(obj, models.Model)
+        and obj.pk is not None
+        # A related instance with a proxy of its own is inherited from directly.
+        and f"_pref_proxy_{attr}" not in obj.__dict__
+    ):
+        field = _preference_field(type(obj), attr)
+        if field is not None and field.attname in obj.__dict__:
+            levels = field._parent_levels(obj) if field.parent_paths else []
+            proxy = shared.proxy(field, obj.pk, field.decode(obj) or {}, levels)
+            # Re-pointed at obj's own proxy if one is built later; see _reparent().
+            obj.__dict__.setdefault(f"_pref_shared_{attr}", []).append((proxy, instance))
+            return proxy
+    value = getattr(obj, attr, None)
+    if isinstance(value, PreferenceProxy):
+        return value
+    return None
+
+
+def _preference_field(model: type[models.Model], name: str) -> PreferenceField | None:
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
         return None
+    return field if isinstance(field, PreferenceField) else None
+
+
+def save_preferences(self: Any, fields: list[str] | None = None, using: str | None = None) -> None:
+    """Write only the preference keys changed through set/reset since the last write.
+
+    Added to models with a PreferenceField as ``instance.save_preferences()``.
+    Unlike ``save()``, concurrent writers touching different keys do not
+    overwrite each other, and the rest of the row is left alone.
+    """
+    updates, proxies = _pending_updates(self, fields)
+    if not updates:
+        return
+    db = using or self._state.db
+    type(self)._base_manager.using(db).filter(pk=self.pk).update(**updates)
+    for proxy in proxies:
+        proxy.mark_clean()
+    _after_write(self, updates, db)
+
+
+async def asave_preferences(
+    self: Any, fields: list[str] | None = None, using: str | None = None
+) -> None:
+    """Async ``save_preferences()``: writes with ``aupdate()``.
+
+    Cache invalidation and materialized propagation, when the model has
+    either, run in a single ``sync_to_async`` call after the write.
+    """
+    updates, proxies = _pending_updates(self, fields)
+    if not updates:
+        return
+    db = using or self._state.db
+    await type(self)._base_manager.using(db).filter(pk=self.pk).aupdate(**updates)
+    for proxy in proxies:
+        proxy.mark_clean()
+    from .materialize import dependents
+
+    cached = any(field.cache for field in _written_fields(self, updates))
+    if cached or dependents(type(self)):
+        await sync_to_async(_after_write)(self, updates, db)
+
+
+def _pending_updates(
+    instance: Any, fields: list[str] | None
+) -> tuple[dict[str, Any], list[PreferenceProxy]]:
+    """Patch expressions for each preference field with changes, and their proxies."""
+    if instance.pk is None:
+        raise ValueError(
+            f"{type(instance).__name__} must be saved before calling save_preferences()."
+        )
+    updates: dict[str, Any] = {}
+    proxies: list[PreferenceProxy] = []
+    for field in type(instance)._meta.concrete_fields:
+        if not isinstance(field, PreferenceField):
+            continue
+        if fields is not None and field.name not in fields:
+            continue
+        proxy = instance.__dict__.get(f"_pref_proxy_{field.name}")
+        if proxy is None:
+            continue
+        set_values, reset_keys = proxy.changes()
+        if field.sparse:
+            for key in field.default_keys(set_values):
+                del set_values[key]
+                del proxy._data[key]
+                reset_keys.append(key)
+        if set_values or reset_keys:
+            updates[field.attname] = field.patch_expression(set_values, reset_keys)
+            proxies.append(proxy)
+    return updates, proxies
+
+
+def _written_fields(instance: Any, updates: dict[str, Any]) -> list[PreferenceField]:
+    return [
+        field
+        for field in type(instance)._meta.concrete_fields
+        if isinstance(field, PreferenceField) and field.attname in updates
+    ]
+
+
+def _after_write(instance: Any, updates: dict[str, Any], db: str) -> None:
+    """Invalidate cached copies and refresh materialized dependents of a written row."""
+    for field in _written_fields(instance, updates):
+        if field.cache:
+            from .cache import invalidate
+
+            invalidate(field, [instance.pk], db)
+    from .materialize import dependents, propagate
+
+    if dependents(type(instance)):
+        propagate(type(instance), [instance.pk], using=db)
+
+
+async def _aload_related(obj: Any, lookups: list[str], db: str | None) -> None:
+    """Load ``select_related``-style lookups onto ``obj`` with the async ORM.
+
+    Relations already cached on ``obj`` are kept and followed further.
+    """
+    hops: dict[str, list[str]] = {}
+    for lookup in lookups:
+        first, _, rest = lookup.partition("__")
+        hops.setdefault(first, [])
+        if rest:
+            hops[first].append(rest)
+    for name, rest in hops.items():
+        rel = obj._meta.get_field(name)
+        if rel.is_cached(obj):
+            related = rel.get_cached_value(obj)
+        elif rel.concrete:
+            value = getattr(obj, rel.attname)
+            related = None
+            if value is not None:
+                queryset = rel.related_model._base_manager.db_manager(db)
+                if rest:
+                    queryset = queryset.select_related(*rest)
+                related = await queryset.aget(**{rel.target_field.attname: value})
+            rel.set_cached_value(obj, related)
+            continue
+        else:
+            # A reverse one-to-one; the prefetch machinery knows how to load it.
+            await aprefetch_related_objects([obj], name)
+            related = rel.get_cached_value(obj) if rel.is_cached(obj) else None
+        if related is not None and rest:
+            await _aload_related(related, rest, db)
+
+
+def _async_accessor(name: str) -> Any:
+    async def accessor(self: Any) -> PreferenceProxy:
+        return await type(self)._meta.get_field(name).aresolve(self)
+
+    accessor.__name__ = f"a{name}"
+    accessor.__doc__ = f"Return ``self.{name}`` after loading its parents with the async ORM."
+    return accessor
 
 
 class _PreferenceDescriptor:
@@ -101,6 +608,8 @@ class _PreferenceDescriptor:
             return self.field
         # Ensure a dict exists in instance.__dict__
         raw = instance.__dict__.get(self.field.attname)
+        if isinstance(raw, RawPreferences):
+            raw = self.field.decode(instance)
         if raw is None:
             raw = {}
             instance.__dict__[self.field.attname] = raw
@@ -109,16 +618,83 @@ class _PreferenceDescriptor:
         if cached is not None and cached._data is raw:
             return cached
         parent = self.field._resolve_parent_proxy(instance)
-        proxy = PreferenceProxy(self.field.schema, raw, parent=parent)
+        proxy = PreferenceProxy(
+            self.field.schema, raw, parent=parent, label=self.field.level_label
+        )
         instance.__dict__[self.cache_attr] = proxy
+        for shared, child in instance.__dict__.pop(f"_pref_shared_{self.attr_name}", ()):
+            _reparent(child, shared, proxy)
         return proxy
 
     def __set__(self, instance: Any, value: Any) -> None:
         if isinstance(value, PreferenceProxy):
             value = value.to_dict()
-        if isinstance(value, dict):
+        if isinstance(value, (dict, RawPreferences)):
             instance.__dict__[self.field.attname] = value
             # Invalidate cache
             instance.__dict__.pop(self.cache_attr, None)
         else:
             raise ValueError("PreferenceField value must be a dict or PreferenceProxy.")
+
+
+def _reparent(child: Any, shared: PreferenceProxy, proxy: PreferenceProxy) -> None:
+    """Make ``child``, which inherited a shared parent proxy, inherit from ``proxy`` instead.
+
+    ``proxy`` is the related instance's own proxy, so later changes to it are
+    seen by ``child`` as they are without the shared parent proxy cache.
+    Children that passed the shared proxy further down get their own proxies
+    in turn.
+    """
+    for key, value in list(child.__dict__.items()):
+        if key.startswith("_pref_proxy_"):
+            node = value
+            while node is not None:
+                if node._parent is shared:
+                    object.__setattr__(node, "_parent", proxy)
+                elif node._data is shared._data:
+                    # A chain_levels() view of the shared level.
+                    object.__setattr__(node, "_data", proxy._data)
+                else:
+                    node = node._parent
+                    continue
+                proxy._adopt(node)
+                node._invalidate()
+                break
+        elif key.startswith("_pref_shared_"):
+            getattr(child, key[len("_pref_shared_") :])
+
+
+_uninstrumented = {
+    "get": _PreferenceDescriptor.__get__,
+    "resolve": PreferenceField._resolve_parent_proxy,
+}
+
+
+def _instrument(recorder: instrumentation.Recorder | None) -> None:
+    """Swap recording versions of the descriptor and parent resolution in or out."""
+    get, resolve = _uninstrumented["get"], _uninstrumented["resolve"]
+    if recorder is None:
+        _PreferenceDescriptor.__get__ = get  # type: ignore[method-assign]
+        PreferenceField._resolve_parent_proxy = resolve  # type: ignore[method-assign]
+        return
+
+    def __get__(self: _PreferenceDescriptor, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self.field
+        cached = instance.__dict__.get(self.cache_attr)
+        proxy = get(self, instance, owner)
+        recorder.descriptor(self.field.level_label, proxy is cached)
+        return proxy
+
+    def _resolve_parent_proxy(self: PreferenceField, instance: Any) -> PreferenceProxy | None:
+        start = time.perf_counter()
+        try:
+            return resolve(self, instance)
+        finally:
+            recorder.parent_resolution(self.level_label, time.perf_counter() - start)
+
+    _PreferenceDescriptor.__get__ = __get__  # type: ignore[method-assign]
+    PreferenceField._resolve_parent_proxy = _resolve_parent_proxy  # type: ignore[method-assign]
+
+
+instrumentation.add_hook(_instrument)
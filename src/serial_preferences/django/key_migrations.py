@@ -0,0 +1,75 @@
+"""Apply a schema's key migrations to stored rows, from code, migrations or a command."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from django.db import migrations, models
+
+from ..key_migrations import migrate_data
+from .query import get_preference_field
+from .rewrite import rewrite_preferences
+
+
+def migrate_preference_keys(
+    queryset: models.QuerySet, field: str | None = None, batch_size: int = 1000
+) -> int:
+    """Apply the field schema's ``key_migrations`` to every row; return the rows rewritten.
+
+    Rows are streamed and written back in batches (see ``rewrite_preferences``).
+
+        migrate_preference_keys(Business.objects.all())
+    """
+    pref_field = get_preference_field(queryset.model, field)
+    transform = partial(migrate_data, pref_field.schema)
+    return rewrite_preferences(queryset, pref_field, transform, batch_size)
+
+
+class MigratePreferenceKeys(migrations.RunPython):
+    """Migration operation applying the key migrations to one model's rows.
+
+    Usage, in a migration:
+        operations = [
+            MigratePreferenceKeys("shop", "Business"),
+        ]
+
+    Extra keyword arguments go to ``RunPython``; pass ``atomic=False`` (in a
+    non-atomic migration) so large tables are not rewritten in one
+    transaction. Reversing it is a no-op.
+    """
+
+    def __init__(
+        self,
+        app_label: str,
+        model_name: str,
+        field: str | None = None,
+        batch_size: int = 1000,
+        **kwargs: Any,
+    ) -> None:
+        self.app_label = app_label
+        self.model_name = model_name
+        self.field = field
+        self.batch_size = batch_size
+        kwargs.setdefault("elidable", True)
+        super().__init__(self.forwards, migrations.RunPython.noop, **kwargs)
+
+    def forwards(self, apps: Any, schema_editor: Any) -> None:
+        model = apps.get_model(self.app_label, self.model_name)
+        queryset = model._base_manager.using(schema_editor.connection.alias).all()
+        migrate_preference_keys(queryset, self.field, self.batch_size)
+
+    def deconstruct(self) -> tuple[str, list[Any], dict[str, Any]]:
+        kwargs: dict[str, Any] = {"app_label": self.app_label, "model_name": self.model_name}
+        if self.field is not None:
+            kwargs["field"] = self.field
+        if self.batch_size != 1000:
+            kwargs["batch_size"] = self.batch_size
+        if self.atomic is not None:
+            kwargs["atomic"] = self.atomic
+        if self.hints:
+            kwargs["hints"] = self.hints
+        return (self.__class__.__qualname__, [], kwargs)
+
+    def describe(self) -> str:
+        return f"Migrate preference keys of {self.app_label}.{self.model_name}"
@@ -0,0 +1,50 @@
+"""Remove stored values equal to their schema default."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from ...compaction import compact_preferences
+from ...fields import PreferenceField
+from ..labels import get_preference_field
+
+
+class Command(BaseCommand):
+    help = "Rewrite stored preferences without values equal to their schema default."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "fields",
+            nargs="*",
+            metavar="app_label.Model.field",
+            help='Fields to compact (default: every field with store="sparse").',
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["fields"]:
+            fields = [get_preference_field(label) for label in options["fields"]]
+            for field in fields:
+                if field.parent_paths:
+                    raise CommandError(
+                        f"'{field.level_label}' has inherits_from and cannot be compacted."
+                    )
+        else:
+            fields = [
+                field
+                for model in apps.get_models()
+                for field in model._meta.concrete_fields
+                if isinstance(field, PreferenceField) and field.sparse
+            ]
+        for field in fields:
+            written = compact_preferences(
+                field.model._base_manager.using(options["database"]).all(),
+                field.name,
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(f"{field.level_label}: {written} rows compacted")
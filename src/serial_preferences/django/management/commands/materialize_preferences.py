@@ -0,0 +1,46 @@
+"""Rebuild the materialized ``<field>_inherited`` columns."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from ...materialize import materialized_fields, refresh_materialized
+from ...query import parent_levels
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized inherited preferences of every row."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.Model",
+            help="Only rebuild these models (default: every model with materialize=True).",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        fields = materialized_fields()
+        if options["models"]:
+            wanted = {label.lower() for label in options["models"]}
+            known = {field.model._meta.label_lower for field in fields}
+            unknown = sorted(wanted - known)
+            if unknown:
+                raise CommandError(f"No materialized preferences on: {', '.join(unknown)}.")
+            fields = [field for field in fields if field.model._meta.label_lower in wanted]
+        # Rows inheriting through other materialized rows are rebuilt after them.
+        fields.sort(key=lambda field: len(parent_levels(field.model, field)))
+        for field in fields:
+            written = refresh_materialized(
+                field.model._base_manager.using(options["database"]).all(),
+                field.name,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+            )
+            self.stdout.write(f"{field.level_label}: {written} rows updated")
@@ -0,0 +1,45 @@
+"""Apply schema key migrations (renames, drops, re-coercions) to stored rows."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from ...fields import PreferenceField
+from ...key_migrations import migrate_preference_keys
+from ..labels import get_preference_field
+
+
+class Command(BaseCommand):
+    help = "Rewrite stored preferences according to their schema's key_migrations."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "fields",
+            nargs="*",
+            metavar="app_label.Model.field",
+            help="Fields to migrate (default: every field whose schema has key_migrations).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["fields"]:
+            fields = [get_preference_field(label) for label in options["fields"]]
+        else:
+            fields = [
+                field
+                for model in apps.get_models()
+                for field in model._meta.concrete_fields
+                if isinstance(field, PreferenceField) and field.schema._key_migrations
+            ]
+        for field in fields:
+            written = migrate_preference_keys(
+                field.model._base_manager.using(options["database"]).all(),
+                field.name,
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(f"{field.level_label}: {written} rows migrated")
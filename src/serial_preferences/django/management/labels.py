@@ -0,0 +1,21 @@
+"""Resolving ``app_label.Model.field`` command arguments."""
+
+from __future__ import annotations
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import CommandError
+
+from ..fields import PreferenceField
+
+
+def get_preference_field(label: str) -> PreferenceField:
+    """Return the PreferenceField named by ``app_label.Model.field``, or raise CommandError."""
+    model_label, _, name = label.rpartition(".")
+    try:
+        field = apps.get_model(model_label)._meta.get_field(name)
+    except (LookupError, ValueError, FieldDoesNotExist) as exc:
+        raise CommandError(f"Unknown field {label!r}.") from exc
+    if not isinstance(field, PreferenceField):
+        raise CommandError(f"{label!r} is not a PreferenceField.")
+    return field
@@ -0,0 +1,192 @@
+"""Materialized inherited preferences — batched refresh and propagation on parent change."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from django.apps import apps
+from django.db import connections, models
+from django.db.models.signals import post_save
+
+from ..conf import get_setting
+from .fields import PreferenceField
+from .query import get_preference_field, parent_levels, parent_lookups
+
+_dependents: dict[type[models.Model], list[tuple[PreferenceField, str]]] = {}
+
+
+def refresh_materialized(
+    queryset: models.QuerySet,
+    field: str | None = None,
+    batch_size: int | None = None,
+    workers: int | None = None,
+) -> int:
+    """Recompute the ``<field>_inherited`` column of every row in ``queryset``.
+
+    Rows are streamed with ``iterator()`` and only those whose values
+    changed are written, ``batch_size`` at a time with ``bulk_update``
+    (``SERIAL_PREFERENCES_MATERIALIZE_BATCH_SIZE``, 500 by default). With
+    ``workers`` greater than one, batches are written from a thread pool
+    while the next ones are computed; on SQLite, which cannot write from
+    another connection while the read cursor is open, they are written
+    inline. Returns the number of rows written.
+
+        refresh_materialized(Location.objects.filter(business=business))
+    """
+    pref_field = get_preference_field(queryset.model, field)
+    if not pref_field.materialize:
+        raise ValueError(f"'{pref_field.level_label}' is not materialized.")
+    batch_size = batch_size or get_setting("MATERIALIZE_BATCH_SIZE", 500)
+    attname = pref_field.inherited_attname
+    select, prefetch = parent_lookups(queryset.model, pref_field.name)
+    rows = queryset.select_related(*select).prefetch_related(*prefetch).order_by("pk")
+    db = rows.db
+    manager = queryset.model._base_manager.db_manager(db)
+
+    def write(batch: list[models.Model]) -> int:
+        return manager.bulk_update(batch, [attname])
+
+    def write_in_thread(batch: list[models.Model]) -> int:
+        try:
+            return write(batch)
+        finally:
+            connections[db].close()
+
+    threaded = workers and workers > 1 and connections[db].vendor != "sqlite"
+    executor = ThreadPoolExecutor(workers) if threaded else None
+    futures = []
+    written = 0
+    batch: list[models.Model] = []
+    try:
+        for obj in rows.iterator(chunk_size=batch_size):
+            values = pref_field.inherited_values(obj)
+            if obj.__dict__.get(attname) == values:
+                continue
+            obj.__dict__[attname] = values
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                if executor is None:
+                    written += write(batch)
+                else:
+                    futures.append(executor.submit(write_in_thread, batch))
+                batch = []
+        if batch:
+            written += write(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return written + sum(future.result() for future in futures)
+
+
+def propagate(
+    model: type[models.Model],
+    pks: Iterable[Any],
+    batch_size: int | None = None,
+    workers: int | None = None,
+    using: str | None = None,
+) -> int:
+    """Refresh materialized rows inheriting from the given rows of ``model``.
+
+    Nearer dependents are refreshed first, so rows further down read
+    up-to-date columns from the rows they inherit through. Returns the
+    number of rows written.
+    """
+    pks = list(pks)
+    written = 0
+    for field, lookup in dependents(model):
+        queryset = field.model._base_manager.db_manager(using).filter(**{f"{lookup}__in": pks})
+        written += refresh_materialized(queryset, field.name, batch_size, workers)
+    return written
+
+
+def dependents(model: type[models.Model]) -> list[tuple[PreferenceField, str]]:
+    """Materialized fields inheriting from ``model``, with the lookup leading to it.
+
+    Sorted nearest first, e.g. ``[(Location.preferences, "business")]``.
+    """
+    model = model._meta.concrete_model
+    found = _dependents.get(model)
+    if found is None:
+        found = []
+        for child in apps.get_models():
+            for field in child._meta.concrete_fields:
+                if not (isinstance(field, PreferenceField) and field.materialize):
+                    continue
+                for relations, level_model, _ in parent_levels(child, field):
+                    lookup = "__".join(relations)
+                    if level_model._meta.concrete_model is model and (field, lookup) not in found:
+                        found.append((field, lookup))
+        found.sort(key=lambda item: item[1].count("__"))
+        _dependents[model] = found
+    return found
+
+
+def materialized_fields() -> list[PreferenceField]:
+    """Every materialized PreferenceField of the installed models."""
+    return [
+        field
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, PreferenceField) and field.materialize
+    ]
+
+
+def connect_propagation() -> None:
+    """Propagate saved rows to materialized dependents; safe to call repeatedly."""
+    post_save.connect(_on_save, weak=False, dispatch_uid="serial_preferences.materialize")
+
+
+def _on_save(
+    sender: type[models.Model],
+    instance: Any,
+    raw: bool = False,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    if raw:
+        return
+    using = kwargs.get("using")
+    if update_fields is not None:
+        _refresh_own(sender, instance, update_fields, using)
+        if update_fields.isdisjoint(_inherited_through(sender)):
+            return
+    if dependents(sender):
+        propagate(sender, [instance.pk], using=using)
+
+
+def _refresh_own(
+    model: type[models.Model], instance: Any, update_fields: frozenset[str], using: str | None
+) -> None:
+    """Recompute materialized columns that ``save(update_fields=...)`` left out.
+
+    ``pre_save()`` only runs for the listed fields, so a row re-parented
+    through one of its relations would keep the old parents' values.
+    """
+    for field in model._meta.concrete_fields:
+        if not (isinstance(field, PreferenceField) and field.materialize):
+            continue
+        if field.name in update_fields or field.attname in update_fields:
+            continue
+        relations = {name for rel in field.parent_relations() for name in (rel.name, rel.attname)}
+        if update_fields.isdisjoint(relations):
+            continue
+        values = field.inherited_values(instance)
+        instance.__dict__[field.inherited_attname] = values
+        model._base_manager.using(using).filter(pk=instance.pk).update(
+            **{field.inherited_attname: values}
+        )
+
+
+def _inherited_through(model: type[models.Model]) -> set[str]:
+    """Fields of ``model`` whose change can alter what its dependents inherit."""
+    names = set()
+    for field in model._meta.concrete_fields:
+        if isinstance(field, PreferenceField):
+            names.add(field.name)
+            if field.materialize:
+                names.add(field.inherited_attname)
+        elif field.is_relation:
+            # Dependents may inherit through this row to the related one.
+            names.update((field.name, field.attname))
+    return names
@@ -0,0 +1,30 @@
+"""Middleware scoping the shared parent proxy cache to a single request."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from .proxy_cache import clear_parent_proxy_cache
+
+
+class ParentProxyCacheMiddleware:
+    """Clear the parent proxy cache after every request.
+
+    Usage:
+        MIDDLEWARE = [
+            ...
+            "serial_preferences.django.middleware.ParentProxyCacheMiddleware",
+        ]
+
+    Without it the cache is process-scoped and bounded only by
+    ``SERIAL_PREFERENCES_PARENT_PROXY_CACHE_SIZE``.
+    """
+
+    def __init__(self, get_response: Callable[[Any], Any]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        try:
+            return self.get_response(request)
+        finally:
+            clear_parent_proxy_cache()
@@ -0,0 +1,106 @@
+"""ParentProxyCache — in-process LRU of parent proxies shared across model instances."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ..conf import get_setting
+from ..proxy import PreferenceProxy, chain_levels
+
+if TYPE_CHECKING:
+    from .fields import PreferenceField
+
+
+class ParentProxyCache:
+    """Bounded LRU of parent proxies, keyed by (field, primary key).
+
+    An entry is reused only while the row's stored data and its own parent
+    levels are unchanged, so children of the same parent row share one
+    proxy (and one resolved view) instead of building one per instance.
+    Shared proxies hold a copy of the row's data. Related instances with a
+    proxy of their own are inherited from directly, and children that were
+    given a shared proxy are moved to the instance's own proxy once it is
+    built, so changes made through it stay visible.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, Any], tuple[PreferenceProxy, tuple[Any, ...]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def proxy(
+        self,
+        field: PreferenceField,
+        pk: Any,
+        data: dict[str, Any],
+        levels: list[PreferenceProxy | None],
+    ) -> PreferenceProxy:
+        """Return the shared proxy for a row, building it if missing or out of date."""
+        key = (field.level_label, pk)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and _same_levels(entry[1], levels) and entry[0]._data == data:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        proxy = PreferenceProxy(
+            field.schema, dict(data), parent=chain_levels(levels), label=field.level_label
+        )
+        with self._lock:
+            self._entries[key] = (proxy, tuple(levels))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return proxy
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _same_levels(cached: tuple[Any, ...], levels: list[Any]) -> bool:
+    return len(cached) == len(levels) and all(a is b for a, b in zip(cached, levels))
+
+
+_cache: ParentProxyCache | None = None
+_loaded = False
+
+
+def get_parent_proxy_cache() -> ParentProxyCache | None:
+    """Return the process-wide cache, or None unless ``PARENT_PROXY_CACHE_SIZE`` is set."""
+    global _cache, _loaded
+    if not _loaded:
+        size = get_setting("PARENT_PROXY_CACHE_SIZE", 0)
+        _cache = ParentProxyCache(size) if size else None
+        _loaded = True
+    return _cache
+
+
+def clear_parent_proxy_cache() -> None:
+    """Empty the shared parent proxy cache, e.g. at the end of a request."""
+    if _cache is not None:
+        _cache.clear()
+
+
+@receiver(setting_changed)
+def _reset_cache(*, setting: str, **kwargs: Any) -> None:
+    global _cache, _loaded
+    if setting == "SERIAL_PREFERENCES_PARENT_PROXY_CACHE_SIZE":
+        _cache = None
+        _loaded = False
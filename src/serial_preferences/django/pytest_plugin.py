@@ -0,0 +1,23 @@
+"""pytest plugin providing the ``preference_query_budget`` fixture.
+
+Registered through the ``pytest11`` entry point when the package is installed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture
+def preference_query_budget() -> Any:
+    """Return ``serial_preferences.django.testing.preference_query_budget``.
+
+        def test_location_list(client, preference_query_budget):
+            with preference_query_budget(0):
+                client.get("/locations/")
+    """
+    from .testing import preference_query_budget
+
+    return preference_query_budget
@@ -0,0 +1,367 @@
+"""PreferenceQuerySet — queryset helpers that understand PreferenceField inheritance."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, FieldError, ValidationError
+from django.db import models
+from django.db.models import Expression, Value
+from django.db.models.fields.json import KeyTextTransform, KeyTransform, compile_json_path
+from django.db.models.functions import Cast, Coalesce
+
+from .cache import invalidate
+from .fields import PreferenceField
+
+# Database type used to compare/cast an extracted JSON value, by Pref.pref_type.
+_CAST_FIELDS: dict[type, type[models.Field]] = {
+    bool: models.BooleanField,
+    int: models.BigIntegerField,
+    float: models.FloatField,
+}
+
+
+class PreferenceQuerySet(models.QuerySet):
+    """QuerySet with preference-aware helpers.
+
+    Usage:
+        class Location(models.Model):
+            ...
+            objects = PreferenceManager()
+
+        Location.objects.with_preference_parents()
+    """
+
+    def with_preference_parents(self) -> PreferenceQuerySet:
+        """Load every ``inherits_from`` parent up front instead of one query per row.
+
+        Follows each PreferenceField's ``inherits_from`` paths, and the last
+        parent field's own ``inherits_from`` after that, adding ``select_related`` for
+        single-valued relations and ``prefetch_related`` for the rest (e.g.
+        generic foreign keys).
+        """
+        select, prefetch = parent_lookups(self.model)
+        qs = self
+        if select:
+            qs = qs.select_related(*select)
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+        return qs
+
+    def update_preferences(
+        self,
+        values: dict[str, Any] | None = None,
+        /,
+        *,
+        field: str | None = None,
+        reset: tuple[str, ...] | list[str] = (),
+        **changes: Any,
+    ) -> int:
+        """Set (and reset) preference keys on every row with a single UPDATE.
+
+        Values are coerced and validated once; other keys in each row's
+        document are left untouched. Returns the number of rows matched. With
+        a cached field or materialized dependents, the matched rows are listed
+        first to invalidate or propagate them. Keys named ``field`` or
+        ``reset`` are passed in the ``values`` dict.
+
+            Business.objects.filter(region="west").update_preferences(prepay_enabled=False)
+            Business.objects.update_preferences({"prepay_enabled": False}, reset=["receipt_footer"])
+        """
+        pref_field = get_preference_field(self.model, field)
+        validators = pref_field.schema._validators
+        set_values: dict[str, Any] = {}
+        for key, value in {**(values or {}), **changes}.items():
+            validator = validators.get(key)
+            if validator is None:
+                raise ValidationError(f"Unknown preference key: '{key}'.")
+            set_values[key] = validator(value)
+        for key in reset:
+            if key not in validators:
+                raise ValidationError(f"Unknown preference key: '{key}'.")
+        if pref_field.sparse:
+            defaults = pref_field.default_keys(set_values)
+            set_values = {k: v for k, v in set_values.items() if k not in defaults}
+            reset = [*reset, *defaults]
+        if not set_values and not reset:
+            return 0
+        from .materialize import dependents, propagate
+
+        propagating = bool(dependents(self.model))
+        pks = list(self.values_list("pk", flat=True)) if pref_field.cache or propagating else ()
+        count = self.update(**{pref_field.attname: pref_field.patch_expression(set_values, reset)})
+        if pks and pref_field.cache:
+            invalidate(pref_field, pks, self.db)
+        if pks and propagating:
+            propagate(self.model, pks, using=self.db)
+        return count
+
+    def set_preference(self, key: str, value: Any, field: str | None = None) -> int:
+        """Set one preference on every row in a single UPDATE.
+
+            Business.objects.filter(...).set_preference("max_prepay_amount", 20000)
+        """
+        return self.update_preferences({key: value}, field=field)
+
+    def reset_preference(self, *keys: str, field: str | None = None) -> int:
+        """Remove local overrides of the given keys on every row in a single UPDATE."""
+        return self.update_preferences(field=field, reset=keys)
+
+    def annotate_preference(self, *keys: str, field: str | None = None) -> PreferenceQuerySet:
+        """Annotate each row with the effective value of the given preference keys.
+
+        The annotation is named after the key and honors the same
+        local → parent → default order as PreferenceProxy.
+
+            Location.objects.annotate_preference("prepay_enabled")
+        """
+        pref_field = get_preference_field(self.model, field)
+        return self.annotate(
+            **{key: preference_expression(self.model, key, pref_field.name) for key in keys}
+        )
+
+    def filter_preference(
+        self,
+        conditions: dict[str, Any] | None = None,
+        /,
+        *,
+        field: str | None = None,
+        **lookups: Any,
+    ) -> PreferenceQuerySet:
+        """Filter on effective preference values, in the database.
+
+        A key named ``field`` is filtered on through the ``conditions`` dict.
+
+            Location.objects.filter_preference(prepay_enabled=False)
+            Location.objects.filter_preference(max_prepay_amount__gte=1000)
+            Location.objects.filter_preference({"field": "x"}, field="preferences")
+        """
+        pref_field = get_preference_field(self.model, field)
+        aliases: dict[str, Any] = {}
+        filters: dict[str, Any] = {}
+        for lookup, value in {**(conditions or {}), **lookups}.items():
+            key, sep, rest = lookup.partition("__")
+            alias = f"{pref_field.name}_effective_{key}"
+            if alias not in aliases:
+                aliases[alias] = preference_expression(self.model, key, pref_field.name)
+            filters[alias + sep + rest] = value
+        return self.alias(**aliases).filter(**filters)
+
+
+class PreferenceManager(models.Manager.from_queryset(PreferenceQuerySet)):  # type: ignore[misc]
+    """Manager exposing PreferenceQuerySet methods."""
+
+
+def get_preference_field(
+    model: type[models.Model], field: str | None = None
+) -> PreferenceField:
+    """Return the named PreferenceField, or the model's only one when ``field`` is None."""
+    if field is not None:
+        pref_field = model._meta.get_field(field)
+        if not isinstance(pref_field, PreferenceField):
+            raise FieldError(f"'{model._meta.label}.{field}' is not a PreferenceField.")
+        return pref_field
+    candidates = [f for f in model._meta.get_fields() if isinstance(f, PreferenceField)]
+    if len(candidates) != 1:
+        raise FieldError(
+            f"'{model._meta.label}' has {len(candidates)} PreferenceFields; pass field=..."
+        )
+    return candidates[0]
+
+
+def preference_expression(
+    model: type[models.Model], key: str, field: str | None = None
+) -> Expression:
+    """Build a database expression for the effective value of a preference.
+
+    Compiles to ``COALESCE(child[key], parent[key], ..., default)`` following
+    ``inherits_from`` through concrete single-valued relations, cast to the
+    type declared by the Pref. A key explicitly stored as JSON ``null`` falls
+    through to the next level, unlike attribute access in Python.
+    """
+    pref_field = get_preference_field(model, field)
+    pref = pref_field.schema._preferences.get(key)
+    if pref is None:
+        raise FieldError(f"Unknown preference key: '{key}'.")
+
+    output_field = _output_field(pref)
+    levels: list[Expression] = [
+        _key_value(key, path, output_field) for path in level_paths(model, pref_field)
+    ]
+    if pref.default is not None:
+        levels.append(Value(pref.default, output_field=output_field))
+    if len(levels) == 1:
+        return levels[0]
+    return Coalesce(*levels, output_field=output_field)
+
+
+def level_paths(model: type[models.Model], field: PreferenceField) -> list[str]:
+    """ORM paths to ``field`` and each PreferenceField it inherits from, nearest first.
+
+    Only concrete single-valued relations can be expressed in SQL; levels
+    reached through anything else (a generic foreign key, say) are skipped,
+    and the walk stops if the last level of ``inherits_from`` is one of them.
+    """
+    paths = [field.name]
+    for relations, _, level in parent_levels(model, field):
+        paths.append("__".join([*relations, level.name]))
+    return paths
+
+
+def parent_levels(
+    model: type[models.Model], field: PreferenceField
+) -> list[tuple[list[str], type[models.Model], PreferenceField]]:
+    """Each PreferenceField ``field`` inherits from as ``(relations, model, field)``, nearest first.
+
+    ``relations`` is the list of relation names leading from ``model`` to the
+    level; see ``level_paths`` for which levels are included.
+    """
+    levels: list[tuple[list[str], type[models.Model], PreferenceField]] = []
+    prefix: list[str] = []
+    seen = {(model, field.name)}
+    while field.parent_paths:
+        *earlier, last = field.parent_paths
+        for path in earlier:
+            level = _sql_level(model, path)
+            if level is not None:
+                levels.append(([*prefix, *level[0]], level[1], level[2]))
+        level = _sql_level(model, last)
+        if level is None:
+            return levels
+        relations, model, field = level
+        if (model, field.name) in seen:
+            return levels
+        seen.add((model, field.name))
+        prefix.extend(relations)
+        levels.append((list(prefix), model, field))
+    return levels
+
+
+def _sql_level(
+    model: type[models.Model], path: str
+) -> tuple[list[str], type[models.Model], PreferenceField] | None:
+    """Return ``(relations, model, field)`` for an ``inherits_from`` path SQL can follow."""
+    *relations, attr = path.split(".")
+    for part in relations:
+        try:
+            rel = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if not (rel.is_relation and ((rel.many_to_one and rel.concrete) or rel.one_to_one)):
+            return None
+        model = rel.related_model
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return None
+    if not isinstance(field, PreferenceField):
+        return None
+    return relations, model, field
+
+
+def _output_field(pref: Any) -> models.Field:
+    if pref.pref_type is list:
+        return models.JSONField()
+    return _CAST_FIELDS.get(pref.pref_type, models.TextField)()
+
+
+def _key_value(key: str, path: str, output_field: models.Field) -> Expression:
+    if isinstance(output_field, models.JSONField):
+        return KeyTransform(key, path)
+    value = _KeyValue(key, path)
+    if isinstance(output_field, models.TextField):
+        return value
+    return Cast(value, output_field)
+
+
+class _KeyValue(KeyTextTransform):
+    """KeyTextTransform that yields SQL-native values on SQLite.
+
+    Django's SQLite implementation returns ``'true'``/``'false'``/``'null'``
+    strings for JSON literals, which neither cast nor coalesce correctly.
+    """
+
+    def as_sqlite(self, compiler: Any, connection: Any) -> tuple[str, tuple[Any, ...]]:
+        lhs, params, key_transforms = self.preprocess_lhs(compiler, connection)
+        json_path = compile_json_path(key_transforms)
+        return f"JSON_EXTRACT({lhs}, %s)", (*params, json_path)
+
+
+def parent_lookups(
+    model: type[models.Model], field: str | None = None
+) -> tuple[list[str], list[str]]:
+    """Return ``(select_related, prefetch_related)`` lookups for a model's preference parents.
+
+    Covers every PreferenceField on the model, or only the one named ``field``.
+    """
+    select: list[str] = []
+    prefetch: list[str] = []
+    for pref_field in model._meta.get_fields():
+        if field is not None and pref_field.name != field:
+            continue
+        if isinstance(pref_field, PreferenceField) and pref_field.parent_paths:
+            _collect_lookups(model, pref_field, [], True, select, prefetch, set())
+    return select, prefetch
+
+
+def _collect_lookups(
+    model: type[models.Model],
+    field: PreferenceField,
+    prefix: list[str],
+    selectable: bool,
+    select: list[str],
+    prefetch: list[str],
+    seen: set[Any],
+) -> None:
+    # A self-referencing chain (e.g. ``parent.preferences``) is followed once.
+    if (model, field.name) in seen:
+        return
+    seen = seen | {(model, field.name)}
+
+    *levels, last = field.parent_paths
+    for path in levels:
+        _collect_path(model, path, prefix, selectable, select, prefetch)
+    # Only the last level's own inheritance chain is part of the lookup order.
+    parent = _collect_path(model, last, prefix, selectable, select, prefetch)
+    if parent is not None:
+        current, parent_field, path, selectable = parent
+        if isinstance(parent_field, PreferenceField) and parent_field.parent_paths:
+            _collect_lookups(current, parent_field, path, selectable, select, prefetch, seen)
+
+
+def _collect_path(
+    model: type[models.Model],
+    dotted: str,
+    prefix: list[str],
+    selectable: bool,
+    select: list[str],
+    prefetch: list[str],
+) -> tuple[type[models.Model], Any, list[str], bool] | None:
+    """Add lookups for one ``inherits_from`` path; return where it ends, if known."""
+    *relations, attr = dotted.split(".")
+    path = list(prefix)
+    current: type[models.Model] | None = model
+    for part in relations:
+        try:
+            rel = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            # Not a model field (a property, say); nothing the ORM can preload.
+            return None
+        if not rel.is_relation or rel.one_to_many or rel.many_to_many:
+            return None
+        path.append(part)
+        if selectable and not ((rel.many_to_one and rel.concrete) or rel.one_to_one):
+            selectable = False
+        lookup = "__".join(path)
+        target = select if selectable else prefetch
+        if lookup not in target:
+            target.append(lookup)
+        current = rel.related_model
+        if current is None:
+            # Generic relation: the target model is only known per row.
+            return None
+    try:
+        parent_field = current._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return None
+    return current, parent_field, path, selectable
@@ -0,0 +1,88 @@
+"""rewrite_preferences — stream every row's stored preferences through a transform."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from django.db import connections, models
+from django.db.models import Case, Value, When
+from django.db.models.functions import Cast
+
+from .cache import invalidate
+from .fields import PreferenceField, RawPreferences
+from .materialize import dependents, propagate
+
+
+def rewrite_preferences(
+    queryset: models.QuerySet,
+    pref_field: PreferenceField,
+    transform: Callable[[dict[str, Any]], bool],
+    batch_size: int = 1000,
+) -> int:
+    """Apply ``transform`` to the stored dict of every row; return the rows rewritten.
+
+    ``transform`` updates the dict in place and returns True if it changed.
+    Only the primary key and the preference column are loaded; rows are
+    streamed with ``iterator()`` (a server-side cursor where the database
+    supports one) and the changed ones written ``batch_size`` at a time with
+    one ``CASE`` update, so memory stays bounded on tables of any size.
+    The dicts are written as they are, without building proxies, so rows
+    with ``inherits_from`` parents cost no extra queries.
+
+    Since the update bypasses ``save()``, each batch then does what saving
+    would: the levels of a materialized field's ``<name>_inherited`` column
+    go through ``transform`` as well, the rows' cache entries are dropped and
+    materialized rows inheriting from them are refreshed.
+    """
+    model = queryset.model
+    columns = [pref_field.attname]
+    if pref_field.materialize:
+        columns.append(pref_field.inherited_attname)
+    rows = queryset.only("pk", *columns).order_by("pk")
+    manager = model._base_manager.db_manager(rows.db)
+    cast = connections[rows.db].features.requires_casted_case_in_updates
+    output_fields = [model._meta.get_field(column) for column in columns]
+
+    def write(batch: dict[Any, list[Any]]) -> int:
+        values: dict[str, Any] = {}
+        for i, (column, output_field) in enumerate(zip(columns, output_fields)):
+            value: Any = Case(
+                *(
+                    When(pk=pk, then=Value(data[i], output_field=output_field))
+                    for pk, data in batch.items()
+                ),
+                output_field=output_field,
+            )
+            if cast:
+                value = Cast(value, output_field=output_field)
+            values[column] = value
+        count = manager.filter(pk__in=list(batch)).update(**values)
+        if pref_field.cache:
+            invalidate(pref_field, batch, rows.db)
+        if dependents(model):
+            propagate(model, batch, using=rows.db)
+        return count
+
+    written = 0
+    batch: dict[Any, list[Any]] = {}
+    for obj in rows.iterator(chunk_size=batch_size):
+        raw = obj.__dict__.get(pref_field.attname)
+        if isinstance(raw, RawPreferences):
+            raw = pref_field.decode(obj)
+        changed = isinstance(raw, dict) and transform(raw)
+        data = [raw]
+        if pref_field.materialize:
+            inherited = obj.__dict__.get(pref_field.inherited_attname)
+            levels = inherited.get("levels", {}) if isinstance(inherited, dict) else {}
+            for values in levels.values():
+                changed = transform(values) or changed
+            data.append(inherited)
+        if not changed:
+            continue
+        batch[obj.pk] = data
+        if len(batch) >= batch_size:
+            written += write(batch)
+            batch = {}
+    if batch:
+        written += write(batch)
+    return written
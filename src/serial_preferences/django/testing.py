@@ -0,0 +1,125 @@
+"""Test helpers — query budgets for preference parent resolution.
+
+    from serial_preferences.django.testing import preference_query_budget
+
+    def test_location_list(client):
+        with preference_query_budget(0):
+            client.get("/locations/")
+
+Only queries issued while resolving ``inherits_from`` count towards the
+budget: the lazy foreign-key loads behind ``location.preferences`` that
+``with_preference_parents()`` or ``select_related()`` would have avoided,
+and the loads of ``cache=`` parents missing from the Django cache.
+With pytest, the ``preference_query_budget`` fixture (registered through
+the ``pytest11`` entry point) returns the same context manager.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from django.db import connections
+
+from .fields import PreferenceField
+
+
+class PreferenceQueryBudgetExceeded(AssertionError):
+    """Parent resolution issued more queries than the budget allows."""
+
+
+@dataclass(frozen=True)
+class ParentQuery:
+    """A query issued while following one ``inherits_from`` path."""
+
+    label: str  # "app_label.Model.field" doing the inheriting
+    path: str  # the inherits_from path being followed, e.g. "business.preferences"
+    sql: str
+
+
+class QueryBudget:
+    """Queries recorded by ``preference_query_budget``, grouped by field and path."""
+
+    def __init__(self, max_queries: int) -> None:
+        self.max_queries = max_queries
+        self.queries: list[ParentQuery] = []
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def by_path(self) -> dict[tuple[str, str], list[ParentQuery]]:
+        """Queries keyed by ``(label, path)``, in the order first seen."""
+        grouped: dict[tuple[str, str], list[ParentQuery]] = {}
+        for query in self.queries:
+            grouped.setdefault((query.label, query.path), []).append(query)
+        return grouped
+
+    def check(self) -> None:
+        """Raise PreferenceQueryBudgetExceeded if more queries ran than allowed."""
+        if len(self.queries) <= self.max_queries:
+            return
+        lines = [
+            f"Preference parent resolution ran {len(self.queries)} "
+            f"quer{'y' if len(self.queries) == 1 else 'ies'}, "
+            f"budget is {self.max_queries}:"
+        ]
+        for (label, path), queries in self.by_path().items():
+            lines.append(f"  {label} following {path!r}: {len(queries)}")
+            lines.extend(f"    {query.sql}" for query in queries[:3])
+            if len(queries) > 3:
+                lines.append(f"    ... and {len(queries) - 3} more")
+        lines.append("Use with_preference_parents() or select_related() on the queryset.")
+        raise PreferenceQueryBudgetExceeded("\n".join(lines))
+
+
+_local = threading.local()
+
+
+@contextmanager
+def preference_query_budget(
+    max_queries: int = 0, using: str | list[str] | None = None
+) -> Iterator[QueryBudget]:
+    """Fail if following ``inherits_from`` inside the block runs more than ``max_queries``.
+
+    ``using`` limits counting to the given database aliases (all by default).
+    The budget is checked when the block exits without an exception; the
+    yielded QueryBudget lists the queries either way.
+    """
+    budget = QueryBudget(max_queries)
+    aliases = [using] if isinstance(using, str) else using or list(connections)
+
+    def wrapper(execute: Any, sql: str, params: Any, many: bool, context: Any) -> Any:
+        frames = getattr(_local, "frames", None)
+        if frames:
+            label, path = frames[-1]
+            budget.queries.append(ParentQuery(label, path, sql))
+        return execute(sql, params, many, context)
+
+    resolve = PreferenceField._parent_level
+    PreferenceField._parent_level = _tracking(resolve)
+    try:
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(connections[alias].execute_wrapper(wrapper))
+            yield budget
+    finally:
+        PreferenceField._parent_level = resolve
+    budget.check()
+
+
+def _tracking(resolve: Any) -> Any:
+    """Wrap ``PreferenceField._parent_level`` to note which field and path is being resolved."""
+
+    def _parent_level(field: PreferenceField, instance: Any, path: str, hop: Any) -> Any:
+        frames = getattr(_local, "frames", None)
+        if frames is None:
+            frames = _local.frames = []
+        frames.append((field.level_label, path))
+        try:
+            return resolve(field, instance, path, hop)
+        finally:
+            frames.pop()
+
+    return _parent_level
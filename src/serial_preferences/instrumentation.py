@@ -0,0 +1,306 @@
+"""Opt-in instrumentation of preference reads, writes, validation and parent resolution.
+
+    from serial_preferences import instrumentation
+
+    with instrumentation.recording() as recorder:
+        render_receipt(location)
+    recorder.report()
+    recorder.unread_keys(BusinessPreferences)
+
+Nothing is instrumented until ``enable()`` is called (or the
+``SERIAL_PREFERENCES_RECORDER`` setting names a recorder class). Enabling
+swaps recording versions of the generated proxy properties, the base
+``PreferenceProxy`` accessors, the schema validators and the Django field
+descriptor in place, and ``disable()`` swaps the originals back, so the hot
+paths carry no extra check while disabled.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+from weakref import WeakSet
+
+from django.core.exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from .pref import Pref
+    from .proxy import PreferenceProxy
+    from .schema import PreferenceSchema
+
+
+class Recorder:
+    """Receives instrumentation events. Subclass and override the events you need.
+
+    Read sources are ``"local"`` (stored on the proxy itself), ``"parent"``
+    (inherited from an ``inherits_from`` level) and ``"default"``.
+    """
+
+    def read(self, schema: type[PreferenceSchema], key: str, source: str) -> None:
+        """A preference was read through a proxy."""
+
+    def write(self, schema: type[PreferenceSchema], key: str) -> None:
+        """A preference was set or reset through a proxy."""
+
+    def validate(self, schema: type[PreferenceSchema], key: str, valid: bool) -> None:
+        """A value was coerced and validated for a preference."""
+
+    def descriptor(self, label: str, hit: bool) -> None:
+        """A model's preference attribute was read; ``hit`` if its cached proxy was reused."""
+
+    def parent_resolution(self, label: str, seconds: float) -> None:
+        """The ``inherits_from`` parents of a ``"app_label.Model.field"`` were resolved."""
+
+
+class InMemoryRecorder(Recorder):
+    """Aggregates events into counters and timings, keyed by schema name and field label."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every counter and timing."""
+        self.reads: defaultdict[tuple[type, str], Counter[str]] = defaultdict(Counter)
+        self.writes: Counter[tuple[type, str]] = Counter()
+        self.validations: defaultdict[tuple[type, str], Counter[str]] = defaultdict(Counter)
+        self.descriptors: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        # label -> [count, total seconds, max seconds]
+        self.parent_resolutions: dict[str, list[float]] = {}
+
+    def read(self, schema: type[PreferenceSchema], key: str, source: str) -> None:
+        with self._lock:
+            self.reads[schema, key][source] += 1
+
+    def write(self, schema: type[PreferenceSchema], key: str) -> None:
+        with self._lock:
+            self.writes[schema, key] += 1
+
+    def validate(self, schema: type[PreferenceSchema], key: str, valid: bool) -> None:
+        with self._lock:
+            self.validations[schema, key]["valid" if valid else "invalid"] += 1
+
+    def descriptor(self, label: str, hit: bool) -> None:
+        with self._lock:
+            self.descriptors[label]["hits" if hit else "misses"] += 1
+
+    def parent_resolution(self, label: str, seconds: float) -> None:
+        with self._lock:
+            timing = self.parent_resolutions.setdefault(label, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def unread_keys(self, schema: type[PreferenceSchema]) -> list[str]:
+        """Preferences of ``schema`` that have not been read since the last reset."""
+        return [key for key in schema._preferences if (schema, key) not in self.reads]
+
+    def report(self) -> dict[str, Any]:
+        """Return the aggregates as JSON-serializable dicts, grouped by schema name.
+
+            {"reads": {"BusinessPreferences": {"receipt_footer": {"parent": 12}}},
+             "writes": {...}, "validations": {...},
+             "descriptors": {"shop.Location.preferences": {"hits": 40, "misses": 10}},
+             "parent_resolution": {"shop.Location.preferences":
+                                   {"count": 10, "total_s": 0.004, "max_s": 0.001}}}
+        """
+        with self._lock:
+            return {
+                "reads": _by_schema({k: dict(v) for k, v in self.reads.items()}),
+                "writes": _by_schema(dict(self.writes)),
+                "validations": _by_schema({k: dict(v) for k, v in self.validations.items()}),
+                "descriptors": {label: dict(c) for label, c in self.descriptors.items()},
+                "parent_resolution": {
+                    label: {"count": int(count), "total_s": total, "max_s": longest}
+                    for label, (count, total, longest) in self.parent_resolutions.items()
+                },
+            }
+
+
+def _by_schema(counts: dict[tuple[type, str], Any]) -> dict[str, dict[str, Any]]:
+    grouped: dict[str, dict[str, Any]] = {}
+    for (schema, key), value in sorted(counts.items(), key=lambda item: item[0][1]):
+        grouped.setdefault(schema.__name__, {})[key] = value
+    return grouped
+
+
+_recorder: Recorder | None = None
+_hooks: list[Callable[[Recorder | None], None]] = []
+_schemas: WeakSet[type[PreferenceSchema]] = WeakSet()
+
+
+def enable(recorder: Recorder | None = None) -> Recorder:
+    """Start sending events to ``recorder`` (a new InMemoryRecorder by default)."""
+    global _recorder
+    if recorder is None:
+        recorder = InMemoryRecorder()
+    _recorder = recorder
+    for hook in _hooks:
+        hook(recorder)
+    return recorder
+
+
+def disable() -> None:
+    """Stop recording and restore the uninstrumented code paths."""
+    global _recorder
+    _recorder = None
+    for hook in _hooks:
+        hook(None)
+
+
+def get_recorder() -> Recorder | None:
+    """Return the active recorder, or None while instrumentation is disabled."""
+    return _recorder
+
+
+@contextmanager
+def recording(recorder: Recorder | None = None) -> Iterator[Recorder]:
+    """Record events inside the block, then restore the previous recorder (if any)."""
+    previous = _recorder
+    try:
+        yield enable(recorder)
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+
+
+def add_hook(hook: Callable[[Recorder | None], None]) -> None:
+    """Register a callable swapping instrumented code in (recorder) or out (None)."""
+    _hooks.append(hook)
+    if _recorder is not None:
+        hook(_recorder)
+
+
+def register_schema(schema: type[PreferenceSchema]) -> None:
+    """Track a schema so its proxy class and validators follow enable()/disable()."""
+    _schemas.add(schema)
+    if _recorder is not None:
+        _instrument_schema(schema, _recorder)
+
+
+# --- Proxies and validators ----------------------------------------------------
+
+
+def _instrument_schema(schema: type[PreferenceSchema], recorder: Recorder | None) -> None:
+    from .proxy import _make_property
+
+    proxy_class = schema._proxy_class
+    for key, pref in schema._preferences.items():
+        if key in proxy_class.__dict__:
+            if recorder is None:
+                prop = _make_property(key, pref)
+            else:
+                prop = _make_recorded_property(schema, key, pref, recorder)
+            setattr(proxy_class, key, prop)
+        validator = getattr(pref.validator, "_recorded_original", pref.validator)
+        if recorder is not None:
+            validator = _recorded_validator(schema, key, validator, recorder)
+        pref.validator = validator
+        schema._validators[key] = validator
+
+
+def _make_recorded_property(
+    schema: type[PreferenceSchema], key: str, pref: Pref, recorder: Recorder
+) -> property:
+    default = pref.default
+    record = recorder.read
+
+    def fget(self: PreferenceProxy) -> Any:
+        data = self._data
+        if key in data:
+            record(schema, key, "local")
+            return data[key]
+        view = self._view
+        if view is None:
+            if self._parent is None:
+                record(schema, key, "default")
+                return default
+            view = self._resolved()
+        record(schema, key, _inherited_source(self._parent, key))
+        return view[key]
+
+    return property(fget, doc=pref.label or None)
+
+
+def _recorded_validator(
+    schema: type[PreferenceSchema], key: str, original: Callable[[Any], Any], recorder: Recorder
+) -> Callable[[Any], Any]:
+    def validator(value: Any) -> Any:
+        try:
+            result = original(value)
+        except ValidationError:
+            recorder.validate(schema, key, False)
+            raise
+        recorder.validate(schema, key, True)
+        return result
+
+    validator._recorded_original = original  # type: ignore[attr-defined]
+    return validator
+
+
+def _inherited_source(parent: PreferenceProxy | None, key: str) -> str:
+    while parent is not None:
+        if key in parent._data:
+            return "parent"
+        parent = parent._parent
+    return "default"
+
+
+def _instrument_proxies(recorder: Recorder | None) -> None:
+    from .proxy import PreferenceProxy
+
+    originals = _base_accessors(PreferenceProxy)
+    if recorder is None:
+        for name, method in originals.items():
+            setattr(PreferenceProxy, name, method)
+    else:
+        for name, method in _recorded_accessors(originals, recorder).items():
+            setattr(PreferenceProxy, name, method)
+    for schema in list(_schemas):
+        _instrument_schema(schema, recorder)
+
+
+_originals: dict[str, Callable[..., Any]] = {}
+
+
+def _base_accessors(cls: type[PreferenceProxy]) -> dict[str, Callable[..., Any]]:
+    if not _originals:
+        for name in ("__getattr__", "__setattr__", "reset"):
+            _originals[name] = cls.__dict__[name]
+    return _originals
+
+
+def _recorded_accessors(
+    originals: dict[str, Callable[..., Any]], recorder: Recorder
+) -> dict[str, Callable[..., Any]]:
+    getattr_, setattr_, reset = (
+        originals["__getattr__"],
+        originals["__setattr__"],
+        originals["reset"],
+    )
+
+    def __getattr__(self: PreferenceProxy, key: str) -> Any:
+        value = getattr_(self, key)
+        data = self._data
+        source = "local" if key in data else _inherited_source(self._parent, key)
+        recorder.read(self._schema, key, source)
+        return value
+
+    def __setattr__(self: PreferenceProxy, key: str, value: Any) -> None:
+        setattr_(self, key, value)
+        recorder.write(self._schema, key)
+
+    def reset_(self: PreferenceProxy, key: str) -> None:
+        reset(self, key)
+        recorder.write(self._schema, key)
+
+    reset_.__name__ = "reset"
+    reset_.__doc__ = reset.__doc__
+    return {"__getattr__": __getattr__, "__setattr__": __setattr__, "reset": reset_}
+
+
+add_hook(_instrument_proxies)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 from typing import Any
+from weakref import WeakKeyDictionary
 
+from .codec import get_codec
 from .pref import Pref
 from .schema import PreferenceGroup, PreferenceSchema
 
@@ -30,9 +33,17 @@ def pref_to_dict(pref: Pref) -> dict[str, Any]:
     return result
 
 
+# Per-schema introspection results: the group dicts, and their JSON text and hash
+# once asked for.
+_cache: WeakKeyDictionary[type[PreferenceSchema], dict[str, Any]] = WeakKeyDictionary()
+
+
 def schema_to_dict(schema: type[PreferenceSchema]) -> list[dict[str, Any]]:
     """Convert a PreferenceSchema to a list of group dicts for introspection.
 
+    The result is computed once per schema class; each call returns a fresh
+    copy, so callers may mutate it.
+
     Returns:
         [
             {
@@ -46,6 +57,51 @@ def schema_to_dict(schema: type[PreferenceSchema]) -> list[dict[str, Any]]:
             ...
         ]
     """
+    return _copy(_introspect(schema)["groups"])
+
+
+def schema_to_json(schema: type[PreferenceSchema]) -> str:
+    """Return ``schema_to_dict(schema)`` encoded as JSON, computed once per schema."""
+    cached = _introspect(schema)
+    if "json" not in cached:
+        cached["json"] = get_codec().dumps(cached["groups"])
+    return cached["json"]
+
+
+def schema_fingerprint(schema: type[PreferenceSchema]) -> str:
+    """Return a SHA-256 hex digest of the introspected schema.
+
+    It changes whenever a key, label, default, constraint or grouping does,
+    which makes it usable as an HTTP ETag for the schema endpoint.
+    """
+    cached = _introspect(schema)
+    if "fingerprint" not in cached:
+        cached["fingerprint"] = hashlib.sha256(schema_to_json(schema).encode()).hexdigest()
+    return cached["fingerprint"]
+
+
+def clear_schema_cache() -> None:
+    """Drop memoized introspection results (for tests that redefine schemas)."""
+    _cache.clear()
+
+
+def _introspect(schema: type[PreferenceSchema]) -> dict[str, Any]:
+    cached = _cache.get(schema)
+    if cached is None:
+        cached = {"groups": _build_groups(schema)}
+        _cache[schema] = cached
+    return cached
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+def _build_groups(schema: type[PreferenceSchema]) -> list[dict[str, Any]]:
     groups: list[dict[str, Any]] = []
     for group_key, group_cls in schema._groups:
         groups.append(
@@ -58,9 +114,14 @@ def schema_to_dict(schema: type[PreferenceSchema]) -> list[dict[str, Any]]:
     return groups
 
 
-# Attach to_schema() as a classmethod on PreferenceSchema
+# Attach to_schema() and schema_fingerprint() as classmethods on PreferenceSchema
 def _to_schema(cls) -> list[dict[str, Any]]:
     return schema_to_dict(cls)
 
 
+def _schema_fingerprint(cls) -> str:
+    return schema_fingerprint(cls)
+
+
 PreferenceSchema.to_schema = classmethod(_to_schema)  # type: ignore[attr-defined]
+PreferenceSchema.schema_fingerprint = classmethod(_schema_fingerprint)  # type: ignore[attr-defined]
@@ -0,0 +1,122 @@
+"""Key migrations — declarative renames, drops and re-coercions of stored preference keys."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from .schema import PreferenceSchema
+
+_MISSING = object()
+
+
+class KeyMigration:
+    """Base class for a change applied to stored preference data.
+
+    Declared in order on the schema:
+
+        class BusinessPreferences(PreferenceSchema):
+            key_migrations = [
+                RenameKey("footer", "receipt_footer"),
+                DropKey("legacy_flag"),
+                RecoerceKey("max_prepay_amount"),
+            ]
+    """
+
+    def check(self, schema: type[PreferenceSchema]) -> None:
+        """Raise ValueError if the migration does not fit the schema's preferences."""
+
+    def apply(self, schema: type[PreferenceSchema], data: dict[str, Any]) -> bool:
+        """Update ``data`` in place; return True if it changed."""
+        raise NotImplementedError
+
+
+class RenameKey(KeyMigration):
+    """Move a stored value to a new key. A value already stored under the new key wins."""
+
+    def __init__(self, old: str, new: str) -> None:
+        self.old = old
+        self.new = new
+
+    def check(self, schema: type[PreferenceSchema]) -> None:
+        name = schema.__name__
+        if self.new not in schema._preferences:
+            raise ValueError(f"RenameKey target '{self.new}' is not a preference of {name}.")
+        if self.old in schema._preferences:
+            raise ValueError(f"RenameKey source '{self.old}' is still a preference of {name}.")
+
+    def apply(self, schema: type[PreferenceSchema], data: dict[str, Any]) -> bool:
+        if self.old not in data:
+            return False
+        value = data.pop(self.old)
+        data.setdefault(self.new, value)
+        return True
+
+    def __repr__(self) -> str:
+        return f"RenameKey({self.old!r}, {self.new!r})"
+
+
+class DropKey(KeyMigration):
+    """Remove a key that is no longer part of the schema."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def check(self, schema: type[PreferenceSchema]) -> None:
+        if self.key in schema._preferences:
+            raise ValueError(f"DropKey '{self.key}' is still a preference of {schema.__name__}.")
+
+    def apply(self, schema: type[PreferenceSchema], data: dict[str, Any]) -> bool:
+        return data.pop(self.key, _MISSING) is not _MISSING
+
+    def __repr__(self) -> str:
+        return f"DropKey({self.key!r})"
+
+
+class RecoerceKey(KeyMigration):
+    """Coerce a stored value to the preference's current type and constraints.
+
+    Values that no longer validate are dropped, so the key falls back to
+    its parent or default, unless ``on_error="raise"``.
+    """
+
+    def __init__(self, key: str, on_error: str = "drop") -> None:
+        if on_error not in ("drop", "raise"):
+            raise ValueError(f"on_error must be 'drop' or 'raise', not {on_error!r}.")
+        self.key = key
+        self.on_error = on_error
+
+    def check(self, schema: type[PreferenceSchema]) -> None:
+        if self.key not in schema._preferences:
+            raise ValueError(
+                f"RecoerceKey '{self.key}' is not a preference of {schema.__name__}."
+            )
+
+    def apply(self, schema: type[PreferenceSchema], data: dict[str, Any]) -> bool:
+        if self.key not in data:
+            return False
+        value = data[self.key]
+        try:
+            coerced = schema._validators[self.key](value)
+        except ValidationError:
+            if self.on_error == "raise":
+                raise
+            del data[self.key]
+            return True
+        if type(coerced) is type(value) and coerced == value:
+            return False
+        data[self.key] = coerced
+        return True
+
+    def __repr__(self) -> str:
+        return f"RecoerceKey({self.key!r})"
+
+
+def migrate_data(schema: type[PreferenceSchema], data: dict[str, Any]) -> bool:
+    """Apply the schema's key migrations to ``data`` in place; return True if it changed."""
+    changed = False
+    for migration in schema._key_migrations:
+        changed = migration.apply(schema, data) or changed
+    return changed
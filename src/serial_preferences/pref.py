@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
 
 @dataclass
@@ -23,6 +23,10 @@ class Pref:
     key: str = field(default="", repr=False, init=False)
     pref_type: type = field(default=type(None), repr=False, init=False)
     group_key: str = field(default="", repr=False, init=False)
+    # Compiled coerce/validate closure, built by the schema metaclass
+    validator: Callable[[Any], Any] | None = field(
+        default=None, repr=False, init=False, compare=False
+    )
 
     def resolve_type(self, annotation: type) -> None:
         """Resolve the preference type from the class annotation."""
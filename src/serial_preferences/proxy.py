@@ -2,28 +2,69 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any
+from weakref import WeakSet
 
 from .pref import Pref
-from .schema import PreferenceSchema
-from .validators import coerce_and_validate
+
+if TYPE_CHECKING:
+    from .schema import PreferenceSchema
 
 
 class PreferenceProxy:
     """Wraps a raw dict and provides typed attribute access using the schema.
 
     Lookup order: local dict → parent proxy → schema default.
+
+    Values a child inherits are read from a merged view (local data over the
+    parent's resolved view over the defaults), built lazily. ``set``/``reset``
+    drop the views of the proxy and of every proxy inheriting from it, which
+    each parent tracks in a WeakSet, so reads stay O(1) regardless of chain depth.
+
+    Instantiating ``PreferenceProxy`` returns an instance of the schema's
+    generated subclass (see ``build_proxy_class``), which exposes each
+    preference as a property instead of going through ``__getattr__``.
     """
 
+    __slots__ = (
+        "_schema",
+        "_data",
+        "_parent",
+        "_dirty",
+        "_view",
+        "_children",
+        "_label",
+        "__weakref__",
+    )
+
+    def __new__(
+        cls,
+        schema: type[PreferenceSchema],
+        data: dict[str, Any],
+        parent: PreferenceProxy | None = None,
+        label: str | None = None,
+    ) -> PreferenceProxy:
+        if cls is PreferenceProxy:
+            cls = schema._proxy_class
+        return object.__new__(cls)
+
     def __init__(
         self,
         schema: type[PreferenceSchema],
         data: dict[str, Any],
         parent: PreferenceProxy | None = None,
+        label: str | None = None,
     ) -> None:
         object.__setattr__(self, "_schema", schema)
         object.__setattr__(self, "_data", data)
         object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_dirty", set())
+        object.__setattr__(self, "_view", None)
+        object.__setattr__(self, "_children", None)
+        object.__setattr__(self, "_label", label)
+        if parent is not None:
+            parent._adopt(self)
 
     def __getattr__(self, key: str) -> Any:
         pref = self._get_pref(key)
@@ -34,15 +75,19 @@ class PreferenceProxy:
 
         # Parent fallback
         if self._parent is not None:
-            return getattr(self._parent, key)
+            view = self._view
+            if view is None:
+                view = self._resolved()
+            return view[key]
 
         # Schema default
         return pref.default
 
     def __setattr__(self, key: str, value: Any) -> None:
         pref = self._get_pref(key)
-        coerced = coerce_and_validate(value, pref)
-        self._data[key] = coerced
+        self._data[key] = pref.validator(value)
+        self._dirty.add(key)
+        self._invalidate()
 
     def set(self, key: str, value: Any) -> None:
         """Explicitly set a preference value."""
@@ -52,22 +97,89 @@ class PreferenceProxy:
         """Remove local override so the value is inherited from parent or default."""
         self._get_pref(key)  # validate key exists
         self._data.pop(key, None)
+        self._dirty.add(key)
+        self._invalidate()
 
     def is_inherited(self, key: str) -> bool:
         """True if the key is not set locally (value comes from parent or default)."""
         self._get_pref(key)  # validate key exists
         return key not in self._data
 
+    def value_source(self, key: str) -> str | None:
+        """Name the level that supplies the value of ``key``, or None for the default.
+
+        Levels are named by their ``label`` (PreferenceField uses
+        ``"app_label.Model.field"``), falling back to the schema name.
+        """
+        self._get_pref(key)  # validate key exists
+        node: PreferenceProxy | None = self
+        while node is not None:
+            if key in node._data:
+                return node._label or node._schema.__name__
+            node = node._parent
+        return None
+
+    def changes(self) -> tuple[dict[str, Any], list[str]]:
+        """Return ``(set_values, reset_keys)`` for keys changed through set/reset."""
+        data = self._data
+        set_values = {key: data[key] for key in sorted(self._dirty) if key in data}
+        reset_keys = [key for key in sorted(self._dirty) if key not in data]
+        return set_values, reset_keys
+
+    def mark_clean(self) -> None:
+        """Forget tracked changes, e.g. after they have been written."""
+        self._dirty.clear()
+
     def to_dict(self) -> dict[str, Any]:
         """Return only explicitly set (local) values."""
         return dict(self._data)
 
     def to_full_dict(self) -> dict[str, Any]:
         """Return all values including defaults and inherited."""
-        result: dict[str, Any] = {}
-        for key in self._schema._preferences:
-            result[key] = getattr(self, key)
-        return result
+        return dict(self._resolved())
+
+    def freeze(self) -> FrozenPreferences:
+        """Return an immutable, hashable snapshot of the effective values.
+
+        The snapshot keeps no reference to this proxy, its parents or any
+        model instance, so it can be shared between threads, cached
+        module-wide or pickled to another process.
+        """
+        view = self._resolved()
+        data = self._data
+        inherited = 0
+        values = []
+        for i, key in enumerate(self._schema._key_index):
+            if key not in data:
+                inherited |= 1 << i
+            values.append(_frozen_value(view[key]))
+        return FrozenPreferences(self._schema, tuple(values), inherited)
+
+    def _resolved(self) -> dict[str, Any]:
+        """Return the merged view of effective values, building it if needed."""
+        view = self._view
+        if view is None:
+            view = dict(self._schema._defaults)
+            if self._parent is not None:
+                view.update(self._parent._resolved())
+            prefs = self._schema._preferences
+            for key, value in self._data.items():
+                if key in prefs:
+                    view[key] = value
+            object.__setattr__(self, "_view", view)
+        return view
+
+    def _adopt(self, child: PreferenceProxy) -> None:
+        """Register a proxy inheriting from this one, for view invalidation."""
+        if self._children is None:
+            object.__setattr__(self, "_children", WeakSet())
+        self._children.add(child)
+
+    def _invalidate(self) -> None:
+        object.__setattr__(self, "_view", None)
+        if self._children:
+            for child in self._children:
+                child._invalidate()
 
     def _get_pref(self, key: str) -> Pref:
         prefs = object.__getattribute__(self, "_schema")._preferences
@@ -77,6 +189,162 @@ class PreferenceProxy:
             )
         return prefs[key]
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Generated subclasses are not importable; rebuild through the base class.
+        return (PreferenceProxy, (self._schema, self._data, self._parent, self._label))
+
     def __repr__(self) -> str:
         schema_name = self._schema.__name__
         return f"<PreferenceProxy({schema_name}) {self._data}>"
+
+
+class FrozenPreferences:
+    """Read-only snapshot of a proxy's effective values, made by ``proxy.freeze()``.
+
+    Values are stored in a tuple in schema order (lists become tuples and
+    dicts read-only, hashable mappings)
+    and read through the schema's precomputed key positions; which keys were
+    inherited is kept as a bitmask. Snapshots compare equal and hash alike
+    when their schema, values and inherited flags match.
+
+        frozen = location.preferences.freeze()
+        frozen.receipt_footer            # or frozen["receipt_footer"]
+        frozen.is_inherited("receipt_footer")
+    """
+
+    __slots__ = ("_schema", "_values", "_inherited")
+
+    def __init__(
+        self, schema: type[PreferenceSchema], values: tuple[Any, ...], inherited: int = 0
+    ) -> None:
+        object.__setattr__(self, "_schema", schema)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_inherited", inherited)
+
+    def __getattr__(self, key: str) -> Any:
+        return self._values[self._index(key)]
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index(key)]
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def is_inherited(self, key: str) -> bool:
+        """True if the key was not set locally on the frozen proxy."""
+        return bool(self._inherited >> self._index(key) & 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return every effective value, keyed in schema order."""
+        return dict(zip(self._schema._key_index, self._values))
+
+    def _index(self, key: str) -> int:
+        try:
+            return object.__getattribute__(self, "_schema")._key_index[key]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' has no preference '{key}'.") from None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenPreferences):
+            return NotImplemented
+        return (self._schema, self._values, self._inherited) == (
+            other._schema,
+            other._values,
+            other._inherited,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._schema, self._values, self._inherited))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenPreferences, (self._schema, self._values, self._inherited))
+
+    def __repr__(self) -> str:
+        return f"<FrozenPreferences({self._schema.__name__}) {self.to_dict()}>"
+
+
+class FrozenMapping(Mapping):
+    """Read-only, hashable mapping holding a frozen dict value of FrozenPreferences."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Mapping[str, Any]) -> None:
+        self._items = {key: _frozen_value(value) for key, value in items.items()}
+
+    def __getitem__(self, key: str) -> Any:
+        return self._items[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._items.items()))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenMapping, (self._items,))
+
+    def __repr__(self) -> str:
+        return f"FrozenMapping({self._items!r})"
+
+
+def _frozen_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen_value(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenMapping(value)
+    return value
+
+
+def chain_levels(levels: list[PreferenceProxy | None]) -> PreferenceProxy | None:
+    """Chain ``inherits_from`` levels, nearest first, into a single parent proxy."""
+    if not levels:
+        return None
+    *levels, parent = levels
+    # Earlier levels contribute only their own values; they are chained in
+    # front of the last level through views sharing their data, which the
+    # original proxies keep invalidated.
+    for level in reversed(levels):
+        if level is None:
+            continue
+        view = PreferenceProxy(level._schema, level._data, parent=parent, label=level._label)
+        level._adopt(view)
+        parent = view
+    return parent
+
+
+def build_proxy_class(schema: type[PreferenceSchema]) -> type[PreferenceProxy]:
+    """Generate a slotted PreferenceProxy subclass with one property per preference.
+
+    Each property inlines the local → parent → default lookup. Schemas reject
+    keys that would shadow a PreferenceProxy attribute (``set``, ``to_dict``, ...).
+    """
+    namespace: dict[str, Any] = {"__slots__": (), "__module__": __name__}
+    for key, pref in schema._preferences.items():
+        namespace[key] = _make_property(key, pref)
+    name = f"{schema.__name__}Proxy"
+    cls = type(name, (PreferenceProxy,), namespace)
+    cls.__qualname__ = f"{schema.__qualname__}Proxy"
+    return cls
+
+
+def _make_property(key: str, pref: Pref) -> property:
+    default = pref.default
+
+    def fget(self: PreferenceProxy) -> Any:
+        data = self._data
+        if key in data:
+            return data[key]
+        view = self._view
+        if view is None:
+            if self._parent is None:
+                return default
+            view = self._resolved()
+        return view[key]
+
+    return property(fget, doc=pref.label or None)
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
+from .instrumentation import register_schema
 from .pref import Pref
+from .validators import compile_validator
+
+if TYPE_CHECKING:
+    from .key_migrations import KeyMigration
+    from .proxy import PreferenceProxy
 
 
 class PreferenceGroup:
@@ -64,11 +70,30 @@ class PreferenceSchemaMeta(type):
                 value._key = group_key
                 for pref in value._prefs:
                     pref.group_key = group_key
+                    if pref.validator is None:
+                        pref.validator = compile_validator(pref)
                     preferences[pref.key] = pref
                 groups.append((group_key, value))
 
         cls._groups = groups
         cls._preferences = preferences
+        cls._validators = {key: pref.validator for key, pref in preferences.items()}
+        cls._defaults = {key: pref.default for key, pref in preferences.items()}
+        cls._key_index = {key: i for i, key in enumerate(preferences)}
+        cls._key_migrations = tuple(getattr(cls, "key_migrations", ()))
+        for migration in cls._key_migrations:
+            migration.check(cls)
+
+        from .proxy import PreferenceProxy, build_proxy_class
+
+        for key in preferences:
+            if hasattr(PreferenceProxy, key):
+                raise ValueError(
+                    f"Preference '{key}' of {name} collides with PreferenceProxy.{key}; "
+                    "rename the preference."
+                )
+        cls._proxy_class = build_proxy_class(cls)
+        register_schema(cls)
         return cls
 
 
@@ -89,7 +114,15 @@ class PreferenceSchema(metaclass=PreferenceSchemaMeta):
         class BusinessPreferences(PreferenceSchema):
             class General(PreferenceGroup, label="General"):
                 store_name: bool = Pref(default=True, label="Store name")
+
+    ``key_migrations`` lists changes to apply to stored data after renaming,
+    removing or retyping preferences; see ``serial_preferences.key_migrations``.
     """
 
     _groups: list[tuple[str, type[PreferenceGroup]]]
     _preferences: dict[str, Pref]
+    _validators: dict[str, Callable[[Any], Any]]
+    _defaults: dict[str, Any]
+    _key_index: dict[str, int]
+    _key_migrations: tuple[KeyMigration, ...]
+    _proxy_class: type[PreferenceProxy]
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 from django.core.exceptions import ValidationError
 
 from .pref import Pref
 
+_TRUE_STRINGS = frozenset(("true", "1", "yes"))
+_FALSE_STRINGS = frozenset(("false", "0", "no"))
+
 
 def coerce_value(value: Any, pref: Pref) -> Any:
     """Coerce a value to the expected type for the given preference."""
@@ -89,6 +92,155 @@ def validate_value(value: Any, pref: Pref) -> None:
 
 def coerce_and_validate(value: Any, pref: Pref) -> Any:
     """Coerce then validate a value. Returns the coerced value."""
+    if pref.validator is not None:
+        return pref.validator(value)
     coerced = coerce_value(value, pref)
     validate_value(coerced, pref)
     return coerced
+
+
+def compile_validator(pref: Pref) -> Callable[[Any], Any]:
+    """Build a coerce-and-validate closure specialized for a single preference.
+
+    Equivalent to ``coerce_and_validate(value, pref)`` but the type dispatch is
+    resolved once, choices are looked up in a frozenset, and only the
+    constraints the preference declares are checked.
+    """
+    key = pref.key
+    required = pref.required
+    coerce = _compile_coercer(pref)
+    checks = _compile_checks(pref)
+
+    if not checks:
+
+        def validator(value: Any) -> Any:
+            if value is None:
+                if required:
+                    raise ValidationError(f"Preference '{key}' is required.")
+                return None
+            return coerce(value)
+
+    else:
+
+        def validator(value: Any) -> Any:
+            if value is None:
+                if required:
+                    raise ValidationError(f"Preference '{key}' is required.")
+                return None
+            value = coerce(value)
+            for check in checks:
+                check(value)
+            return value
+
+    return validator
+
+
+def _compile_coercer(pref: Pref) -> Callable[[Any], Any]:
+    key = pref.key
+    target = pref.pref_type
+
+    if target is bool:
+
+        def coerce(value: Any) -> Any:
+            if isinstance(value, str):
+                lowered = value.lower()
+                if lowered in _TRUE_STRINGS:
+                    return True
+                if lowered in _FALSE_STRINGS:
+                    return False
+                raise ValidationError(f"Cannot coerce '{value}' to bool for '{key}'.")
+            return bool(value)
+
+    elif target is int or target is float:
+        name = target.__name__
+
+        def coerce(value: Any) -> Any:
+            try:
+                return target(value)
+            except (ValueError, TypeError):
+                raise ValidationError(f"Cannot coerce '{value}' to {name} for '{key}'.")
+
+    elif target is str:
+        coerce = str
+
+    elif target is list:
+
+        def coerce(value: Any) -> Any:
+            if isinstance(value, list):
+                return value
+            raise ValidationError(f"Expected list for '{key}', got {type(value).__name__}.")
+
+    else:
+
+        def coerce(value: Any) -> Any:
+            return value
+
+    return coerce
+
+
+def _compile_checks(pref: Pref) -> list[Callable[[Any], None]]:
+    key = pref.key
+    checks: list[Callable[[Any], None]] = []
+
+    if pref.ge is not None:
+        ge = pref.ge
+
+        def check_ge(value: Any) -> None:
+            if value < ge:
+                raise ValidationError(f"Value {value} for '{key}' must be >= {ge}.")
+
+        checks.append(check_ge)
+
+    if pref.le is not None:
+        le = pref.le
+
+        def check_le(value: Any) -> None:
+            if value > le:
+                raise ValidationError(f"Value {value} for '{key}' must be <= {le}.")
+
+        checks.append(check_le)
+
+    if pref.max_length is not None:
+        max_length = pref.max_length
+
+        def check_max_length(value: Any) -> None:
+            if isinstance(value, str) and len(value) > max_length:
+                raise ValidationError(
+                    f"Value for '{key}' exceeds max length of {max_length}."
+                )
+
+        checks.append(check_max_length)
+
+    if pref.choices is not None:
+        valid_keys = [c[0] for c in pref.choices]
+        valid_set = frozenset(valid_keys)
+
+        def invalid(item: Any) -> ValidationError:
+            return ValidationError(
+                f"Invalid choice '{item}' for '{key}'. Valid choices: {valid_keys}."
+            )
+
+        if pref.pref_type is list:
+
+            def check_choices(value: Any) -> None:
+                for item in value:
+                    try:
+                        ok = item in valid_set
+                    except TypeError:
+                        ok = False
+                    if not ok:
+                        raise invalid(item)
+
+        else:
+
+            def check_choices(value: Any) -> None:
+                try:
+                    ok = value in valid_set
+                except TypeError:
+                    ok = False
+                if not ok:
+                    raise invalid(value)
+
+        checks.append(check_choices)
+
+    return checks
@@ -46,3 +46,26 @@ def business_prefs():
 @pytest.fixture
 def simple_prefs():
     return SimplePreferences
+
+
+@pytest.fixture
+def dealer_sites(request, db):
+    """Sites under dealers under one franchise, in creation order.
+
+    Parametrise indirectly to change the rows, e.g.
+    ``{"franchise": {...}, "dealers": [{...}, {...}], "sites_per_dealer": 2}``
+    where each dict holds stored preferences; the defaults are shown.
+    """
+    from .models import Dealer, Franchise, Site
+
+    options = {"franchise": {}, "dealers": [{}, {}], "sites_per_dealer": 2}
+    options.update(getattr(request, "param", {}))
+    franchise = Franchise.objects.create(name="Franchise", preferences=options["franchise"])
+    sites = []
+    for i, preferences in enumerate(options["dealers"]):
+        dealer = Dealer.objects.create(
+            name=f"Dealer {i}", franchise=franchise, preferences=dict(preferences)
+        )
+        for j in range(options["sites_per_dealer"]):
+            sites.append(Site.objects.create(name=f"Site {i}-{j}", dealer=dealer))
+    return sites
@@ -2,11 +2,21 @@
 
 from django.db import models
 
-from serial_preferences.django import PreferenceField
+from serial_preferences.django import PreferenceField, PreferenceManager
 
 from .conftest import BusinessPreferences
 
 
+class Franchise(models.Model):
+    name = models.CharField(max_length=100)
+    preferences = PreferenceField(BusinessPreferences)
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
 class Business(models.Model):
     name = models.CharField(max_length=100)
     preferences = PreferenceField(BusinessPreferences)
@@ -22,3 +32,119 @@ class Location(models.Model):
 
     class Meta:
         app_label = "tests"
+
+
+class Dealer(models.Model):
+    name = models.CharField(max_length=100)
+    franchise = models.ForeignKey(Franchise, null=True, blank=True, on_delete=models.SET_NULL)
+    preferences = PreferenceField(BusinessPreferences, inherits_from="franchise.preferences")
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class Site(models.Model):
+    name = models.CharField(max_length=100)
+    dealer = models.ForeignKey(Dealer, on_delete=models.CASCADE)
+    preferences = PreferenceField(BusinessPreferences, inherits_from="dealer.preferences")
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class Region(models.Model):
+    name = models.CharField(max_length=100)
+    preferences = PreferenceField(BusinessPreferences)
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class Outlet(models.Model):
+    name = models.CharField(max_length=100)
+    region = models.ForeignKey(Region, null=True, blank=True, on_delete=models.SET_NULL)
+    dealer = models.ForeignKey(Dealer, on_delete=models.CASCADE)
+    preferences = PreferenceField(
+        BusinessPreferences, inherits_from=["region.preferences", "dealer.preferences"]
+    )
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class Brand(models.Model):
+    name = models.CharField(max_length=100)
+    preferences = PreferenceField(BusinessPreferences, cache="default")
+
+    class Meta:
+        app_label = "tests"
+
+
+class Chain(models.Model):
+    name = models.CharField(max_length=100)
+    brand = models.ForeignKey(Brand, null=True, blank=True, on_delete=models.SET_NULL)
+    preferences = PreferenceField(
+        BusinessPreferences, inherits_from="brand.preferences", cache="default"
+    )
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class Store(models.Model):
+    name = models.CharField(max_length=100)
+    chain = models.ForeignKey(Chain, on_delete=models.CASCADE)
+    preferences = PreferenceField(BusinessPreferences, inherits_from="chain.preferences")
+
+    class Meta:
+        app_label = "tests"
+
+
+class Terminal(models.Model):
+    name = models.CharField(max_length=100)
+    region = models.ForeignKey(Region, null=True, blank=True, on_delete=models.SET_NULL)
+    preferences = PreferenceField(
+        BusinessPreferences, inherits_from="region.preferences", materialize=True
+    )
+
+    class Meta:
+        app_label = "tests"
+
+
+class Register(models.Model):
+    name = models.CharField(max_length=100)
+    terminal = models.ForeignKey(Terminal, on_delete=models.CASCADE)
+    preferences = PreferenceField(
+        BusinessPreferences, inherits_from="terminal.preferences", materialize=True
+    )
+
+    class Meta:
+        app_label = "tests"
+
+
+class Account(models.Model):
+    name = models.CharField(max_length=100)
+    preferences = PreferenceField(BusinessPreferences, store="sparse")
+
+    objects = PreferenceManager()
+
+    class Meta:
+        app_label = "tests"
+
+
+class LazyBusiness(models.Model):
+    name = models.CharField(max_length=100)
+    preferences = PreferenceField(BusinessPreferences, lazy=True)
+
+    class Meta:
+        app_label = "tests"
@@ -12,6 +12,7 @@ DATABASES = {
 INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.auth",
+    "serial_preferences.django",
     "tests",
 ]
 
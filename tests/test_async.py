@@ -0,0 +1,115 @@
+"""Tests for the async preference accessors."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import SynchronousOnlyOperation
+
+
+@pytest.fixture
+def location(dealer_sites):
+    return dealer_sites[0]
+
+
+one_site = pytest.mark.parametrize(
+    "dealer_sites",
+    [
+        {
+            "franchise": {"receipt_footer": "F"},
+            "dealers": [{"max_prepay_amount": 500}],
+            "sites_per_dealer": 1,
+        }
+    ],
+    indirect=True,
+)
+
+
+@pytest.mark.django_db
+@one_site
+class TestAsyncResolve:
+    def test_sync_access_fails_in_async_context(self, location):
+        from .models import Site
+
+        async def read():
+            loc = await Site.objects.aget(pk=location.pk)
+            return loc.preferences.receipt_footer
+
+        with pytest.raises(SynchronousOnlyOperation):
+            async_to_sync(read)()
+
+    def test_apreferences_loads_parents(self, location, django_assert_num_queries):
+        from .models import Site
+
+        async def read():
+            loc = await Site.objects.aget(pk=location.pk)
+            prefs = await loc.apreferences()
+            assert loc.preferences is prefs
+            return prefs.receipt_footer, prefs.max_prepay_amount, loc.dealer.franchise.name
+
+        # The row, then the dealer with its franchise in one query.
+        with django_assert_num_queries(2):
+            assert async_to_sync(read)() == ("F", 500, "Franchise")
+
+    def test_keeps_cached_parents(self, location, django_assert_num_queries):
+        from .models import Site
+
+        loc = Site.objects.select_related("dealer__franchise").get(pk=location.pk)
+        with django_assert_num_queries(0):
+            prefs = async_to_sync(loc.apreferences)()
+        assert prefs.receipt_footer == "F"
+
+    def test_follows_partially_cached_chain(self, location, django_assert_num_queries):
+        from .models import Site
+
+        loc = Site.objects.select_related("dealer").get(pk=location.pk)
+        with django_assert_num_queries(1):
+            prefs = async_to_sync(loc.apreferences)()
+        assert prefs.receipt_footer == "F"
+
+    def test_multiple_levels_and_null_parent(self, location):
+        from .models import Outlet
+
+        outlet = Outlet.objects.create(name="O", dealer=location.dealer)
+        outlet = Outlet.objects.get(pk=outlet.pk)
+        prefs = async_to_sync(outlet.apreferences)()
+        assert prefs.max_prepay_amount == 500
+        assert outlet.region is None
+
+    def test_field_aresolve(self, location):
+        from .models import Site
+
+        loc = Site.objects.get(pk=location.pk)
+        prefs = async_to_sync(Site.preferences.aresolve)(loc)
+        assert prefs.value_source("receipt_footer") == "tests.Franchise.preferences"
+
+
+@pytest.mark.django_db
+class TestAsyncSave:
+    @one_site
+    def test_asave_preferences(self, location):
+        from .models import Site
+
+        async def update():
+            loc = await Site.objects.aget(pk=location.pk)
+            prefs = await loc.apreferences()
+            prefs.prepay_enabled = False
+            await loc.asave_preferences()
+            return prefs.changes()
+
+        assert async_to_sync(update)() == ({}, [])
+        location.refresh_from_db()
+        assert location.preferences.to_dict() == {"prepay_enabled": False}
+
+    def test_asave_propagates_to_materialized(self, db):
+        from .models import Region, Terminal
+
+        region = Region.objects.create(name="West")
+        terminal = Terminal.objects.create(name="T", region=region)
+
+        async def update():
+            region.preferences.max_prepay_amount = 9000
+            await region.asave_preferences()
+
+        async_to_sync(update)()
+        terminal.refresh_from_db()
+        inherited = terminal.preferences_inherited["levels"]["tests.Region.preferences"]
+        assert inherited["max_prepay_amount"] == 9000
@@ -0,0 +1,125 @@
+"""Tests for the cross-request parent preference cache."""
+
+import pytest
+from django.core.cache import caches
+
+from serial_preferences.django.cache import cache_key
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
+
+
+@pytest.fixture
+def store(db):
+    from .models import Brand, Chain, Store
+
+    brand = Brand.objects.create(name="Brand")
+    brand.preferences.receipt_footer = "Brand footer"
+    brand.save()
+    chain = Chain.objects.create(name="Chain", brand=brand)
+    chain.preferences.prepay_enabled = False
+    chain.save()
+    return Store.objects.create(name="Store", chain=chain)
+
+
+def _fresh(store):
+    from .models import Store
+
+    return Store.objects.get(pk=store.pk)
+
+
+@pytest.mark.django_db
+class TestParentCache:
+    def test_miss_populates(self, store, django_assert_num_queries):
+        from .models import Chain
+
+        loaded = _fresh(store)
+        with django_assert_num_queries(2):
+            assert loaded.preferences.prepay_enabled is False
+            assert loaded.preferences.receipt_footer == "Brand footer"
+        chain_field = Chain._meta.get_field("preferences")
+        assert caches["default"].get(cache_key(chain_field, store.chain_id)) is not None
+
+    def test_hit_skips_database(self, store, django_assert_num_queries):
+        _fresh(store).preferences.prepay_enabled
+        loaded = _fresh(store)
+        with django_assert_num_queries(0):
+            assert loaded.preferences.prepay_enabled is False
+            assert loaded.preferences.receipt_footer == "Brand footer"
+            assert loaded.preferences.value_source("receipt_footer") == "tests.Brand.preferences"
+
+    def test_loaded_parent_bypasses_cache(self, store):
+        from .models import Chain
+
+        chain = Chain.objects.get(pk=store.chain_id)
+        caches["default"].set(
+            cache_key(Chain._meta.get_field("preferences"), chain.pk),
+            ({"prepay_enabled": True}, [chain.brand_id]),
+        )
+        loaded = _fresh(store)
+        loaded.chain = chain
+        assert loaded.preferences.prepay_enabled is False
+
+    def test_save_invalidates(self, store):
+        from .models import Chain
+
+        _fresh(store).preferences.prepay_enabled
+        chain = Chain.objects.get(pk=store.chain_id)
+        chain.preferences.prepay_enabled = True
+        chain.save()
+        assert _fresh(store).preferences.prepay_enabled is True
+
+    def test_save_preferences_invalidates(self, store):
+        from .models import Brand
+
+        _fresh(store).preferences.receipt_footer
+        brand = Brand.objects.get()
+        brand.preferences.receipt_footer = "New footer"
+        brand.save_preferences()
+        assert _fresh(store).preferences.receipt_footer == "New footer"
+
+    def test_update_preferences_invalidates(self, store):
+        from .models import Chain
+
+        _fresh(store).preferences.prepay_enabled
+        Chain.objects.all().update_preferences(reset=["prepay_enabled"])
+        assert _fresh(store).preferences.prepay_enabled is True
+
+    def test_invalidated_again_on_commit(self, store, django_capture_on_commit_callbacks):
+        from .models import Chain
+
+        chain_key = cache_key(Chain._meta.get_field("preferences"), store.chain_id)
+        with django_capture_on_commit_callbacks(execute=True):
+            chain = Chain.objects.get(pk=store.chain_id)
+            chain.preferences.prepay_enabled = True
+            chain.save()
+            assert caches["default"].get(chain_key) is None
+            # A reader repopulating the entry before the commit.
+            caches["default"].set(chain_key, ({"prepay_enabled": False}, [chain.brand_id]))
+        assert caches["default"].get(chain_key) is None
+        assert _fresh(store).preferences.prepay_enabled is True
+
+    def test_delete_invalidates(self, store):
+        from .models import Brand
+
+        _fresh(store).preferences.receipt_footer
+        Brand.objects.all().delete()
+        assert _fresh(store).preferences.receipt_footer == "Thank you!"
+
+    def test_key_includes_schema_fingerprint(self):
+        from .models import Brand
+
+        field = Brand._meta.get_field("preferences")
+        key = cache_key(field, 1)
+        assert key.startswith("serial_preferences:1:tests.Brand.preferences:")
+        assert field.schema.schema_fingerprint()[:16] in key
+
+    def test_deconstruct(self):
+        from .models import Brand
+
+        _, _, _, kwargs = Brand._meta.get_field("preferences").deconstruct()
+        assert kwargs["cache"] == "default"
@@ -0,0 +1,85 @@
+"""Tests for the pluggable JSON codecs."""
+
+import json
+import math
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from serial_preferences.codec import JSONCodec, _load_codec, get_codec
+
+SAMPLES = [
+    True,
+    None,
+    15000,
+    2**70,
+    0.5,
+    1e16,
+    1e-7,
+    "café \"quoted\" \\ \n  ",
+    "plain, with: separators",
+    "Café ✓",
+    ["a", "b"],
+    {"prepay_enabled": False, "ratio": 0.25, "tags": ["a", "c"], "footer": "Thank you!"},
+]
+
+
+class TestCodecs:
+    @pytest.mark.parametrize("name", ["orjson", "msgspec"])
+    def test_byte_for_byte_with_stdlib(self, name):
+        pytest.importorskip(name)
+        fast, stdlib = _load_codec(name), JSONCodec()
+        for value in SAMPLES:
+            assert fast.dumps(value) == stdlib.dumps(value)
+            assert fast.loads(stdlib.dumps(value)) == value
+
+    def test_stdlib_matches_json_dumps(self):
+        for value in SAMPLES:
+            assert JSONCodec().dumps(value) == json.dumps(value)
+        assert JSONCodec().dumps({"a": [1, "Café ✓"]}) == '{"a": [1, "Caf\\u00e9 \\u2713"]}'
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+    def test_non_finite_floats(self, name):
+        pytest.importorskip(name)
+        codec = _load_codec(name)
+        assert [codec.dumps(v) for v in (math.nan, math.inf, -math.inf)] == [
+            "NaN",
+            "Infinity",
+            "-Infinity",
+        ]
+        assert math.isnan(codec.loads("NaN"))
+
+    def test_auto_prefers_installed_fast_codec(self, settings):
+        pytest.importorskip("orjson")
+        settings.SERIAL_PREFERENCES_JSON_CODEC = "auto"
+        assert get_codec().name == "orjson"
+
+    def test_setting_selects_codec(self, settings):
+        settings.SERIAL_PREFERENCES_JSON_CODEC = "json"
+        assert get_codec().name == "json"
+
+    def test_unknown_codec(self, settings):
+        settings.SERIAL_PREFERENCES_JSON_CODEC = "yaml"
+        with pytest.raises(ImproperlyConfigured, match="Unknown"):
+            get_codec()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_field_roundtrip(self, settings, name):
+        from django.db import connection
+
+        from .models import Business
+
+        pytest.importorskip(name)
+        settings.SERIAL_PREFERENCES_JSON_CODEC = name
+        biz = Business.objects.create(name="Codec")
+        biz.preferences.receipt_footer = "Merci, à bientôt"
+        biz.preferences.max_prepay_amount = 200
+        biz.save()
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT preferences FROM tests_business WHERE id = %s", [biz.pk])
+            stored = cursor.fetchone()[0]
+        expected = {"receipt_footer": "Merci, à bientôt", "max_prepay_amount": 200}
+        assert stored == json.dumps(expected)
+        assert Business.objects.get(pk=biz.pk).preferences.receipt_footer == "Merci, à bientôt"
@@ -0,0 +1,121 @@
+"""Tests for sparse preference storage and compaction."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from serial_preferences.django import PreferenceField
+from serial_preferences.django.compaction import compact_preferences
+
+from .conftest import BusinessPreferences
+
+
+def _stored(instance):
+    return type(instance).objects.filter(pk=instance.pk).values_list("preferences", flat=True)[0]
+
+
+@pytest.mark.django_db
+class TestSparseStore:
+    def test_save_drops_defaults(self):
+        from .models import Account
+
+        account = Account(name="A")
+        account.preferences.prepay_enabled = True
+        account.preferences.max_prepay_amount = 100
+        account.save()
+        assert _stored(account) == {"max_prepay_amount": 100}
+        assert account.preferences.to_dict() == {"max_prepay_amount": 100}
+        assert account.preferences.prepay_enabled is True
+
+    def test_type_must_match(self):
+        from .models import Account
+
+        account = Account.objects.create(name="A", preferences={"max_prepay_amount": 15000.0})
+        assert _stored(account) == {"max_prepay_amount": 15000.0}
+
+    def test_save_preferences_resets_defaults(self):
+        from .models import Account
+
+        account = Account.objects.create(name="A", preferences={"max_prepay_amount": 100})
+        account.preferences.max_prepay_amount = 15000
+        account.preferences.default_grade = "mid"
+        account.save_preferences()
+        assert _stored(account) == {"default_grade": "mid"}
+
+    def test_update_preferences_resets_defaults(self):
+        from .models import Account
+
+        account = Account.objects.create(name="A", preferences={"receipt_footer": "Bye"})
+        Account.objects.update_preferences(receipt_footer="Thank you!")
+        assert _stored(account) == {}
+
+    def test_full_store_keeps_defaults(self, db):
+        from .models import Franchise
+
+        franchise = Franchise.objects.create(name="F", preferences={"prepay_enabled": True})
+        assert _stored(franchise) == {"prepay_enabled": True}
+
+    def test_invalid_store(self):
+        with pytest.raises(ValueError, match="'full' or 'sparse'"):
+            PreferenceField(BusinessPreferences, store="compact")
+
+    def test_rejects_inherits_from(self):
+        with pytest.raises(ValueError, match="cannot be used with inherits_from"):
+            PreferenceField(BusinessPreferences, "business.preferences", store="sparse")
+
+    def test_deconstruct(self):
+        from .models import Account
+
+        _, _, _, kwargs = Account._meta.get_field("preferences").deconstruct()
+        assert kwargs["store"] == "sparse"
+
+
+@pytest.fixture
+def bloated(db):
+    from .models import Franchise
+
+    full = {"prepay_enabled": True, "default_grade": "regular", "max_prepay_amount": 1}
+    for i in range(5):
+        Franchise.objects.create(name=f"F{i}", preferences=dict(full))
+    Franchise.objects.create(name="clean", preferences={"max_prepay_amount": 1})
+
+
+@pytest.mark.django_db
+class TestCompactPreferences:
+    def test_compacts_in_batches(self, bloated, django_assert_num_queries):
+        from .models import Franchise
+
+        # One streamed SELECT plus one UPDATE per batch.
+        with django_assert_num_queries(1 + 3):
+            assert compact_preferences(Franchise.objects.all(), batch_size=2) == 5
+        stored = Franchise.objects.values_list("preferences", flat=True)
+        assert all(prefs == {"max_prepay_amount": 1} for prefs in stored)
+
+    def test_rejects_inheriting_field(self, db):
+        from .models import Location
+
+        with pytest.raises(ValueError, match="inherits_from"):
+            compact_preferences(Location.objects.all())
+
+    def test_command_defaults_to_sparse_fields(self, db):
+        from .models import Account
+
+        Account.objects.create(name="A")
+        Account.objects.update(preferences={"prepay_enabled": True})
+        out = StringIO()
+        call_command("compact_preferences", stdout=out)
+        assert out.getvalue() == "tests.Account.preferences: 1 rows compacted\n"
+
+    def test_command_named_field(self, bloated):
+        out = StringIO()
+        call_command("compact_preferences", "tests.Franchise.preferences", stdout=out)
+        assert out.getvalue() == "tests.Franchise.preferences: 5 rows compacted\n"
+
+    def test_command_rejects_inheriting_field(self, db):
+        with pytest.raises(CommandError, match="inherits_from"):
+            call_command("compact_preferences", "tests.Location.preferences")
+
+    def test_command_unknown_field(self, db):
+        with pytest.raises(CommandError, match="Unknown field"):
+            call_command("compact_preferences", "tests.Nope.preferences")
@@ -110,3 +110,150 @@ class TestPreferenceFieldInheritance:
 
         location.preferences.reset("max_prepay_amount")
         assert location.preferences.max_prepay_amount == 500
+
+
+@pytest.mark.django_db
+class TestSavePreferences:
+    def test_writes_changed_keys(self, business):
+        from .models import Business
+
+        business.preferences.max_prepay_amount = 500
+        business.save_preferences()
+
+        reloaded = Business.objects.get(pk=business.pk)
+        assert reloaded.preferences.to_dict() == {"max_prepay_amount": 500}
+
+    def test_does_not_clobber_concurrent_writes(self, business):
+        from .models import Business
+
+        first = Business.objects.get(pk=business.pk)
+        second = Business.objects.get(pk=business.pk)
+        first.preferences.prepay_enabled = False
+        second.preferences.receipt_footer = "Bye"
+        first.save_preferences()
+        second.save_preferences()
+
+        reloaded = Business.objects.get(pk=business.pk)
+        assert reloaded.preferences.to_dict() == {
+            "prepay_enabled": False,
+            "receipt_footer": "Bye",
+        }
+
+    def test_save_clears_tracked_changes(self):
+        from .models import Franchise
+
+        franchise = Franchise.objects.create(name="F")
+        franchise.preferences.max_prepay_amount = 100
+        franchise.save()
+        Franchise.objects.update_preferences(max_prepay_amount=999)
+        franchise.preferences.receipt_footer = "Bye"
+        franchise.save_preferences()
+
+        reloaded = Franchise.objects.get(pk=franchise.pk)
+        assert reloaded.preferences.to_dict() == {
+            "max_prepay_amount": 999,
+            "receipt_footer": "Bye",
+        }
+
+    def test_reset_removes_key(self, business):
+        from .models import Business
+
+        business.preferences = {"prepay_enabled": False, "receipt_footer": "Bye"}
+        business.save()
+        business.preferences.reset("prepay_enabled")
+        business.save_preferences()
+
+        reloaded = Business.objects.get(pk=business.pk)
+        assert reloaded.preferences.to_dict() == {"receipt_footer": "Bye"}
+
+    def test_only_updates_preferences_column(self, business, django_assert_num_queries):
+        business.name = "Unsaved rename"
+        business.preferences.prepay_enabled = False
+        with django_assert_num_queries(1) as ctx:
+            business.save_preferences()
+        sql = ctx.captured_queries[0]["sql"]
+        assert "JSON_SET" in sql
+        assert '"name"' not in sql
+
+    def test_nothing_changed_no_query(self, business, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            business.save_preferences()
+        business.preferences.prepay_enabled = False
+        business.save_preferences()
+        with django_assert_num_queries(0):
+            business.save_preferences()
+
+    def test_unsaved_instance_raises(self, db):
+        from .models import Business
+
+        with pytest.raises(ValueError, match="must be saved"):
+            Business(name="x").save_preferences()
+
+
+@pytest.mark.django_db
+class TestLazyPreferenceField:
+    @pytest.fixture
+    def lazy_business(self, db):
+        from django.db import connection
+
+        from .models import LazyBusiness
+
+        biz = LazyBusiness.objects.create(name="Lazy")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE tests_lazybusiness SET preferences = %s WHERE id = %s",
+                ['{ "prepay_enabled" : false }', biz.pk],
+            )
+        return biz
+
+    def _stored(self, pk):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT preferences FROM tests_lazybusiness WHERE id = %s", [pk])
+            return cursor.fetchone()[0]
+
+    def test_not_decoded_on_load(self, lazy_business):
+        from serial_preferences.django.fields import RawPreferences
+
+        from .models import LazyBusiness
+
+        loaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        assert isinstance(loaded.__dict__["preferences"], RawPreferences)
+
+    def test_decoded_on_access(self, lazy_business):
+        from .models import LazyBusiness
+
+        loaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        assert loaded.preferences.prepay_enabled is False
+        assert loaded.__dict__["preferences"] == {"prepay_enabled": False}
+
+    def test_untouched_written_back_verbatim(self, lazy_business):
+        from .models import LazyBusiness
+
+        loaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        loaded.name = "Renamed"
+        loaded.save()
+        assert self._stored(lazy_business.pk) == '{ "prepay_enabled" : false }'
+
+    def test_touched_written_as_dict(self, lazy_business):
+        from .models import LazyBusiness
+
+        loaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        loaded.preferences.max_prepay_amount = 10
+        loaded.save()
+        reloaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        assert reloaded.preferences.to_dict() == {"prepay_enabled": False, "max_prepay_amount": 10}
+
+    def test_value_from_object_decodes(self, lazy_business):
+        from .models import LazyBusiness
+
+        loaded = LazyBusiness.objects.get(pk=lazy_business.pk)
+        field = LazyBusiness._meta.get_field("preferences")
+        assert field.value_from_object(loaded) == {"prepay_enabled": False}
+
+    def test_deconstruct(self):
+        from .models import LazyBusiness
+
+        _, _, _, kwargs = LazyBusiness._meta.get_field("preferences").deconstruct()
+        assert kwargs["lazy"] is True
@@ -56,3 +56,74 @@ class TestInheritance:
         assert child.prepay_enabled is False
         parent.prepay_enabled = True
         assert child.prepay_enabled is True  # reflects parent change
+
+
+class TestResolvedView:
+    def _chain(self, business_prefs):
+        root = PreferenceProxy(business_prefs, {"max_prepay_amount": 500, "prepay_enabled": False})
+        middle = PreferenceProxy(business_prefs, {"receipt_footer": "Middle"}, parent=root)
+        leaf = PreferenceProxy(business_prefs, {}, parent=middle)
+        return root, middle, leaf
+
+    def test_multi_level_values(self, business_prefs):
+        _, _, leaf = self._chain(business_prefs)
+        assert leaf.max_prepay_amount == 500
+        assert leaf.receipt_footer == "Middle"
+        assert leaf.default_grade == "regular"
+
+    def test_view_reused_until_changed(self, business_prefs):
+        _, _, leaf = self._chain(business_prefs)
+        leaf.max_prepay_amount
+        view = leaf._view
+        leaf.prepay_enabled
+        leaf.to_full_dict()
+        assert leaf._view is view
+
+    def test_grandparent_change_invalidates(self, business_prefs):
+        root, _, leaf = self._chain(business_prefs)
+        assert leaf.max_prepay_amount == 500
+        root.max_prepay_amount = 700
+        assert leaf.max_prepay_amount == 700
+        root.reset("max_prepay_amount")
+        assert leaf.max_prepay_amount == 15000
+
+    def test_middle_override_and_reset(self, business_prefs):
+        _, middle, leaf = self._chain(business_prefs)
+        assert leaf.prepay_enabled is False
+        middle.prepay_enabled = True
+        assert leaf.prepay_enabled is True
+        middle.reset("prepay_enabled")
+        assert leaf.prepay_enabled is False
+
+    def test_to_full_dict_tracks_local_changes(self, business_prefs):
+        _, _, leaf = self._chain(business_prefs)
+        assert leaf.to_full_dict()["default_grade"] == "regular"
+        leaf.default_grade = "premium"
+        assert leaf.to_full_dict()["default_grade"] == "premium"
+        leaf.reset("default_grade")
+        assert leaf.to_full_dict()["default_grade"] == "regular"
+
+    def test_to_full_dict_returns_copy(self, business_prefs):
+        _, _, leaf = self._chain(business_prefs)
+        leaf.to_full_dict()["max_prepay_amount"] = 1
+        assert leaf.max_prepay_amount == 500
+
+
+class TestValueSource:
+    def test_reports_supplying_level(self, business_prefs):
+        root = PreferenceProxy(business_prefs, {"max_prepay_amount": 500}, label="root")
+        leaf = PreferenceProxy(
+            business_prefs, {"receipt_footer": "Leaf"}, parent=root, label="leaf"
+        )
+        assert leaf.value_source("receipt_footer") == "leaf"
+        assert leaf.value_source("max_prepay_amount") == "root"
+        assert leaf.value_source("default_grade") is None
+
+    def test_defaults_to_schema_name(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {"prepay_enabled": False})
+        assert proxy.value_source("prepay_enabled") == "BusinessPreferences"
+
+    def test_unknown_key(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {})
+        with pytest.raises(AttributeError):
+            proxy.value_source("nonexistent")
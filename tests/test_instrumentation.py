@@ -0,0 +1,149 @@
+"""Tests for opt-in instrumentation of proxies, validators and the field descriptor."""
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from serial_preferences import instrumentation
+from serial_preferences.instrumentation import InMemoryRecorder, Recorder
+from serial_preferences.proxy import PreferenceProxy
+
+from .conftest import BusinessPreferences
+
+
+@pytest.fixture
+def recorder():
+    with instrumentation.recording() as recorder:
+        yield recorder
+
+
+class TestSwapping:
+    def test_disabled_by_default(self):
+        assert instrumentation.get_recorder() is None
+        proxy_class = BusinessPreferences._proxy_class
+        assert proxy_class.receipt_footer.fget.__qualname__.startswith("_make_property")
+        assert not hasattr(BusinessPreferences._validators["max_prepay_amount"], "_recorded_original")
+
+    def test_disable_restores_originals(self):
+        validator = BusinessPreferences._validators["max_prepay_amount"]
+        getattr_ = PreferenceProxy.__getattr__
+        with instrumentation.recording():
+            assert BusinessPreferences._validators["max_prepay_amount"] is not validator
+            assert PreferenceProxy.__getattr__ is not getattr_
+        assert BusinessPreferences._validators["max_prepay_amount"] is validator
+        assert BusinessPreferences._preferences["max_prepay_amount"].validator is validator
+        assert PreferenceProxy.__getattr__ is getattr_
+
+    def test_recording_restores_previous_recorder(self):
+        outer = instrumentation.enable()
+        try:
+            with instrumentation.recording() as inner:
+                assert instrumentation.get_recorder() is inner
+            assert instrumentation.get_recorder() is outer
+        finally:
+            instrumentation.disable()
+
+    def test_schemas_created_while_enabled(self, recorder):
+        from serial_preferences import Pref, PreferenceGroup, PreferenceSchema
+
+        class LateSchema(PreferenceSchema):
+            class Options(PreferenceGroup, label="Options"):
+                enabled: bool = Pref(default=False)
+
+        PreferenceProxy(LateSchema, {}).enabled
+        assert recorder.reads[LateSchema, "enabled"] == {"default": 1}
+
+
+class TestProxyEvents:
+    def test_read_sources(self, recorder):
+        root = PreferenceProxy(BusinessPreferences, {"receipt_footer": "Root"})
+        child = PreferenceProxy(BusinessPreferences, {"prepay_enabled": False}, parent=root)
+        child.prepay_enabled
+        child.receipt_footer
+        child.receipt_footer
+        child.max_prepay_amount
+        PreferenceProxy(BusinessPreferences, {}).default_grade
+        report = recorder.report()["reads"]["BusinessPreferences"]
+        assert report == {
+            "default_grade": {"default": 1},
+            "max_prepay_amount": {"default": 1},
+            "prepay_enabled": {"local": 1},
+            "receipt_footer": {"parent": 2},
+        }
+
+    def test_getattr_reads(self, recorder):
+        proxy = PreferenceProxy(BusinessPreferences, {"receipt_footer": "Local"})
+        PreferenceProxy.__getattr__(proxy, "receipt_footer")
+        PreferenceProxy.__getattr__(proxy, "default_grade")
+        assert recorder.reads[BusinessPreferences, "receipt_footer"] == {"local": 1}
+        assert recorder.reads[BusinessPreferences, "default_grade"] == {"default": 1}
+
+    def test_writes_and_validations(self, recorder):
+        proxy = PreferenceProxy(BusinessPreferences, {})
+        proxy.max_prepay_amount = "500"
+        proxy.set("receipt_footer", "Bye")
+        proxy.reset("receipt_footer")
+        with pytest.raises(ValidationError):
+            proxy.max_prepay_amount = -1
+        assert recorder.writes[BusinessPreferences, "max_prepay_amount"] == 1
+        assert recorder.writes[BusinessPreferences, "receipt_footer"] == 2
+        assert recorder.validations[BusinessPreferences, "max_prepay_amount"] == {
+            "valid": 1,
+            "invalid": 1,
+        }
+
+    def test_unread_keys(self, recorder):
+        proxy = PreferenceProxy(BusinessPreferences, {})
+        proxy.receipt_footer
+        proxy.prepay_enabled
+        assert recorder.unread_keys(BusinessPreferences) == [
+            "store_name_on_receipt",
+            "max_prepay_amount",
+            "default_grade",
+        ]
+
+    def test_custom_recorder(self):
+        class Reads(Recorder):
+            def __init__(self):
+                self.events = []
+
+            def read(self, schema, key, source):
+                self.events.append((key, source))
+
+        with instrumentation.recording(Reads()) as recorder:
+            PreferenceProxy(BusinessPreferences, {"prepay_enabled": True}).prepay_enabled
+        assert recorder.events == [("prepay_enabled", "local")]
+
+
+@pytest.mark.django_db
+class TestDescriptorEvents:
+    def test_cache_hits_and_parent_resolution(self, recorder):
+        from .models import Dealer, Franchise, Site
+
+        franchise = Franchise.objects.create(name="F", preferences={"receipt_footer": "F"})
+        dealer = Dealer.objects.create(name="B", franchise=franchise)
+        Site.objects.create(name="L", dealer=dealer)
+        location = Site.objects.select_related("dealer__franchise").get()
+        recorder.reset()
+
+        location.preferences.receipt_footer
+        location.preferences.receipt_footer
+
+        report = recorder.report()
+        assert report["descriptors"]["tests.Site.preferences"] == {"misses": 1, "hits": 1}
+        assert report["descriptors"]["tests.Dealer.preferences"] == {"misses": 1}
+        timing = report["parent_resolution"]["tests.Site.preferences"]
+        assert timing["count"] == 1
+        assert 0 <= timing["max_s"] <= timing["total_s"]
+        assert report["reads"]["BusinessPreferences"]["receipt_footer"] == {"parent": 2}
+
+    def test_recorder_setting(self, settings):
+        from django.apps import apps
+
+        settings.SERIAL_PREFERENCES_RECORDER = (
+            "serial_preferences.instrumentation.InMemoryRecorder"
+        )
+        try:
+            apps.get_app_config("serial_preferences").ready()
+            assert isinstance(instrumentation.get_recorder(), InMemoryRecorder)
+        finally:
+            instrumentation.disable()
@@ -73,3 +73,53 @@ class TestIntrospection:
         schema = business_prefs.to_schema()
         p = schema[0]["preferences"][0]
         assert "help_text" not in p
+
+
+class TestIntrospectionCache:
+    def test_returns_copies(self, business_prefs):
+        first = business_prefs.to_schema()
+        first[0]["preferences"][0]["label"] = "Mutated"
+        first.append({"key": "extra"})
+        second = business_prefs.to_schema()
+        assert second[0]["preferences"][0]["label"] == "Show store name on receipt"
+        assert len(second) == 2
+
+    def test_computed_once(self, business_prefs, monkeypatch):
+        from serial_preferences import introspection
+
+        business_prefs.to_schema()
+        monkeypatch.setattr(introspection, "pref_to_dict", None)
+        assert business_prefs.to_schema()[1]["key"] == "fuel"
+
+    def test_schema_to_json(self, business_prefs):
+        import json
+
+        from serial_preferences.introspection import schema_to_json
+
+        assert json.loads(schema_to_json(business_prefs)) == business_prefs.to_schema()
+
+
+class TestSchemaFingerprint:
+    def test_stable(self, business_prefs):
+        from serial_preferences.introspection import clear_schema_cache
+
+        fingerprint = business_prefs.schema_fingerprint()
+        clear_schema_cache()
+        assert business_prefs.schema_fingerprint() == fingerprint
+        assert len(fingerprint) == 64
+
+    def test_differs_between_schemas(self, business_prefs, simple_prefs):
+        assert business_prefs.schema_fingerprint() != simple_prefs.schema_fingerprint()
+
+    def test_changes_with_definition(self):
+        from serial_preferences import Pref, PreferenceGroup, PreferenceSchema
+
+        def make(default):
+            class Prefs(PreferenceSchema):
+                class Options(PreferenceGroup, label="Options"):
+                    enabled: bool = Pref(default=default, label="Enabled")
+
+            return Prefs
+
+        assert make(True).schema_fingerprint() == make(True).schema_fingerprint()
+        assert make(True).schema_fingerprint() != make(False).schema_fingerprint()
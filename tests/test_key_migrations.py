@@ -0,0 +1,231 @@
+"""Tests for declarative key migrations and their runners."""
+
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from serial_preferences import Pref, PreferenceGroup, PreferenceSchema
+from serial_preferences.django.key_migrations import (
+    MigratePreferenceKeys,
+    migrate_preference_keys,
+)
+from serial_preferences.key_migrations import DropKey, RecoerceKey, RenameKey, migrate_data
+
+
+class MigratedPreferences(PreferenceSchema):
+    """The receipt and fuel keys, after a rename, a removal and a retype."""
+
+    class Receipt(PreferenceGroup, label="Receipt"):
+        receipt_footer: str = Pref(default="Thank you!", label="Receipt footer")
+        max_prepay_amount: int = Pref(default=15000, label="Max prepay (cents)", ge=0)
+
+    key_migrations = [
+        RenameKey("footer", "receipt_footer"),
+        DropKey("legacy_flag"),
+        RecoerceKey("max_prepay_amount"),
+    ]
+
+
+@pytest.fixture
+def migrated_fields(monkeypatch):
+    """Give the test models' preference fields the migrated schema."""
+    from django.apps import apps
+
+    for model in apps.get_app_config("tests").get_models():
+        field = model._meta.get_field("preferences")
+        monkeypatch.setattr(field, "schema", MigratedPreferences)
+
+
+class TestOperations:
+    def test_rename(self):
+        data = {"footer": "Bye"}
+        assert RenameKey("footer", "receipt_footer").apply(MigratedPreferences, data) is True
+        assert data == {"receipt_footer": "Bye"}
+
+    def test_rename_keeps_existing_target(self):
+        data = {"footer": "Old", "receipt_footer": "New"}
+        RenameKey("footer", "receipt_footer").apply(MigratedPreferences, data)
+        assert data == {"receipt_footer": "New"}
+
+    def test_drop(self):
+        data = {"legacy_flag": True}
+        assert DropKey("legacy_flag").apply(MigratedPreferences, data) is True
+        assert DropKey("legacy_flag").apply(MigratedPreferences, data) is False
+        assert data == {}
+
+    def test_recoerce(self):
+        data = {"max_prepay_amount": "2500"}
+        assert RecoerceKey("max_prepay_amount").apply(MigratedPreferences, data) is True
+        assert data == {"max_prepay_amount": 2500}
+        assert RecoerceKey("max_prepay_amount").apply(MigratedPreferences, data) is False
+
+    def test_recoerce_invalid_dropped(self):
+        data = {"max_prepay_amount": "lots"}
+        assert RecoerceKey("max_prepay_amount").apply(MigratedPreferences, data) is True
+        assert data == {}
+
+    def test_recoerce_invalid_raises(self):
+        with pytest.raises(ValidationError):
+            RecoerceKey("max_prepay_amount", on_error="raise").apply(
+                MigratedPreferences, {"max_prepay_amount": -1}
+            )
+
+    def test_migrate_data_in_order(self):
+        data = {"footer": "Bye", "legacy_flag": 1, "max_prepay_amount": 10.0}
+        assert migrate_data(MigratedPreferences, data) is True
+        assert data == {"receipt_footer": "Bye", "max_prepay_amount": 10}
+        assert migrate_data(MigratedPreferences, data) is False
+
+
+class TestSchemaChecks:
+    def _schema(self, migrations):
+        class Options(PreferenceGroup, label="Options"):
+            enabled: bool = Pref(default=False, label="Enabled")
+
+        return type(
+            "Checked", (PreferenceSchema,), {"Options": Options, "key_migrations": migrations}
+        )
+
+    def test_rename_target_must_exist(self):
+        with pytest.raises(ValueError, match="target 'missing'"):
+            self._schema([RenameKey("old", "missing")])
+
+    def test_rename_source_must_be_gone(self):
+        with pytest.raises(ValueError, match="source 'enabled'"):
+            self._schema([RenameKey("enabled", "enabled")])
+
+    def test_drop_must_be_gone(self):
+        with pytest.raises(ValueError, match="DropKey 'enabled'"):
+            self._schema([DropKey("enabled")])
+
+    def test_recoerce_must_exist(self):
+        with pytest.raises(ValueError, match="RecoerceKey 'missing'"):
+            self._schema([RecoerceKey("missing")])
+
+    def test_invalid_on_error(self):
+        with pytest.raises(ValueError, match="on_error"):
+            RecoerceKey("enabled", on_error="ignore")
+
+
+@pytest.fixture
+def stale_rows(db, migrated_fields):
+    from .models import Franchise
+
+    Franchise.objects.create(name="clean", preferences={"receipt_footer": "Hi"})
+    for i in range(5):
+        Franchise.objects.create(name=f"F{i}")
+    # Written around the field so the stale keys reach the database.
+    Franchise.objects.exclude(name="clean").update(
+        preferences={"footer": "Bye", "legacy_flag": True, "max_prepay_amount": "900"}
+    )
+
+
+def _all_stored():
+    from .models import Franchise
+
+    return list(Franchise.objects.order_by("pk").values_list("preferences", flat=True))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("migrated_fields")
+class TestMigratePreferenceKeys:
+    def test_rewrites_in_batches(self, stale_rows, django_assert_num_queries):
+        from .models import Franchise
+
+        # One streamed SELECT plus one UPDATE per batch.
+        with django_assert_num_queries(1 + 3):
+            assert migrate_preference_keys(Franchise.objects.all(), batch_size=2) == 5
+        assert _all_stored() == [{"receipt_footer": "Hi"}] + [
+            {"receipt_footer": "Bye", "max_prepay_amount": 900}
+        ] * 5
+
+    @pytest.mark.parametrize("rows", [2, 20])
+    def test_inheriting_rows_skip_parents(self, rows, django_assert_num_queries):
+        from .models import Business, Location
+
+        business = Business.objects.create(name="B", preferences={"receipt_footer": "B"})
+        Location.objects.bulk_create(
+            Location(name=f"L{i}", business=business, preferences={"footer": "Bye"})
+            for i in range(rows)
+        )
+        # The streamed SELECT and a single UPDATE, however many rows.
+        with django_assert_num_queries(2):
+            assert migrate_preference_keys(Location.objects.all()) == rows
+        assert set(
+            Location.objects.values_list("preferences__receipt_footer", flat=True)
+        ) == {"Bye"}
+
+    def test_refreshes_materialized_dependents(self, db):
+        from .models import Region, Register, Terminal
+
+        region = Region.objects.create(name="R")
+        terminal = Terminal.objects.create(name="T", region=region)
+        register = Register.objects.create(name="Reg", terminal=terminal)
+        Region.objects.update(preferences={"footer": "Bye"})
+        assert migrate_preference_keys(Region.objects.all()) == 1
+        terminal = Terminal.objects.get()
+        assert terminal.preferences_inherited["levels"]["tests.Region.preferences"] == {
+            "receipt_footer": "Bye"
+        }
+        assert Register.objects.get(pk=register.pk).preferences.receipt_footer == "Bye"
+
+    def test_migrates_materialized_levels(self, db):
+        from .models import Region, Terminal
+
+        terminal = Terminal.objects.create(name="T", region=Region.objects.create(name="R"))
+        inherited = terminal.preferences_inherited
+        inherited["levels"]["tests.Region.preferences"] = {"footer": "Bye"}
+        Terminal.objects.update(preferences_inherited=inherited)
+        assert migrate_preference_keys(Terminal.objects.all()) == 1
+        terminal = Terminal.objects.get()
+        assert terminal.preferences_inherited["levels"]["tests.Region.preferences"] == {
+            "receipt_footer": "Bye"
+        }
+        assert terminal.preferences.receipt_footer == "Bye"
+
+    def test_invalidates_cached_rows(self, db):
+        from django.core.cache import caches
+
+        from serial_preferences.django.cache import cache_key
+
+        from .models import Chain, Store
+
+        chain = Chain.objects.create(name="C")
+        store = Store.objects.create(name="S", chain=chain)
+        key = cache_key(Chain._meta.get_field("preferences"), chain.pk)
+        Chain.objects.update(preferences={"footer": "Bye"})
+        caches["default"].set(key, ({}, []))
+        assert migrate_preference_keys(Chain.objects.all()) == 1
+        assert caches["default"].get(key) is None
+        assert Store.objects.get(pk=store.pk).preferences.receipt_footer == "Bye"
+
+    def test_migration_operation(self, stale_rows):
+        from django.apps import apps
+
+        operation = MigratePreferenceKeys("tests", "Franchise", batch_size=2)
+        operation.code(apps, SimpleNamespace(connection=connection))
+        assert _all_stored()[1] == {"receipt_footer": "Bye", "max_prepay_amount": 900}
+        assert operation.reversible
+        assert operation.deconstruct() == (
+            "MigratePreferenceKeys",
+            [],
+            {"app_label": "tests", "model_name": "Franchise", "batch_size": 2},
+        )
+
+    def test_command(self, stale_rows):
+        out = StringIO()
+        call_command("migrate_preference_keys", "tests.Franchise.preferences", stdout=out)
+        assert out.getvalue() == "tests.Franchise.preferences: 5 rows migrated\n"
+
+    def test_command_defaults_to_schemas_with_migrations(self, stale_rows):
+        out = StringIO()
+        call_command("migrate_preference_keys", stdout=out)
+        assert "tests.Franchise.preferences: 5 rows migrated" in out.getvalue().splitlines()
+
+    def test_command_rejects_other_fields(self, db):
+        with pytest.raises(CommandError, match="not a PreferenceField"):
+            call_command("migrate_preference_keys", "tests.Franchise.name")
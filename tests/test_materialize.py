@@ -0,0 +1,215 @@
+"""Tests for materialized inherited preferences."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from serial_preferences.django.materialize import dependents, propagate, refresh_materialized
+
+
+@pytest.fixture
+def region(db):
+    from .models import Region
+
+    region = Region.objects.create(name="West")
+    region.preferences.max_prepay_amount = 8000
+    region.save()
+    return region
+
+
+@pytest.fixture
+def registers(region):
+    from .models import Register, Terminal
+
+    for i in range(3):
+        terminal = Terminal.objects.create(name=f"T{i}", region=region)
+        for j in range(2):
+            Register.objects.create(name=f"R{i}-{j}", terminal=terminal)
+
+
+@pytest.mark.django_db
+class TestMaterializedColumn:
+    def test_column_added(self):
+        from .models import Terminal
+
+        field = Terminal._meta.get_field("preferences_inherited")
+        assert not field.editable
+
+    def test_computed_on_save(self, registers):
+        from .models import Register
+
+        register = Register.objects.first()
+        assert register.preferences_inherited == {
+            "refs": {"terminal_id": str(register.terminal_id)},
+            "levels": {
+                "tests.Terminal.preferences": {},
+                "tests.Region.preferences": {"max_prepay_amount": 8000},
+            },
+        }
+
+    def test_reads_skip_parents(self, registers, django_assert_num_queries):
+        from .models import Register
+
+        register = Register.objects.first()
+        with django_assert_num_queries(0):
+            assert register.preferences.max_prepay_amount == 8000
+            assert register.preferences.value_source("max_prepay_amount") == (
+                "tests.Region.preferences"
+            )
+
+    def test_value_sources_match_unmaterialized(self, registers):
+        from .models import Register, Terminal
+
+        terminal = Terminal.objects.first()
+        terminal.preferences.receipt_footer = "Terminal"
+        terminal.save()
+        register = Register.objects.filter(terminal=terminal).first()
+        prefs = register.preferences
+        assert prefs.value_source("receipt_footer") == "tests.Terminal.preferences"
+        assert prefs.value_source("max_prepay_amount") == "tests.Region.preferences"
+        assert prefs.value_source("default_grade") is None
+        assert prefs.default_grade == "regular"
+
+    def test_local_values_win(self, registers):
+        from .models import Register
+
+        register = Register.objects.first()
+        register.preferences.max_prepay_amount = 10
+        register.save()
+        register = Register.objects.get(pk=register.pk)
+        assert register.preferences.max_prepay_amount == 10
+        register.preferences.reset("max_prepay_amount")
+        assert register.preferences.max_prepay_amount == 8000
+
+    def test_reparented_with_update_fields(self, region, registers):
+        from .models import Region, Register, Terminal
+
+        east = Region.objects.create(name="East", preferences={"max_prepay_amount": 2})
+        terminal = Terminal.objects.first()
+        terminal.region = east
+        terminal.save(update_fields=["region"])
+        terminal = Terminal.objects.get(pk=terminal.pk)
+        assert terminal.preferences.max_prepay_amount == 2
+        assert terminal.preferences_inherited["refs"] == {"region_id": str(east.pk)}
+        registers = Register.objects.filter(terminal=terminal)
+        assert {r.preferences.max_prepay_amount for r in registers} == {2}
+
+    def test_changed_parent_not_read_from_column(self, region, registers):
+        from .models import Region, Terminal
+
+        east = Region.objects.create(name="East", preferences={"max_prepay_amount": 2})
+        terminal = Terminal.objects.first()
+        terminal.region = east
+        assert terminal.preferences.max_prepay_amount == 2
+        assert terminal.preferences.value_source("max_prepay_amount") == "tests.Region.preferences"
+
+    def test_unsaved_follows_parents(self, region):
+        from .models import Terminal
+
+        assert Terminal(region=region).preferences.max_prepay_amount == 8000
+
+    def test_deconstruct(self):
+        from .models import Terminal
+
+        _, _, _, kwargs = Terminal._meta.get_field("preferences").deconstruct()
+        assert kwargs["materialize"] is True
+
+
+@pytest.mark.django_db
+class TestPropagation:
+    def test_dependents_nearest_first(self):
+        from .models import Region
+
+        assert [(f.model.__name__, lookup) for f, lookup in dependents(Region)] == [
+            ("Terminal", "region"),
+            ("Register", "terminal__region"),
+        ]
+
+    def test_save_propagates(self, region, registers):
+        from .models import Register
+
+        region.preferences.max_prepay_amount = 9000
+        region.save()
+        assert {r.preferences.max_prepay_amount for r in Register.objects.all()} == {9000}
+
+    def test_save_preferences_propagates(self, region, registers):
+        from .models import Register
+
+        region.preferences.default_grade = "premium"
+        region.save_preferences()
+        assert {r.preferences.default_grade for r in Register.objects.all()} == {"premium"}
+
+    def test_update_preferences_propagates(self, region, registers):
+        from .models import Region, Terminal
+
+        Region.objects.all().update_preferences(prepay_enabled=False)
+        assert {t.preferences.prepay_enabled for t in Terminal.objects.all()} == {False}
+
+    def test_save_without_preferences_skips_propagation(
+        self, region, registers, django_assert_num_queries
+    ):
+        region.name = "East"
+        with django_assert_num_queries(1):
+            region.save(update_fields=["name"])
+
+    def test_save_with_preferences_in_update_fields_propagates(self, region, registers):
+        from .models import Register
+
+        region.preferences.max_prepay_amount = 9000
+        region.save(update_fields=["preferences"])
+        assert {r.preferences.max_prepay_amount for r in Register.objects.all()} == {9000}
+
+    def test_only_changed_rows_written(self, region, registers):
+        from .models import Region
+
+        assert propagate(Region, [region.pk]) == 0
+
+    def test_batches(self, region, registers, django_assert_num_queries):
+        from .models import Region, Terminal
+
+        Region.objects.filter(pk=region.pk).update(preferences={"max_prepay_amount": 1})
+        # One SELECT (region joined) plus one UPDATE per batch of two.
+        with django_assert_num_queries(1 + 2):
+            assert refresh_materialized(Terminal.objects.all(), batch_size=2) == 3
+
+    def test_not_materialized(self, db):
+        from .models import Location
+
+        with pytest.raises(ValueError, match="not materialized"):
+            refresh_materialized(Location.objects.all())
+
+
+@pytest.mark.django_db
+class TestMaterializeCommand:
+    def test_rebuilds_all(self, region, registers):
+        from .models import Region, Register
+
+        Region.objects.filter(pk=region.pk).update(preferences={})
+        out = StringIO()
+        call_command("materialize_preferences", stdout=out)
+        assert out.getvalue().splitlines() == [
+            "tests.Terminal.preferences: 3 rows updated",
+            "tests.Register.preferences: 6 rows updated",
+        ]
+        assert {r.preferences.max_prepay_amount for r in Register.objects.all()} == {15000}
+
+    def test_selected_model(self, registers):
+        out = StringIO()
+        call_command("materialize_preferences", "tests.Terminal", "--batch-size=1", stdout=out)
+        assert out.getvalue() == "tests.Terminal.preferences: 0 rows updated\n"
+
+    def test_unknown_model(self, db):
+        with pytest.raises(CommandError, match="tests.location"):
+            call_command("materialize_preferences", "tests.Location")
+
+
+
+@pytest.mark.django_db(transaction=True)
+def test_workers(region, registers):
+    from .models import Region, Register, Terminal
+
+    Region.objects.filter(pk=region.pk).update(preferences={"max_prepay_amount": 1})
+    assert refresh_materialized(Terminal.objects.all(), batch_size=1, workers=2) == 3
+    assert refresh_materialized(Register.objects.all(), batch_size=2, workers=2) == 6
+    assert {r.preferences.max_prepay_amount for r in Register.objects.all()} == {1}
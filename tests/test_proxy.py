@@ -1,5 +1,7 @@
 """Tests for PreferenceProxy."""
 
+import pickle
+
 import pytest
 from django.core.exceptions import ValidationError
 
@@ -85,3 +87,107 @@ class TestPreferenceProxy:
         proxy.count = "42"
         assert proxy.count == 42
         assert isinstance(proxy.count, int)
+
+
+class TestGeneratedProxyClass:
+    def test_instance_of_generated_subclass(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {})
+        assert type(proxy) is business_prefs._proxy_class
+        assert isinstance(proxy, PreferenceProxy)
+
+    def test_slotted(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {})
+        assert not hasattr(proxy, "__dict__")
+
+    def test_properties_per_key(self, business_prefs):
+        cls = business_prefs._proxy_class
+        for key in business_prefs._preferences:
+            assert isinstance(cls.__dict__[key], property)
+
+    def test_schemas_get_distinct_classes(self, business_prefs, simple_prefs):
+        assert business_prefs._proxy_class is not simple_prefs._proxy_class
+
+    def test_pickle_roundtrip(self, business_prefs):
+        parent = PreferenceProxy(business_prefs, {"max_prepay_amount": 500})
+        child = PreferenceProxy(business_prefs, {"prepay_enabled": False}, parent=parent)
+        restored = pickle.loads(pickle.dumps(child))
+        assert restored.prepay_enabled is False
+        assert restored.max_prepay_amount == 500
+        assert type(restored) is business_prefs._proxy_class
+
+
+class TestChangeTracking:
+    def test_set_and_reset_tracked(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {"prepay_enabled": False, "receipt_footer": "x"})
+        assert proxy.changes() == ({}, [])
+        proxy.max_prepay_amount = 10
+        proxy.reset("prepay_enabled")
+        assert proxy.changes() == ({"max_prepay_amount": 10}, ["prepay_enabled"])
+
+    def test_mark_clean(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {})
+        proxy.set("prepay_enabled", False)
+        proxy.mark_clean()
+        assert proxy.changes() == ({}, [])
+
+
+class TestFreeze:
+    def _frozen(self, business_prefs):
+        parent = PreferenceProxy(business_prefs, {"receipt_footer": "Parent"})
+        child = PreferenceProxy(business_prefs, {"prepay_enabled": False}, parent=parent)
+        return child.freeze()
+
+    def test_effective_values_and_inherited_flags(self, business_prefs):
+        frozen = self._frozen(business_prefs)
+        assert frozen.receipt_footer == "Parent"
+        assert frozen["prepay_enabled"] is False
+        assert frozen.max_prepay_amount == 15000
+        assert frozen.is_inherited("receipt_footer")
+        assert not frozen.is_inherited("prepay_enabled")
+        assert list(frozen.to_dict()) == list(business_prefs._preferences)
+
+    def test_read_only(self, business_prefs):
+        frozen = self._frozen(business_prefs)
+        with pytest.raises(AttributeError, match="read-only"):
+            frozen.prepay_enabled = True
+        with pytest.raises(AttributeError, match="no preference 'nope'"):
+            frozen.nope
+
+    def test_detached_from_proxy(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {})
+        frozen = proxy.freeze()
+        proxy.receipt_footer = "Changed"
+        assert frozen.receipt_footer == "Thank you!"
+
+    def test_hashable_and_comparable(self, business_prefs):
+        first, second = self._frozen(business_prefs), self._frozen(business_prefs)
+        assert first == second
+        assert len({first, second}) == 1
+        assert first != PreferenceProxy(business_prefs, {}).freeze()
+
+    def test_list_values_become_tuples(self, simple_prefs):
+        frozen = PreferenceProxy(simple_prefs, {"tags": ["a", "b"]}).freeze()
+        assert frozen.tags == ("a", "b")
+        hash(frozen)
+
+    def test_dict_values_become_read_only_mappings(self):
+        from serial_preferences import Pref, PreferenceGroup, PreferenceSchema
+
+        class LimitPreferences(PreferenceSchema):
+            class Limits(PreferenceGroup, label="Limits"):
+                limits: dict = Pref(default={"daily": 100})
+
+        proxy = PreferenceProxy(LimitPreferences, {"limits": {"daily": 5, "grades": ["a"]}})
+        frozen = proxy.freeze()
+        assert frozen.limits == {"daily": 5, "grades": ("a",)}
+        with pytest.raises(TypeError):
+            frozen.limits["daily"] = 1
+        assert frozen != PreferenceProxy(LimitPreferences, {}).freeze()
+        assert len({frozen, proxy.freeze()}) == 1
+        assert pickle.loads(pickle.dumps(frozen.limits)) == frozen.limits
+
+    def test_pickle_roundtrip(self, business_prefs):
+        frozen = self._frozen(business_prefs)
+        restored = pickle.loads(pickle.dumps(frozen))
+        assert restored == frozen
+        assert restored.is_inherited("receipt_footer")
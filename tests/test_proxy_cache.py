@@ -0,0 +1,107 @@
+"""Tests for the shared parent proxy LRU."""
+
+import pytest
+from django.test import RequestFactory
+
+from serial_preferences.django.middleware import ParentProxyCacheMiddleware
+from serial_preferences.django.proxy_cache import get_parent_proxy_cache
+
+
+@pytest.fixture
+def shared(settings):
+    settings.SERIAL_PREFERENCES_PARENT_PROXY_CACHE_SIZE = 16
+    return get_parent_proxy_cache()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "dealer_sites",
+    [
+        {
+            "franchise": {"receipt_footer": "Franchise footer"},
+            "dealers": [{"max_prepay_amount": 1000 * (i + 1)} for i in range(3)],
+            "sites_per_dealer": 4,
+        }
+    ],
+    indirect=True,
+)
+class TestParentProxyCache:
+    def test_disabled_by_default(self, dealer_sites):
+        from .models import Site
+
+        assert get_parent_proxy_cache() is None
+        locs = list(Site.objects.with_preference_parents().filter(dealer__name="Dealer 0"))
+        assert locs[0].preferences._parent is not locs[1].preferences._parent
+
+    def test_shares_parents(self, dealer_sites, shared):
+        from .models import Site
+
+        locs = list(Site.objects.with_preference_parents().order_by("pk"))
+        parents = {id(loc.preferences._parent) for loc in locs}
+        assert len(parents) == 3
+        assert [loc.preferences.max_prepay_amount for loc in locs[::4]] == [1000, 2000, 3000]
+        assert locs[0].preferences.receipt_footer == "Franchise footer"
+        # Each dealer and the franchise are built once; every other lookup hits.
+        assert shared.misses == 4
+        assert shared.hits == 12 * 2 - 4
+
+    def test_changed_data_is_a_miss(self, dealer_sites, shared):
+        from .models import Dealer, Site
+
+        first = Site.objects.select_related("dealer").first()
+        first.preferences.max_prepay_amount
+        Dealer.objects.filter(pk=first.dealer_id).update_preferences(max_prepay_amount=5)
+        again = Site.objects.select_related("dealer").get(pk=first.pk)
+        assert again.preferences.max_prepay_amount == 5
+        assert again.preferences._parent is not first.preferences._parent
+
+    def test_changes_to_loaded_parent_are_seen(self, dealer_sites, shared):
+        from .models import Site
+
+        first, second = Site.objects.select_related("dealer").order_by("pk")[:2]
+        assert first.preferences.max_prepay_amount == 1000
+        assert second.preferences._parent is first.preferences._parent
+        first.dealer.preferences.max_prepay_amount = 1
+        assert first.preferences.max_prepay_amount == 1
+        assert first.preferences.value_source("max_prepay_amount") == "tests.Dealer.preferences"
+        # Other instances of the row keep the shared, unchanged proxy.
+        assert second.preferences.max_prepay_amount == 1000
+
+    def test_changes_to_loaded_grandparent_are_seen(self, dealer_sites, shared):
+        from .models import Site
+
+        first, second = Site.objects.with_preference_parents().order_by("pk")[:2]
+        assert first.preferences.receipt_footer == "Franchise footer"
+        first.dealer.franchise.preferences.receipt_footer = "Changed"
+        assert first.preferences.receipt_footer == "Changed"
+        assert first.dealer.preferences.receipt_footer == "Changed"
+        assert second.preferences.receipt_footer == "Franchise footer"
+
+    def test_loaded_parent_proxy_used_directly(self, dealer_sites, shared):
+        from .models import Site
+
+        loc = Site.objects.select_related("dealer").first()
+        loc.dealer.preferences.max_prepay_amount = 1
+        assert loc.preferences._parent is loc.dealer.preferences
+        assert loc.preferences.max_prepay_amount == 1
+
+    def test_bounded(self, dealer_sites, settings):
+        from .models import Site
+
+        settings.SERIAL_PREFERENCES_PARENT_PROXY_CACHE_SIZE = 2
+        for loc in Site.objects.with_preference_parents():
+            loc.preferences.max_prepay_amount
+        assert len(get_parent_proxy_cache()) == 2
+
+    def test_middleware_clears(self, dealer_sites, shared):
+        from .models import Site
+
+        def view(request):
+            Site.objects.select_related("dealer").first().preferences.prepay_enabled
+            assert len(shared) > 0
+            return "response"
+
+        middleware = ParentProxyCacheMiddleware(view)
+        assert middleware(RequestFactory().get("/")) == "response"
+        assert len(shared) == 0
+        assert shared.hits == shared.misses == 0
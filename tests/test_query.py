@@ -0,0 +1,356 @@
+"""Tests for PreferenceQuerySet helpers."""
+
+import warnings
+
+import pytest
+
+from serial_preferences.django import LazyParentQueryError, LazyParentQueryWarning
+from serial_preferences.django.query import parent_lookups
+
+
+@pytest.fixture
+def locations(db):
+    from .models import Dealer, Franchise, Site
+
+    franchise = Franchise.objects.create(name="Franchise")
+    franchise.preferences.receipt_footer = "Franchise footer"
+    franchise.save()
+    for i in range(3):
+        biz = Dealer.objects.create(name=f"Biz {i}", franchise=franchise)
+        biz.preferences.prepay_enabled = False
+        biz.save()
+        for j in range(2):
+            Site.objects.create(name=f"Loc {i}-{j}", dealer=biz)
+
+
+class TestParentLookups:
+    def test_follows_chain(self):
+        from .models import Site
+
+        select, prefetch = parent_lookups(Site)
+        assert select == ["dealer", "dealer__franchise"]
+        assert prefetch == []
+
+    def test_multi_level(self):
+        from .models import Outlet
+
+        select, prefetch = parent_lookups(Outlet)
+        assert select == ["region", "dealer", "dealer__franchise"]
+        assert prefetch == []
+
+    def test_root_model_has_no_lookups(self):
+        from .models import Franchise
+
+        assert parent_lookups(Franchise) == ([], [])
+
+
+@pytest.mark.django_db
+class TestWithPreferenceParents:
+    def test_without_prefetch_is_n_plus_one(self, locations, django_assert_num_queries):
+        from .models import Site
+
+        with django_assert_num_queries(1 + 6 + 6):
+            for loc in Site.objects.all():
+                loc.preferences.receipt_footer
+
+    def test_single_query(self, locations, django_assert_num_queries):
+        from .models import Site
+
+        with django_assert_num_queries(1):
+            for loc in Site.objects.with_preference_parents():
+                assert loc.preferences.prepay_enabled is False
+                assert loc.preferences.receipt_footer == "Franchise footer"
+
+
+@pytest.mark.django_db
+class TestLazyParentQuerySetting:
+    def test_disabled_by_default(self, locations):
+        from .models import Site
+
+        loc = Site.objects.first()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            loc.preferences.prepay_enabled
+
+    def test_warn(self, locations, settings):
+        from .models import Site
+
+        settings.SERIAL_PREFERENCES_LAZY_PARENT_QUERIES = "warn"
+        loc = Site.objects.first()
+        with pytest.warns(LazyParentQueryWarning) as record:
+            loc.preferences.prepay_enabled
+        messages = [str(w.message) for w in record]
+        assert any("tests.Site.preferences" in m for m in messages)
+        assert any("tests.Dealer.preferences" in m for m in messages)
+
+    def test_raise(self, locations, settings):
+        from .models import Site
+
+        settings.SERIAL_PREFERENCES_LAZY_PARENT_QUERIES = "raise"
+        loc = Site.objects.first()
+        with pytest.raises(LazyParentQueryError, match="dealer.preferences"):
+            loc.preferences.prepay_enabled
+
+    def test_no_warning_when_prefetched(self, locations, settings):
+        from .models import Site
+
+        settings.SERIAL_PREFERENCES_LAZY_PARENT_QUERIES = "raise"
+        for loc in Site.objects.with_preference_parents():
+            assert loc.preferences.prepay_enabled is False
+
+
+@pytest.fixture
+def mixed_locations(db):
+    from .models import Dealer, Franchise, Site
+
+    franchise = Franchise.objects.create(name="F")
+    franchise.preferences.max_prepay_amount = 9000
+    franchise.save()
+
+    plain = Dealer.objects.create(name="Plain")
+    no_prepay = Dealer.objects.create(name="No prepay", franchise=franchise)
+    no_prepay.preferences.prepay_enabled = False
+    no_prepay.preferences.default_grade = "premium"
+    no_prepay.save()
+
+    Site.objects.create(name="default", dealer=plain)
+    Site.objects.create(name="inherits", dealer=no_prepay)
+    override = Site.objects.create(name="override", dealer=no_prepay)
+    override.preferences.prepay_enabled = True
+    override.preferences.max_prepay_amount = 100
+    override.save()
+
+
+@pytest.mark.django_db
+class TestPreferenceAnnotations:
+    def test_annotate_matches_proxy(self, mixed_locations):
+        from .models import Site
+
+        keys = ["prepay_enabled", "max_prepay_amount", "default_grade", "receipt_footer"]
+        rows = Site.objects.annotate_preference(*keys)
+        for loc in rows:
+            for key in keys:
+                assert getattr(loc, key) == getattr(loc.preferences, key), (loc.name, key)
+
+    def test_annotate_types(self, mixed_locations):
+        from .models import Site
+
+        loc = Site.objects.annotate_preference("prepay_enabled", "max_prepay_amount").get(
+            name="inherits"
+        )
+        assert loc.prepay_enabled is False
+        assert loc.max_prepay_amount == 9000
+
+    def test_filter_bool(self, mixed_locations):
+        from .models import Site
+
+        names = set(
+            Site.objects.filter_preference(prepay_enabled=False).values_list("name", flat=True)
+        )
+        assert names == {"inherits"}
+
+    def test_filter_lookup(self, mixed_locations):
+        from .models import Site
+
+        names = set(
+            Site.objects.filter_preference(max_prepay_amount__gte=9000).values_list(
+                "name", flat=True
+            )
+        )
+        assert names == {"default", "inherits"}
+
+    def test_filter_choice(self, mixed_locations):
+        from .models import Site
+
+        qs = Site.objects.filter_preference(default_grade="regular")
+        assert set(qs.values_list("name", flat=True)) == {"default"}
+
+    def test_unknown_key(self, mixed_locations):
+        from django.core.exceptions import FieldError
+
+        from .models import Site
+
+        with pytest.raises(FieldError, match="Unknown preference key"):
+            Site.objects.filter_preference(nonexistent=True)
+
+    def test_conditions_dict(self, mixed_locations):
+        from django.core.exceptions import FieldError
+
+        from .models import Site
+
+        qs = Site.objects.filter_preference({"default_grade": "regular"}, field="preferences")
+        assert set(qs.values_list("name", flat=True)) == {"default"}
+        # Routed to the schema as a key, not taken as the field option.
+        with pytest.raises(FieldError, match="Unknown preference key: 'field'"):
+            Site.objects.filter_preference({"field": True})
+
+
+@pytest.mark.django_db
+class TestUpdatePreferences:
+    def test_sets_key_on_every_row(self, locations):
+        from .models import Dealer
+
+        Dealer.objects.filter(name="Biz 0").update_preferences(receipt_footer="Hi")
+        Dealer.objects.update_preferences(max_prepay_amount="700")
+        footers = {b.name: b.preferences.to_dict() for b in Dealer.objects.all()}
+        assert footers["Biz 0"] == {
+            "prepay_enabled": False,
+            "receipt_footer": "Hi",
+            "max_prepay_amount": 700,
+        }
+        assert footers["Biz 1"] == {"prepay_enabled": False, "max_prepay_amount": 700}
+
+    def test_reset(self, locations):
+        from .models import Dealer
+
+        assert Dealer.objects.update_preferences(reset=["prepay_enabled"]) == 3
+        assert all(b.preferences.to_dict() == {} for b in Dealer.objects.all())
+
+    def test_validates(self, locations):
+        from django.core.exceptions import ValidationError
+
+        from .models import Dealer
+
+        with pytest.raises(ValidationError, match=">="):
+            Dealer.objects.update_preferences(max_prepay_amount=-1)
+        with pytest.raises(ValidationError, match="Unknown preference key"):
+            Dealer.objects.update_preferences(nonexistent=1)
+
+    def test_values_dict(self, locations):
+        from .models import Dealer
+
+        Dealer.objects.update_preferences({"max_prepay_amount": 700}, reset=["prepay_enabled"])
+        assert all(
+            b.preferences.to_dict() == {"max_prepay_amount": 700} for b in Dealer.objects.all()
+        )
+
+    def test_keys_named_like_options(self, locations):
+        from django.core.exceptions import ValidationError
+
+        from .models import Dealer
+
+        # Routed to the schema as keys, not taken as the field/reset options.
+        for key in ("field", "reset"):
+            with pytest.raises(ValidationError, match=f"Unknown preference key: '{key}'"):
+                Dealer.objects.set_preference(key, 1)
+            with pytest.raises(ValidationError, match=f"Unknown preference key: '{key}'"):
+                Dealer.objects.update_preferences({key: 1})
+
+
+@pytest.mark.django_db
+class TestBulkSetReset:
+    def test_set_preference_single_statement(self, locations, django_assert_num_queries):
+        from .models import Site
+
+        with django_assert_num_queries(1):
+            count = Site.objects.set_preference("max_prepay_amount", "20000")
+        assert count == 6
+        assert {loc.preferences.to_dict()["max_prepay_amount"] for loc in Site.objects.all()} == {
+            20000
+        }
+
+    def test_set_preference_keeps_other_keys(self, locations):
+        from .models import Dealer
+
+        Dealer.objects.set_preference("receipt_footer", "Hi")
+        assert all(
+            b.preferences.to_dict() == {"prepay_enabled": False, "receipt_footer": "Hi"}
+            for b in Dealer.objects.all()
+        )
+
+    def test_set_preference_validates(self, locations):
+        from django.core.exceptions import ValidationError
+
+        from .models import Dealer
+
+        with pytest.raises(ValidationError, match="Invalid choice"):
+            Dealer.objects.set_preference("default_grade", "diesel")
+
+    def test_reset_preference(self, locations):
+        from .models import Dealer, Site
+
+        Dealer.objects.filter(name="Biz 0").reset_preference("prepay_enabled")
+        enabled = Site.objects.filter_preference(prepay_enabled=True)
+        assert set(enabled.values_list("name", flat=True)) == {"Loc 0-0", "Loc 0-1"}
+
+
+@pytest.fixture
+def outlets(db):
+    from .models import Dealer, Franchise, Outlet, Region
+
+    franchise = Franchise.objects.create(name="Franchise")
+    franchise.preferences.receipt_footer = "Franchise footer"
+    franchise.save()
+    biz = Dealer.objects.create(name="Biz", franchise=franchise)
+    biz.preferences.prepay_enabled = False
+    biz.preferences.max_prepay_amount = 5000
+    biz.save()
+    region = Region.objects.create(name="West")
+    region.preferences.max_prepay_amount = 8000
+    region.save()
+    Outlet.objects.create(name="regional", region=region, dealer=biz)
+    Outlet.objects.create(name="direct", dealer=biz)
+
+
+@pytest.mark.django_db
+class TestMultiLevelInheritance:
+    def test_levels_in_order(self, outlets):
+        from .models import Outlet
+
+        regional = Outlet.objects.get(name="regional")
+        assert regional.preferences.max_prepay_amount == 8000
+        assert regional.preferences.prepay_enabled is False
+        assert regional.preferences.receipt_footer == "Franchise footer"
+        assert regional.preferences.default_grade == "regular"
+
+    def test_missing_level_is_skipped(self, outlets):
+        from .models import Outlet
+
+        direct = Outlet.objects.get(name="direct")
+        assert direct.preferences.max_prepay_amount == 5000
+
+    def test_value_source(self, outlets):
+        from .models import Outlet
+
+        outlet = Outlet.objects.get(name="regional")
+        outlet.preferences.default_grade = "mid"
+        prefs = outlet.preferences
+        assert prefs.value_source("default_grade") == "tests.Outlet.preferences"
+        assert prefs.value_source("max_prepay_amount") == "tests.Region.preferences"
+        assert prefs.value_source("prepay_enabled") == "tests.Dealer.preferences"
+        assert prefs.value_source("receipt_footer") == "tests.Franchise.preferences"
+        assert prefs.value_source("store_name_on_receipt") is None
+
+    def test_level_change_invalidates(self, outlets):
+        from .models import Outlet
+
+        outlet = Outlet.objects.select_related("region").get(name="regional")
+        assert outlet.preferences.max_prepay_amount == 8000
+        outlet.region.preferences.reset("max_prepay_amount")
+        assert outlet.preferences.max_prepay_amount == 5000
+
+    def test_single_query(self, outlets, django_assert_num_queries):
+        from .models import Outlet
+
+        with django_assert_num_queries(1):
+            for outlet in Outlet.objects.with_preference_parents():
+                assert outlet.preferences.receipt_footer == "Franchise footer"
+
+    def test_filter_and_annotate(self, outlets):
+        from .models import Outlet
+
+        rows = dict(
+            Outlet.objects.annotate_preference("max_prepay_amount").values_list(
+                "name", "max_prepay_amount"
+            )
+        )
+        assert rows == {"regional": 8000, "direct": 5000}
+        names = Outlet.objects.filter_preference(max_prepay_amount__gt=6000)
+        assert list(names.values_list("name", flat=True)) == ["regional"]
+
+    def test_deconstruct(self):
+        from .models import Outlet
+
+        field = Outlet._meta.get_field("preferences")
+        _, _, _, kwargs = field.deconstruct()
+        assert kwargs["inherits_from"] == ["region.preferences", "dealer.preferences"]
@@ -1,5 +1,7 @@
 """Tests for PreferenceSchema and PreferenceGroup."""
 
+import pytest
+
 from serial_preferences import Pref, PreferenceGroup, PreferenceSchema
 
 
@@ -63,6 +65,13 @@ class TestPreferenceSchema:
         assert EmptyPreferences._groups == []
         assert EmptyPreferences._preferences == {}
 
+    def test_rejects_keys_shadowing_proxy_methods(self):
+        with pytest.raises(ValueError, match="collides with PreferenceProxy.changes"):
+
+            class AuditPreferences(PreferenceSchema):
+                class Audit(PreferenceGroup, label="Audit"):
+                    changes: bool = Pref(default=False, label="Log changes")
+
     def test_snake_case_conversion(self, business_prefs):
         keys = [k for k, _ in business_prefs._groups]
         assert "general" in keys
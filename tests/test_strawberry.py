@@ -3,17 +3,27 @@
 import json
 
 import pytest
+import strawberry
 
 from serial_preferences.contrib.strawberry import (
     ChoiceType,
     PreferenceDefinitionType,
     PreferenceGroupType,
+    PreferenceValuesLoader,
     PreferenceValueType,
+    clear_strawberry_cache,
+    resolve_preference_values,
     schema_to_strawberry,
+    schema_to_strawberry_type,
+    select_keys,
+    values_for_instances,
     values_to_strawberry,
+    values_to_typed,
 )
 from serial_preferences.proxy import PreferenceProxy
 
+from .conftest import BusinessPreferences, SimplePreferences
+
 
 class TestSchemaToStrawberry:
     def test_returns_group_types(self, business_prefs):
@@ -60,6 +70,30 @@ class TestSchemaToStrawberry:
         assert prepay_amt.ge == 0
 
 
+class TestSchemaToStrawberryCache:
+    def test_reuses_types(self, business_prefs):
+        first = schema_to_strawberry(business_prefs)
+        second = schema_to_strawberry(business_prefs)
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_per_schema(self, business_prefs, simple_prefs):
+        assert schema_to_strawberry(simple_prefs)[0].key == "options"
+        assert schema_to_strawberry(business_prefs)[0].key == "general"
+
+    def test_clear_single_schema(self, business_prefs, simple_prefs):
+        business = schema_to_strawberry(business_prefs)
+        simple = schema_to_strawberry(simple_prefs)
+        clear_strawberry_cache(business_prefs)
+        assert schema_to_strawberry(business_prefs)[0] is not business[0]
+        assert schema_to_strawberry(simple_prefs)[0] is simple[0]
+
+    def test_clear_all(self, business_prefs):
+        before = schema_to_strawberry(business_prefs)
+        clear_strawberry_cache()
+        assert schema_to_strawberry(business_prefs)[0] is not before[0]
+
+
 class TestValuesToStrawberry:
     def test_returns_value_types(self, business_prefs):
         proxy = PreferenceProxy(business_prefs, {"prepay_enabled": False})
@@ -87,3 +121,207 @@ class TestValuesToStrawberry:
         prepay = next(v for v in values if v.key == "prepay_enabled")
         assert json.loads(prepay.value_json) is False
         assert prepay.is_inherited is True
+
+
+@pytest.fixture
+def location_batch(db):
+    from .models import Business, Location
+
+    businesses = []
+    for i in range(3):
+        biz = Business.objects.create(name=f"Biz {i}")
+        biz.preferences.max_prepay_amount = 100 * (i + 1)
+        biz.save()
+        businesses.append(biz)
+    for i in range(9):
+        loc = Location.objects.create(name=f"Loc {i}", business=businesses[i % 3])
+        if i == 0:
+            loc.preferences.max_prepay_amount = 5
+            loc.save()
+    return list(Location.objects.order_by("pk"))
+
+
+def _by_key(values):
+    return {v.key: v for v in values}
+
+
+@pytest.mark.django_db
+class TestValuesForInstances:
+    def test_matches_values_to_strawberry(self, location_batch):
+        batch = values_for_instances(location_batch)
+        for loc, values in zip(location_batch, batch):
+            expected = values_to_strawberry(loc.preferences)
+            assert [(v.key, v.value_json, v.is_inherited) for v in values] == [
+                (v.key, v.value_json, v.is_inherited) for v in expected
+            ]
+
+    def test_fetches_parents_per_level(self, location_batch, django_assert_num_queries):
+        # One query for the businesses, which have no parents of their own.
+        with django_assert_num_queries(1):
+            batch = values_for_instances(location_batch)
+        assert json.loads(_by_key(batch[0])["max_prepay_amount"].value_json) == 5
+        assert _by_key(batch[0])["max_prepay_amount"].is_inherited is False
+        assert json.loads(_by_key(batch[4])["max_prepay_amount"].value_json) == 200
+        assert _by_key(batch[4])["max_prepay_amount"].is_inherited is True
+
+
+@pytest.mark.django_db
+class TestPreferenceValuesLoader:
+    def test_batches_loads(self, location_batch, django_assert_num_queries):
+        from asgiref.sync import async_to_sync
+
+        async def load():
+            loader = PreferenceValuesLoader(field="preferences")
+            return await loader.load_many(location_batch)
+
+        with django_assert_num_queries(1):
+            batch = async_to_sync(load)()
+        assert len(batch) == 9
+        assert json.loads(_by_key(batch[2])["max_prepay_amount"].value_json) == 300
+
+
+class TestSelectKeys:
+    def test_all_by_default(self, business_prefs):
+        assert select_keys(business_prefs) == list(business_prefs._preferences)
+
+    def test_groups(self, business_prefs):
+        assert select_keys(business_prefs, groups=["general"]) == [
+            "store_name_on_receipt",
+            "receipt_footer",
+        ]
+
+    def test_keys_keep_schema_order(self, business_prefs):
+        assert select_keys(business_prefs, keys=["default_grade", "prepay_enabled"]) == [
+            "prepay_enabled",
+            "default_grade",
+        ]
+
+    def test_unknown_key(self, business_prefs):
+        with pytest.raises(ValueError, match="Unknown preference keys"):
+            select_keys(business_prefs, keys=["nope"])
+
+    def test_unknown_group(self, business_prefs):
+        with pytest.raises(ValueError, match=r"Unknown preference groups: \['fule'\]"):
+            select_keys(business_prefs, groups=["general", "fule"])
+
+
+class TestValuesToStrawberryFiltering:
+    def test_skips_unselected_fields(self, business_prefs):
+        proxy = PreferenceProxy(business_prefs, {"prepay_enabled": False})
+        values = values_to_strawberry(proxy, keys=["prepay_enabled"], fields={"key", "is_inherited"})
+        assert [(v.key, v.value_json, v.is_inherited) for v in values] == [
+            ("prepay_enabled", "", False)
+        ]
+
+
+_PROXY = PreferenceProxy(BusinessPreferences, {"prepay_enabled": False})
+_seen_fields = []
+
+
+@strawberry.type
+class _Query:
+    @strawberry.field
+    def preferences(
+        self,
+        info: strawberry.Info,
+        keys: list[str] | None = None,
+        groups: list[str] | None = None,
+    ) -> list[PreferenceValueType]:
+        from serial_preferences.contrib.strawberry import selected_value_fields
+
+        _seen_fields.append(selected_value_fields(info))
+        return resolve_preference_values(info, _PROXY, keys, groups)
+
+
+class TestResolvePreferenceValues:
+    def setup_method(self):
+        _seen_fields.clear()
+
+    def test_keys_and_selection(self):
+        schema = strawberry.Schema(query=_Query)
+        result = schema.execute_sync('{ preferences(keys: ["prepay_enabled"]) { key valueJson } }')
+        assert result.errors is None
+        assert result.data == {"preferences": [{"key": "prepay_enabled", "valueJson": "false"}]}
+        assert _seen_fields == [{"key", "value_json"}]
+
+    def test_groups_and_fragments(self):
+        schema = strawberry.Schema(query=_Query)
+        result = schema.execute_sync(
+            """
+            { preferences(groups: ["fuel"]) { ...Flags } }
+            fragment Flags on PreferenceValueType { key isInherited }
+            """
+        )
+        assert result.errors is None
+        assert [v["key"] for v in result.data["preferences"]] == [
+            "prepay_enabled",
+            "max_prepay_amount",
+            "default_grade",
+        ]
+        assert result.data["preferences"][0]["isInherited"] is False
+        assert _seen_fields == [{"key", "is_inherited"}]
+
+
+_BusinessValues = schema_to_strawberry_type(BusinessPreferences)
+_SimpleValues = schema_to_strawberry_type(SimplePreferences)
+
+
+@strawberry.type
+class _TypedQuery:
+    @strawberry.field
+    def business(self) -> _BusinessValues:
+        parent = PreferenceProxy(BusinessPreferences, {"max_prepay_amount": 500})
+        return values_to_typed(
+            PreferenceProxy(BusinessPreferences, {"default_grade": "premium"}, parent=parent)
+        )
+
+    @strawberry.field
+    def large(self) -> _BusinessValues:
+        return values_to_typed(
+            PreferenceProxy(BusinessPreferences, {"max_prepay_amount": 3_000_000_000})
+        )
+
+    @strawberry.field
+    def simple(self) -> _SimpleValues:
+        return values_to_typed(PreferenceProxy(SimplePreferences, {"tags": ["a", "c"]}))
+
+
+class TestTypedValues:
+    def test_type_generated_once(self, business_prefs):
+        assert schema_to_strawberry_type(business_prefs) is _BusinessValues
+
+    def test_native_values(self):
+        result = strawberry.Schema(query=_TypedQuery).execute_sync(
+            """
+            {
+              business {
+                general { storeNameOnReceipt receiptFooter }
+                fuel { prepayEnabled maxPrepayAmount defaultGrade }
+              }
+              simple { options { count ratio tags } }
+            }
+            """
+        )
+        assert result.errors is None
+        assert result.data == {
+            "business": {
+                "general": {"storeNameOnReceipt": True, "receiptFooter": "Thank you!"},
+                "fuel": {"prepayEnabled": True, "maxPrepayAmount": 500, "defaultGrade": "PREMIUM"},
+            },
+            "simple": {"options": {"count": 0, "ratio": 0.5, "tags": ["A", "C"]}},
+        }
+
+    def test_unbounded_int_beyond_32_bits(self):
+        result = strawberry.Schema(query=_TypedQuery).execute_sync(
+            "{ large { fuel { maxPrepayAmount } } }"
+        )
+        assert result.errors is None
+        assert result.data == {"large": {"fuel": {"maxPrepayAmount": 3_000_000_000}}}
+
+    def test_schema_types(self):
+        sdl = strawberry.Schema(query=_TypedQuery).as_str()
+        assert "type BusinessPreferencesFuelValues" in sdl
+        assert "maxPrepayAmount: JSON" in sdl
+        assert "count: Int" in sdl
+        assert "enum BusinessPreferencesDefaultGrade" in sdl
+        assert "tags: [SimplePreferencesTags!]" in sdl
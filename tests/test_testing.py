@@ -0,0 +1,81 @@
+"""Tests for the query-budget test helpers."""
+
+import pytest
+
+from serial_preferences.django import PreferenceField
+from serial_preferences.django.pytest_plugin import preference_query_budget  # noqa: F401
+from serial_preferences.django.testing import PreferenceQueryBudgetExceeded
+
+
+@pytest.mark.django_db
+class TestPreferenceQueryBudget:
+    def test_within_budget(self, dealer_sites, preference_query_budget):
+        from .models import Site
+
+        with preference_query_budget(0) as budget:
+            for loc in Site.objects.with_preference_parents():
+                loc.preferences.prepay_enabled
+        assert len(budget) == 0
+
+    def test_only_parent_queries_count(self, dealer_sites, preference_query_budget):
+        from .models import Site
+
+        with preference_query_budget(0):
+            locs = list(Site.objects.select_related("dealer__franchise"))
+            Site.objects.count()
+            locs[0].preferences.prepay_enabled
+
+    def test_exceeded_names_field_and_path(self, dealer_sites, preference_query_budget):
+        from .models import Site
+
+        with pytest.raises(PreferenceQueryBudgetExceeded) as excinfo:
+            with preference_query_budget(1) as budget:
+                for loc in Site.objects.all():
+                    loc.preferences.prepay_enabled
+        message = str(excinfo.value)
+        assert "ran 8 queries, budget is 1" in message
+        assert "tests.Site.preferences following 'dealer.preferences': 4" in message
+        assert "tests.Dealer.preferences following 'franchise.preferences': 4" in message
+        assert list(budget.by_path()) == [
+            ("tests.Site.preferences", "dealer.preferences"),
+            ("tests.Dealer.preferences", "franchise.preferences"),
+        ]
+
+    def test_cached_parent_misses_count(self, preference_query_budget):
+        from django.core.cache import caches
+
+        from .models import Brand, Chain, Store
+
+        caches["default"].clear()
+        chain = Chain.objects.create(name="Chain", brand=Brand.objects.create(name="Brand"))
+        Store.objects.create(name="Store", chain=chain)
+        store = Store.objects.get()
+        caches["default"].clear()
+        with pytest.raises(PreferenceQueryBudgetExceeded) as excinfo:
+            with preference_query_budget(0) as budget:
+                store.preferences.prepay_enabled
+        assert "tests.Store.preferences following 'chain.preferences': 1" in str(excinfo.value)
+        assert "tests.Chain.preferences following 'brand.preferences': 1" in str(excinfo.value)
+        assert len(budget) == 2
+
+        # Both levels now come from the cache.
+        with preference_query_budget(0):
+            Store.objects.get().preferences.prepay_enabled
+        caches["default"].clear()
+
+    def test_restores_parent_level(self, dealer_sites, preference_query_budget):
+        resolve = PreferenceField._parent_level
+        with pytest.raises(PreferenceQueryBudgetExceeded):
+            with preference_query_budget(0):
+                from .models import Site
+
+                Site.objects.first().preferences.prepay_enabled
+        assert PreferenceField._parent_level is resolve
+
+    def test_error_in_block_not_masked(self, dealer_sites, preference_query_budget):
+        from .models import Site
+
+        with pytest.raises(KeyError):
+            with preference_query_budget(0):
+                Site.objects.first().preferences.prepay_enabled
+                raise KeyError("boom")
@@ -4,7 +4,12 @@ import pytest
 from django.core.exceptions import ValidationError
 
 from serial_preferences import Pref
-from serial_preferences.validators import coerce_and_validate, coerce_value, validate_value
+from serial_preferences.validators import (
+    coerce_and_validate,
+    coerce_value,
+    compile_validator,
+    validate_value,
+)
 
 
 def _make_pref(pref_type, **kwargs):
@@ -126,3 +131,45 @@ class TestCoerceAndValidate:
         p = _make_pref(int, default=0, ge=0, label="t")
         with pytest.raises(ValidationError, match=">="):
             coerce_and_validate("-1", p)
+
+
+class TestCompiledValidator:
+    def test_matches_coerce_and_validate(self):
+        p = _make_pref(int, default=0, ge=0, le=100, label="t")
+        validator = compile_validator(p)
+        assert validator("42") == 42
+        with pytest.raises(ValidationError, match=">="):
+            validator(-1)
+        with pytest.raises(ValidationError, match="<="):
+            validator(101)
+
+    def test_bool_strings(self):
+        validator = compile_validator(_make_pref(bool, default=False, label="t"))
+        assert validator("Yes") is True
+        assert validator("0") is False
+        with pytest.raises(ValidationError, match="Cannot coerce"):
+            validator("maybe")
+
+    def test_choices(self):
+        p = _make_pref(str, default="a", choices=[("a", "A"), ("b", "B")], label="t")
+        validator = compile_validator(p)
+        assert validator("b") == "b"
+        with pytest.raises(ValidationError, match=r"Valid choices: \['a', 'b'\]"):
+            validator("c")
+
+    def test_multi_choice(self):
+        p = _make_pref(list, default=[], choices=[("a", "A"), ("b", "B")], label="t")
+        validator = compile_validator(p)
+        assert validator(["a", "b"]) == ["a", "b"]
+        with pytest.raises(ValidationError, match="Invalid choice"):
+            validator(["a", ["unhashable"]])
+
+    def test_required(self):
+        validator = compile_validator(_make_pref(str, default=None, required=True, label="t"))
+        with pytest.raises(ValidationError, match="required"):
+            validator(None)
+
+    def test_schema_compiles_validators(self, business_prefs):
+        pref = business_prefs._preferences["max_prepay_amount"]
+        assert business_prefs._validators["max_prepay_amount"] is pref.validator
+        assert coerce_and_validate("10", pref) == 10